@@ -10,6 +10,7 @@ pyinstaller --name=ERDProgram --windowed --icon=NONE ^
     --hidden-import=cx_Oracle ^
     --hidden-import=graphviz ^
     --hidden-import=openpyxl ^
+    --hidden-import=pypdf ^
     --hidden-import=sqlalchemy.dialects.mysql ^
     --hidden-import=sqlalchemy.dialects.postgresql ^
     --hidden-import=sqlalchemy.dialects.oracle ^
@@ -22,6 +23,8 @@ pyinstaller --name=ERDProgram --windowed --icon=NONE ^
     --collect-all=psycopg2 ^
     --collect-all=cx_Oracle ^
     --collect-all=openpyxl ^
+    --collect-all=pypdf ^
+    --add-data=static;static ^
     --noconfirm main.py
 
 echo 2단계: spec 파일 수정 및 재빌드...
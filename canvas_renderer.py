@@ -0,0 +1,243 @@
+from diagram_export import HEADER_HEIGHT, HEADER_FONT_SIZE, EDGE_COLOR, table_text_lines
+
+
+MIN_ZOOM = 0.01
+MAX_ZOOM = 4.0
+# 배율에 따라 그리는 내용: 상자만 -> 머리글(테이블 이름) -> 컬럼 목록
+HEADER_DETAIL_ZOOM = 0.35
+COLUMN_DETAIL_ZOOM = 0.6
+# 보이는 영역 주변으로 미리 만들어 둘 범위 (화면 크기 대비). 이 안에서 움직이면 항목을 다시 조회하지 않음
+VIEW_MARGIN = 0.5
+FONT_FAMILY = "맑은 고딕"
+SELECTED_COLOR = '#e74c3c'
+TAG = "scene"
+
+
+class SceneCanvasRenderer:
+    """DiagramScene을 tk.Canvas 항목으로 직접 그리는 벡터 렌더러
+    
+    공간 색인으로 화면 주변의 테이블/관계만 항목으로 만들고, 보기가 움직이면 벗어난 항목은 지우고 새로 보이는 항목을 추가한다.
+    확대/축소는 이미 만든 항목을 canvas.scale로 옮기고 글자 크기만 바꾸며, 표시 단계가 바뀔 때만 다시 만든다.
+    """
+    
+    def __init__(self, canvas, scene, on_select=None):
+        self.canvas = canvas
+        self.scene = scene
+        self.on_select = on_select
+        self.table_grid, self.edge_grid = scene.build_grids()
+        self.table_positions = {table['name']: index for index, table in enumerate(scene.tables)}
+        self.table_edges = {}
+        for index, edge in enumerate(scene.edges):
+            self.table_edges.setdefault(edge['from'], []).append(index)
+            self.table_edges.setdefault(edge['to'], []).append(index)
+        self.zoom = 1.0
+        self.detail = self.detail_level(self.zoom)
+        # 인덱스 -> 캔버스 항목 id 목록
+        self.table_items = {}
+        self.edge_items = {}
+        # 글자 항목 -> (글자 크기, 굵게) : 확대/축소 시 글꼴만 바꾸기 위해 보관
+        self.text_items = {}
+        self.materialized = None
+        self.sync_pending = None
+        self.selected = None
+    
+    @staticmethod
+    def detail_level(zoom):
+        if zoom >= COLUMN_DETAIL_ZOOM:
+            return 2
+        if zoom >= HEADER_DETAIL_ZOOM:
+            return 1
+        return 0
+    
+    def to_canvas(self, x, y):
+        return (x - self.scene.min_x) * self.zoom, (y - self.scene.min_y) * self.zoom
+    
+    def to_scene(self, canvas_x, canvas_y):
+        return canvas_x / self.zoom + self.scene.min_x, canvas_y / self.zoom + self.scene.min_y
+    
+    def font(self, size, bold=False):
+        # 음수 크기는 픽셀 단위 (화면 배율과 무관하게 장면 좌표에 맞춤)
+        pixels = -max(1, int(round(size * self.zoom)))
+        return (FONT_FAMILY, pixels, 'bold') if bold else (FONT_FAMILY, pixels)
+    
+    def update_scrollregion(self):
+        self.canvas.config(scrollregion=(0, 0, self.scene.width * self.zoom, self.scene.height * self.zoom))
+    
+    def fit(self):
+        """창 안에 장면 전체가 들어가는 배율로 시작"""
+        width = max(1, self.canvas.winfo_width())
+        height = max(1, self.canvas.winfo_height())
+        zoom = min(width / self.scene.width, height / self.scene.height)
+        self.clear()
+        self.zoom = min(max(zoom, MIN_ZOOM), MAX_ZOOM)
+        self.detail = self.detail_level(self.zoom)
+        self.update_scrollregion()
+        self.canvas.xview_moveto(0)
+        self.canvas.yview_moveto(0)
+        self.sync()
+    
+    def zoom_to(self, zoom, anchor=None):
+        """anchor(창 좌표) 아래의 장면 지점이 제자리에 남도록 배율 변경"""
+        zoom = min(max(zoom, MIN_ZOOM), MAX_ZOOM)
+        if zoom == self.zoom:
+            return
+        if anchor is None:
+            anchor = (self.canvas.winfo_width() / 2, self.canvas.winfo_height() / 2)
+        point_x, point_y = self.to_scene(self.canvas.canvasx(anchor[0]), self.canvas.canvasy(anchor[1]))
+        
+        factor = zoom / self.zoom
+        self.zoom = zoom
+        detail = self.detail_level(zoom)
+        if detail != self.detail:
+            self.detail = detail
+            self.clear()
+        else:
+            self.canvas.scale(TAG, 0, 0, factor, factor)
+            for item, (size, bold) in self.text_items.items():
+                self.canvas.itemconfigure(item, font=self.font(size, bold))
+        
+        self.update_scrollregion()
+        width, height = self.scene.width * zoom, self.scene.height * zoom
+        canvas_x, canvas_y = self.to_canvas(point_x, point_y)
+        self.canvas.xview_moveto(max(0, canvas_x - anchor[0]) / max(width, 1))
+        self.canvas.yview_moveto(max(0, canvas_y - anchor[1]) / max(height, 1))
+        self.materialized = None
+        self.sync()
+    
+    def zoom_by(self, factor, anchor=None):
+        self.zoom_to(self.zoom * factor, anchor)
+    
+    def schedule_sync(self):
+        """스크롤/드래그가 연달아 들어와도 한 번만 항목을 맞춤"""
+        if self.sync_pending is None:
+            self.sync_pending = self.canvas.after_idle(self.sync)
+    
+    def cancel(self):
+        if self.sync_pending is not None:
+            self.canvas.after_cancel(self.sync_pending)
+            self.sync_pending = None
+    
+    def view_rect(self, margin=0.0):
+        """현재 보이는 장면 영역 (margin: 화면 크기 대비 여유)"""
+        width = self.canvas.winfo_width() / self.zoom
+        height = self.canvas.winfo_height() / self.zoom
+        left, top = self.to_scene(self.canvas.canvasx(0), self.canvas.canvasy(0))
+        return (
+            left - width * margin, top - height * margin,
+            left + width * (1 + margin), top + height * (1 + margin)
+        )
+    
+    def sync(self):
+        """보이는 영역 주변의 테이블/관계만 항목으로 유지"""
+        self.sync_pending = None
+        view = self.view_rect()
+        if self.materialized is not None:
+            left, top, right, bottom = self.materialized
+            if view[0] >= left and view[1] >= top and view[2] <= right and view[3] <= bottom:
+                return
+        
+        rect = self.view_rect(VIEW_MARGIN)
+        self.materialized = rect
+        tables = set(self.table_grid.query(rect))
+        edges = set(self.edge_grid.query(rect))
+        
+        for index in [index for index in self.table_items if index not in tables]:
+            self.delete_items(self.table_items.pop(index))
+        for index in [index for index in self.edge_items if index not in edges]:
+            self.delete_items(self.edge_items.pop(index))
+        
+        # 관계선은 테이블 아래에 깔리도록 먼저 만들고 가장 아래로 내림
+        new_edges = sorted(index for index in edges if index not in self.edge_items)
+        for index in new_edges:
+            self.edge_items[index] = self.create_edge(index)
+        if new_edges:
+            self.canvas.tag_lower("edge")
+        for index in sorted(tables):
+            if index not in self.table_items:
+                self.table_items[index] = self.create_table(index)
+    
+    def delete_items(self, items):
+        for item in items:
+            self.canvas.delete(item)
+            self.text_items.pop(item, None)
+    
+    def clear(self):
+        self.canvas.delete(TAG)
+        self.table_items.clear()
+        self.edge_items.clear()
+        self.text_items.clear()
+        self.materialized = None
+    
+    def create_edge(self, index):
+        x1, y1, x2, y2 = self.scene.segments[index]
+        edge = self.scene.edges[index]
+        selected = self.selected in (edge['from'], edge['to'])
+        options = {'fill': SELECTED_COLOR if selected else EDGE_COLOR, 'width': 2 if selected else 1, 'tags': (TAG, "edge")}
+        if self.detail > 0:
+            options['arrow'] = 'last'
+        return [self.canvas.create_line(*self.to_canvas(x1, y1), *self.to_canvas(x2, y2), **options)]
+    
+    def create_table(self, index):
+        table = self.scene.tables[index]
+        x0, y0 = self.to_canvas(table['x'], table['y'])
+        x1, y1 = self.to_canvas(table['x'] + table['width'], table['y'] + table['height'])
+        selected = table['name'] == self.selected
+        outline = SELECTED_COLOR if selected else table['border']
+        width = 3 if selected else 1
+        canvas = self.canvas
+        
+        if self.detail == 0:
+            # 멀리서 볼 때는 테이블당 항목 하나
+            return [canvas.create_rectangle(x0, y0, x1, y1, fill=table['background'], outline=outline, width=width, tags=TAG)]
+        
+        items = [
+            canvas.create_rectangle(x0, y0, x1, y1, fill=table['background'], outline=outline, width=width, tags=TAG),
+            canvas.create_rectangle(x0, y0, x1, y0 + HEADER_HEIGHT * self.zoom, fill=table['header'], outline=outline, width=width, tags=TAG)
+        ]
+        header = canvas.create_text(
+            (x0 + x1) / 2, y0 + HEADER_HEIGHT * self.zoom / 2, text=table['name'], fill='white',
+            font=self.font(HEADER_FONT_SIZE, True), tags=TAG
+        )
+        self.text_items[header] = (HEADER_FONT_SIZE, True)
+        items.append(header)
+        if self.detail < 2:
+            return items
+        
+        for offset_x, offset_y, text, color, size, bold, rule in table_text_lines(table):
+            if rule:
+                ry = y0 + offset_y * self.zoom
+                items.append(canvas.create_line(x0, ry, x1, ry, fill=color, tags=TAG))
+                continue
+            item = canvas.create_text(
+                x0 + offset_x * self.zoom, y0 + offset_y * self.zoom, text=text, fill=color, anchor='nw',
+                font=self.font(size, bold), tags=TAG
+            )
+            self.text_items[item] = (size, bold)
+            items.append(item)
+        return items
+    
+    def table_at(self, canvas_x, canvas_y):
+        """캔버스 좌표에 있는 테이블 이름 (없으면 None)"""
+        x, y = self.to_scene(canvas_x, canvas_y)
+        hits = self.table_grid.query((x, y, x, y))
+        return self.scene.tables[max(hits)]['name'] if hits else None
+    
+    def select(self, table_name):
+        """테이블과 그 관계선을 강조 (이미 만든 항목만 다시 그림)"""
+        previous = self.selected
+        self.selected = table_name
+        for name in (previous, table_name):
+            if name is None:
+                continue
+            index = self.table_positions[name]
+            if index in self.table_items:
+                self.delete_items(self.table_items.pop(index))
+                self.table_items[index] = self.create_table(index)
+            for edge_index in self.table_edges.get(name, ()):
+                if edge_index in self.edge_items:
+                    self.delete_items(self.edge_items.pop(edge_index))
+                    self.edge_items[edge_index] = self.create_edge(edge_index)
+        if self.edge_items:
+            self.canvas.tag_lower("edge")
+        if self.on_select:
+            self.on_select(table_name)
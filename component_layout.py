@@ -0,0 +1,144 @@
+import math
+
+
+def encode_component(group, graph, table_sizes, referenced, degrees=None):
+    """연결 그룹을 정수 인덱스 기반의 압축 표현으로 변환 (프로세스 간 전달 비용 절감)
+    
+    degrees: 테이블 -> FK 개수 (중복 FK, 자기 참조 포함). 없으면 인접 테이블 수
+    반환: (names, payload)
+      names: 인덱스 -> 테이블 이름 (이름 순 정렬)
+      payload: (adjacency, sizes, referenced_flags, degree_counts)
+    """
+    names = sorted(group)
+    index = {name: i for i, name in enumerate(names)}
+    
+    adjacency = tuple(
+        tuple(sorted(index[neighbor] for neighbor in graph[name] if neighbor in index))
+        for name in names
+    )
+    sizes = tuple(table_sizes[name] for name in names)
+    referenced_flags = bytes(1 if name in referenced else 0 for name in names)
+    if degrees is None:
+        degree_counts = tuple(len(neighbors) for neighbors in adjacency)
+    else:
+        degree_counts = tuple(degrees[name] for name in names)
+    
+    return names, (adjacency, sizes, referenced_flags, degree_counts)
+
+
+def layout_component(payload, center=None):
+    """압축 표현의 연결 그룹을 중심 노드가 (0, 0)인 로컬 좌표로 배치
+    
+    center: 중심으로 둘 노드 인덱스 (없으면 차수가 가장 큰 노드)
+    반환: (center_index, [(x, y), ...])
+    """
+    adjacency, sizes, referenced_flags, degree_counts = payload
+    count = len(adjacency)
+    
+    # 차수가 가장 큰 노드가 중심 (동률이면 이름 순으로 앞선 노드)
+    if center is None:
+        center = 0
+        for i in range(count):
+            if degree_counts[i] > degree_counts[center]:
+                center = i
+    
+    # BFS 계층 구성
+    layers = [[center]]
+    layer_of = [-1] * count
+    layer_of[center] = 0
+    while True:
+        next_layer = []
+        for node in layers[-1]:
+            for neighbor in adjacency[node]:
+                if layer_of[neighbor] < 0:
+                    layer_of[neighbor] = len(layers)
+                    next_layer.append(neighbor)
+        if not next_layer:
+            break
+        layers.append(next_layer)
+    
+    center_width, center_height = sizes[center]
+    center_x = 0
+    center_y = 0
+    
+    positions = [None] * count
+    positions[center] = (center_x, center_y)
+    
+    for layer in range(1, len(layers)):
+        layer_nodes = layers[layer]
+        num_in_layer = len(layer_nodes)
+        
+        if layer > 1:
+            # 이전 계층에서의 순서로 부모를 고르고, 부모별 인접 노드 수(형제 수)를 센다
+            prev_order = {node: i for i, node in enumerate(layers[layer - 1])}
+            parent_of = {}
+            adjacent_count = {}
+            for node in layer_nodes:
+                parents = [p for p in adjacency[node] if p in prev_order]
+                for p in parents:
+                    adjacent_count[p] = adjacent_count.get(p, 0) + 1
+                if parents:
+                    parent_of[node] = min(parents, key=prev_order.__getitem__)
+        
+        for node_idx, node in enumerate(layer_nodes):
+            width, height = sizes[node]
+            
+            if layer == 1:
+                center_size = max(center_width, center_height)
+                node_size = max(width, height)
+                
+                # 충분한 간격 확보 (최소 100px 여유)
+                radius = center_size / 2 + node_size / 2 + 350
+                
+                # 부모는 위쪽, 자식은 아래쪽 배치
+                if referenced_flags[node]:
+                    y = center_y - radius
+                    if num_in_layer > 1:
+                        angle_step = 2 * math.pi / num_in_layer
+                        angle = node_idx * angle_step - math.pi / 2
+                        x = center_x + radius * 0.9 * math.cos(angle)
+                    else:
+                        x = center_x
+                else:
+                    y = center_y + radius
+                    if num_in_layer > 1:
+                        angle_step = 2 * math.pi / num_in_layer
+                        angle = node_idx * angle_step + math.pi / 2
+                        x = center_x + radius * 0.9 * math.cos(angle)
+                    else:
+                        x = center_x
+            else:
+                parent = parent_of.get(node)
+                if parent is not None:
+                    parent_x, parent_y = positions[parent]
+                    parent_width, parent_height = sizes[parent]
+                    radius = max(parent_width, parent_height) / 2 + max(width, height) / 2 + 300
+                    
+                    sibling_count = adjacent_count[parent] - 1
+                    parent_angle = math.atan2(parent_y - center_y, parent_x - center_x)
+                    
+                    if sibling_count == 0:
+                        # 부모 아래쪽에 배치
+                        angle_offset = math.pi / 2
+                    else:
+                        # 형제들과 함께 원형 배치
+                        angle_step = 2 * math.pi / (sibling_count + 1)
+                        angle_offset = (node_idx + 1) * angle_step
+                    
+                    angle = parent_angle + angle_offset
+                    x = parent_x + radius * math.cos(angle)
+                    y = parent_y + radius * math.sin(angle)
+                else:
+                    radius = max(center_width, center_height) / 2 + max(width, height) / 2 + 250 * layer
+                    angle_step = 2 * math.pi / num_in_layer if num_in_layer > 0 else 0
+                    angle = node_idx * angle_step - math.pi / 2
+                    x = center_x + radius * math.cos(angle)
+                    y = center_y + radius * math.sin(angle)
+            
+            positions[node] = (x, y)
+    
+    for i in range(count):
+        if positions[i] is None:
+            positions[i] = (center_x, center_y)
+    
+    return center, positions
@@ -9,6 +9,70 @@ except ImportError:
 import sqlite3
 
 
+# 방언별 (테이블 이름, 정의 서명) 조회. 한 테이블에 여러 쿼리의 결과가 이어 붙는다
+CATALOG_SIGNATURE_QUERIES = {
+    'sqlite': [
+        "SELECT name, sql FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'",
+    ],
+    'postgresql': [
+        "SELECT c.table_name, md5(string_agg(c.column_name || ':' || c.data_type || ':' || c.is_nullable, ',' "
+        "ORDER BY c.ordinal_position)) "
+        "FROM information_schema.columns c "
+        "JOIN information_schema.tables t ON t.table_schema = c.table_schema AND t.table_name = c.table_name "
+        "WHERE c.table_schema = current_schema() AND t.table_type = 'BASE TABLE' "
+        "GROUP BY c.table_name",
+        "SELECT tc.table_name, md5(string_agg(tc.constraint_name || ':' || tc.constraint_type, ',' "
+        "ORDER BY tc.constraint_name)) "
+        "FROM information_schema.table_constraints tc "
+        "WHERE tc.table_schema = current_schema() AND tc.constraint_type IN ('PRIMARY KEY', 'FOREIGN KEY') "
+        "GROUP BY tc.table_name",
+    ],
+    'mysql': [
+        "SELECT c.TABLE_NAME, CONCAT(COUNT(*), ':', SUM(CRC32(CONCAT_WS(':', c.ORDINAL_POSITION, c.COLUMN_NAME, "
+        "c.COLUMN_TYPE, c.IS_NULLABLE)))) "
+        "FROM information_schema.COLUMNS c "
+        "JOIN information_schema.TABLES t ON t.TABLE_SCHEMA = c.TABLE_SCHEMA AND t.TABLE_NAME = c.TABLE_NAME "
+        "WHERE c.TABLE_SCHEMA = DATABASE() AND t.TABLE_TYPE = 'BASE TABLE' "
+        "GROUP BY c.TABLE_NAME",
+        "SELECT TABLE_NAME, CONCAT(COUNT(*), ':', SUM(CRC32(CONCAT_WS(':', CONSTRAINT_NAME, COLUMN_NAME, "
+        "IFNULL(REFERENCED_TABLE_NAME, ''), IFNULL(REFERENCED_COLUMN_NAME, ''))))) "
+        "FROM information_schema.KEY_COLUMN_USAGE "
+        "WHERE TABLE_SCHEMA = DATABASE() "
+        "GROUP BY TABLE_NAME",
+    ],
+    'oracle': [
+        "SELECT OBJECT_NAME, TO_CHAR(LAST_DDL_TIME, 'YYYYMMDDHH24MISS') FROM USER_OBJECTS WHERE OBJECT_TYPE = 'TABLE'",
+    ],
+}
+CATALOG_SIGNATURE_QUERIES['mariadb'] = CATALOG_SIGNATURE_QUERIES['mysql']
+
+# 주기적으로 확인하는 지문: 한 행만 돌려주는 가벼운 조회 (바뀌었을 때만 위의 서명 조회를 실행)
+CATALOG_FINGERPRINT_QUERIES = {
+    # DDL이 실행될 때마다 증가하는 값
+    'sqlite': "PRAGMA schema_version",
+    # 카탈로그 행은 DDL로 바뀔 때마다 새 xmin을 가지므로 (ANALYZE/VACUUM은 제자리 갱신이라 그대로) 개수와 최대 xmin으로 감지
+    'postgresql': (
+        "WITH ns AS (SELECT oid FROM pg_namespace WHERE nspname = current_schema()) "
+        "SELECT "
+        "(SELECT COUNT(*) || ':' || COALESCE(MAX(c.xmin::text::bigint), 0) FROM pg_class c "
+        "WHERE c.relnamespace = (SELECT oid FROM ns) AND c.relkind IN ('r', 'p')), "
+        "(SELECT COUNT(*) || ':' || COALESCE(MAX(a.xmin::text::bigint), 0) FROM pg_attribute a "
+        "JOIN pg_class c ON c.oid = a.attrelid "
+        "WHERE c.relnamespace = (SELECT oid FROM ns) AND c.relkind IN ('r', 'p') AND a.attnum > 0), "
+        "(SELECT COUNT(*) || ':' || COALESCE(MAX(k.xmin::text::bigint), 0) FROM pg_constraint k "
+        "WHERE k.connamespace = (SELECT oid FROM ns) AND k.contype IN ('p', 'f'))"
+    ),
+    # 테이블 수, 이름/생성 시각 체크섬 (이름 변경, 재생성, 다시 만드는 ALTER 감지), 최종 변경 시각
+    'mysql': (
+        "SELECT COUNT(*), SUM(CRC32(CONCAT_WS(':', TABLE_NAME, CREATE_TIME))), MAX(UPDATE_TIME) "
+        "FROM information_schema.TABLES "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_TYPE = 'BASE TABLE'"
+    ),
+    'oracle': "SELECT COUNT(*), MAX(LAST_DDL_TIME) FROM USER_OBJECTS WHERE OBJECT_TYPE = 'TABLE'",
+}
+CATALOG_FINGERPRINT_QUERIES['mariadb'] = CATALOG_FINGERPRINT_QUERIES['mysql']
+
+
 class DatabaseConnector:
     def __init__(self):
         self.engine = None
@@ -75,6 +139,61 @@ class DatabaseConnector:
             return []
         return self.inspector.get_indexes(table_name)
     
+    def clone(self):
+        """같은 DB에 대한 별도 엔진/Inspector를 가진 연결 (다른 스레드가 GUI의 연결 상태를 건드리지 않도록 사용)"""
+        if self.engine is None:
+            return None
+        connector = DatabaseConnector()
+        connector.engine = create_engine(self.engine.url)
+        connector.inspector = inspect(connector.engine)
+        return connector
+    
+    def refresh_inspector(self):
+        """Inspector는 조회 결과를 캐시하므로 스키마 변경을 반영하려면 새로 만든다"""
+        if self.engine is not None:
+            self.inspector = inspect(self.engine)
+        return self.inspector
+    
+    def get_catalog_fingerprint(self):
+        """스키마 변경 감지용 카탈로그 지문 (DB별로 가장 가벼운 조회 사용, 지원하지 않거나 실패 시 None)"""
+        if self.engine is None:
+            return None
+        
+        query = CATALOG_FINGERPRINT_QUERIES.get(self.engine.dialect.name)
+        if query is None:
+            return None
+        try:
+            with self.engine.connect() as conn:
+                row = conn.execute(text(query)).fetchone()
+        except SQLAlchemyError as e:
+            print(f"카탈로그 지문 조회 오류: {e}")
+            return None
+        return ':'.join(str(value) for value in row)
+    
+    def get_catalog_signatures(self):
+        """테이블 -> 컬럼/키 정의 서명 (바뀐 테이블만 다시 추출하기 위해 사용, 실패 시 None)"""
+        if self.engine is None:
+            return None
+        
+        dialect = self.engine.dialect
+        queries = CATALOG_SIGNATURE_QUERIES.get(dialect.name)
+        if queries is None:
+            return None
+        
+        signatures = {}
+        try:
+            with self.engine.connect() as conn:
+                for query in queries:
+                    for table_name, signature in conn.execute(text(query)):
+                        # Oracle 등 대문자 이름은 Inspector와 같은 이름으로 맞춤
+                        if getattr(dialect, 'requires_name_normalize', False):
+                            table_name = dialect.normalize_name(table_name)
+                        signatures[table_name] = signatures.get(table_name, '') + f"{signature};"
+        except SQLAlchemyError as e:
+            print(f"카탈로그 조회 오류: {e}")
+            return None
+        return signatures
+    
     def get_databases(self, db_type):
         try:
             if db_type == 'MySQL' or db_type == 'MariaDB':
@@ -0,0 +1,573 @@
+import io
+import math
+import os
+import struct
+import threading
+import zlib
+from xml.sax.saxutils import escape
+
+from schema_graph import connected_components
+from spatial_index import SpatialGrid
+from text_metrics import CJK_FALLBACK, load_font, is_wide_char
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+except ImportError:
+    Image = None
+
+
+HEADER_HEIGHT = 20
+LINE_HEIGHT = 12
+SECTION_GAP = 4
+TEXT_PADDING = 6
+CANVAS_MARGIN = 100
+
+HEADER_FONT_SIZE = 10
+COLUMN_FONT_SIZE = 8
+EDGE_FONT_SIZE = 8
+
+EDGE_COLOR = '#2c3e50'
+PK_COLOR = '#d32f2f'
+FK_COLOR = '#1976d2'
+TEXT_COLOR = '#222222'
+
+# PNG 한 번에 렌더링하는 가로 띠의 최대 크기 (RGB 바이트)
+MAX_STRIP_BYTES = 64 * 1024 * 1024
+
+# 딥 줌 타일 (Deep Zoom 표준 기본값: 254px + 겹침 1px = 256px)
+DEEP_ZOOM_TILE_SIZE = 254
+DEEP_ZOOM_OVERLAP = 1
+DEEP_ZOOM_NAMESPACE = 'http://schemas.microsoft.com/deepzoom/2008'
+
+# 미리보기: 컬럼 글자 없이 상자 높이로만 컬럼 수를 나타냄
+PREVIEW_TABLE_WIDTH = 160
+PREVIEW_LINE_HEIGHT = 4
+PREVIEW_MAX_LINES = 30
+PREVIEW_GAP = 40
+PREVIEW_MAX_SIDE = 4000
+PREVIEW_COLORS = {
+    # (헤더, 테두리, 배경) - 웹 편집기의 연결/독립 테이블 색상과 같음
+    'connected': ('#2c3e50', '#2c3e50', '#ffffff'),
+    'isolated': ('#757575', '#757575', '#f5f5f5')
+}
+
+
+class DiagramScene:
+    """웹 편집기와 같은 좌표/크기/라벨로 구성한 내보내기용 장면 (좌표는 vis.js 캔버스 단위)
+    
+    tables: [{'name', 'x', 'y', 'width', 'height', 'header', 'border', 'background', 'sections'}]
+      x, y: 사각형 왼쪽 위, sections: [(제목 또는 None, 색상, [문자열...]), ...]
+    edges: [{'from', 'to', 'label'}]
+    """
+    
+    def __init__(self, tables, edges):
+        self.tables = tables
+        self.edges = edges
+        self.table_index = {table['name']: table for table in tables}
+        
+        if tables:
+            self.min_x = min(t['x'] for t in tables) - CANVAS_MARGIN
+            self.min_y = min(t['y'] for t in tables) - CANVAS_MARGIN
+            self.max_x = max(t['x'] + t['width'] for t in tables) + CANVAS_MARGIN
+            self.max_y = max(t['y'] + t['height'] for t in tables) + CANVAS_MARGIN
+        else:
+            self.min_x = self.min_y = 0
+            self.max_x = self.max_y = 2 * CANVAS_MARGIN
+        
+        self.segments = [self._edge_segment(edge) for edge in edges]
+    
+    @classmethod
+    def from_editor(cls, editor):
+        """편집기의 현재 좌표(계산 또는 사용자가 옮겨 저장한 좌표)로 장면 구성"""
+        visjs_data = editor.get_visjs_data()
+        # 좌표 저장/스키마 변경과 겹치지 않도록 잠근 상태에서 복사
+        with editor.data_lock:
+            tables = [
+                cls._build_table(editor, visjs_data, table_name, pos)
+                for table_name, pos in visjs_data['initial_positions'].items()
+            ]
+            edges = [
+                {'from': edge['from'], 'to': edge['to'], 'label': edge.get('label', '')}
+                for edge in visjs_data['edges']
+            ]
+        return cls(tables, edges)
+    
+    @staticmethod
+    def _build_table(editor, visjs_data, table_name, pos):
+        node = visjs_data['node_index'][table_name]
+        width = node['widthConstraint']['minimum']
+        height = node['heightConstraint']['minimum']
+        pk_columns, fk_columns, other_columns = editor.classify_columns(editor.tables_info[table_name])
+        sections = []
+        if pk_columns:
+            sections.append(('PK', PK_COLOR, pk_columns))
+        if fk_columns:
+            sections.append(('FK', FK_COLOR, fk_columns))
+        if other_columns:
+            sections.append((None, TEXT_COLOR, other_columns))
+        
+        # 내용이 레이아웃 높이보다 길면 상자를 늘림 (편집기와 같은 방식)
+        content_height = HEADER_HEIGHT + TEXT_PADDING * 2 + sum(
+            (LINE_HEIGHT if title else 0) + SECTION_GAP + LINE_HEIGHT * len(lines)
+            for title, _, lines in sections
+        )
+        height = max(height, content_height)
+        
+        header_background, color = editor.node_colors(table_name in visjs_data['isolated'])
+        return {
+            'name': table_name,
+            'x': pos['x'] - width / 2,
+            'y': pos['y'] - height / 2,
+            'width': width,
+            'height': height,
+            'header': header_background,
+            'border': color['border'],
+            'background': color['background'],
+            'sections': sections
+        }
+    
+    @property
+    def width(self):
+        return self.max_x - self.min_x
+    
+    @property
+    def height(self):
+        return self.max_y - self.min_y
+    
+    def _edge_segment(self, edge):
+        """두 테이블 중심을 잇는 선을 각 사각형 테두리에서 자른 선분"""
+        source = self.table_index[edge['from']]
+        target = self.table_index[edge['to']]
+        sx, sy = source['x'] + source['width'] / 2, source['y'] + source['height'] / 2
+        tx, ty = target['x'] + target['width'] / 2, target['y'] + target['height'] / 2
+        start = _clip_to_rect(tx, ty, sx, sy, source)
+        end = _clip_to_rect(sx, sy, tx, ty, target)
+        return start + end
+    
+    def build_grids(self):
+        """영역 조회용 공간 색인 (테이블, 간선)"""
+        table_grid = SpatialGrid(cell_size=1000)
+        for index, table in enumerate(self.tables):
+            table_grid.insert(index, (table['x'], table['y'], table['x'] + table['width'], table['y'] + table['height']))
+        
+        # 긴 간선이 많은 칸에 등록되지 않도록 칸을 크게
+        edge_grid = SpatialGrid(cell_size=4000)
+        for index, (x1, y1, x2, y2) in enumerate(self.segments):
+            margin = EDGE_FONT_SIZE * 4
+            edge_grid.insert(index, (min(x1, x2) - margin, min(y1, y2) - margin, max(x1, x2) + margin, max(y1, y2) + margin))
+        return table_grid, edge_grid
+
+
+def _clip_to_rect(from_x, from_y, center_x, center_y, rect):
+    """(from -> center) 방향 선이 rect 테두리와 만나는 점"""
+    dx = from_x - center_x
+    dy = from_y - center_y
+    if dx == 0 and dy == 0:
+        return center_x, center_y
+    half_w = rect['width'] / 2
+    half_h = rect['height'] / 2
+    scale = min(
+        half_w / abs(dx) if dx else math.inf,
+        half_h / abs(dy) if dy else math.inf
+    )
+    scale = min(scale, 1.0)
+    return center_x + dx * scale, center_y + dy * scale
+
+
+def _arrow_head(x1, y1, x2, y2, length=10, spread=0.45):
+    angle = math.atan2(y2 - y1, x2 - x1)
+    return [
+        (x2, y2),
+        (x2 - length * math.cos(angle - spread), y2 - length * math.sin(angle - spread)),
+        (x2 - length * math.cos(angle + spread), y2 - length * math.sin(angle + spread)),
+    ]
+
+
+def table_text_lines(table):
+    """(x 오프셋, y 오프셋, 텍스트, 색상, 글자 크기, 굵게, 구분선 색상) 목록"""
+    lines = []
+    y = HEADER_HEIGHT + TEXT_PADDING
+    for title, color, entries in table['sections']:
+        lines.append((None, y, None, color, None, False, True))
+        y += SECTION_GAP
+        if title:
+            lines.append((TEXT_PADDING, y, title, color, COLUMN_FONT_SIZE, True, False))
+            y += LINE_HEIGHT
+        for entry in entries:
+            lines.append((TEXT_PADDING, y, entry, TEXT_COLOR, COLUMN_FONT_SIZE, False, False))
+            y += LINE_HEIGHT
+    return lines
+
+
+def write_svg(scene, output_path):
+    """장면 전체를 벡터 SVG로 저장 (요소를 차례로 기록하여 큰 스키마도 메모리에 모으지 않음)"""
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(
+            f'<svg xmlns="http://www.w3.org/2000/svg" width="{scene.width:.0f}" height="{scene.height:.0f}" '
+            f'viewBox="{scene.min_x:.1f} {scene.min_y:.1f} {scene.width:.1f} {scene.height:.1f}" '
+            f'font-family="Arial, \'맑은 고딕\', sans-serif">\n'
+        )
+        f.write(f'<rect x="{scene.min_x:.1f}" y="{scene.min_y:.1f}" width="{scene.width:.1f}" height="{scene.height:.1f}" fill="#ffffff"/>\n')
+        
+        f.write(f'<g stroke="{EDGE_COLOR}" stroke-width="2" fill="{EDGE_COLOR}">\n')
+        for edge, (x1, y1, x2, y2) in zip(scene.edges, scene.segments):
+            points = ' '.join(f"{x:.1f},{y:.1f}" for x, y in _arrow_head(x1, y1, x2, y2))
+            f.write(f'<line x1="{x1:.1f}" y1="{y1:.1f}" x2="{x2:.1f}" y2="{y2:.1f}"/><polygon points="{points}" stroke="none"/>\n')
+            if edge['label']:
+                f.write(
+                    f'<text x="{(x1 + x2) / 2:.1f}" y="{(y1 + y2) / 2:.1f}" font-size="{EDGE_FONT_SIZE}" stroke="none" '
+                    f'text-anchor="middle">{escape(edge["label"])}</text>\n'
+                )
+        f.write('</g>\n')
+        
+        for table in scene.tables:
+            x, y, width, height = table['x'], table['y'], table['width'], table['height']
+            f.write('<g>')
+            f.write(
+                f'<rect x="{x:.1f}" y="{y:.1f}" width="{width:.1f}" height="{height:.1f}" '
+                f'fill="{table["background"]}" stroke="{table["border"]}" stroke-width="2"/>'
+            )
+            f.write(f'<rect x="{x:.1f}" y="{y:.1f}" width="{width:.1f}" height="{HEADER_HEIGHT}" fill="{table["header"]}"/>')
+            f.write(
+                f'<text x="{x + width / 2:.1f}" y="{y + HEADER_HEIGHT - 6:.1f}" font-size="{HEADER_FONT_SIZE}" '
+                f'font-weight="bold" fill="#ffffff" text-anchor="middle">{escape(table["name"])}</text>'
+            )
+            for offset_x, offset_y, text, color, size, bold, rule in table_text_lines(table):
+                if rule:
+                    f.write(
+                        f'<line x1="{x:.1f}" y1="{y + offset_y:.1f}" x2="{x + width:.1f}" y2="{y + offset_y:.1f}" '
+                        f'stroke="{color}" stroke-width="1"/>'
+                    )
+                    continue
+                weight = ' font-weight="bold"' if bold else ''
+                f.write(
+                    f'<text x="{x + offset_x:.1f}" y="{y + offset_y + size:.1f}" font-size="{size}"{weight} '
+                    f'fill="{color}">{escape(text)}</text>'
+                )
+            f.write('</g>\n')
+        
+        f.write('</svg>\n')
+    return output_path
+
+
+def preview_scene(tables_info):
+    """레이아웃 계산 없이 연결 그룹 순서대로 격자에 놓은 간단한 장면 (컬럼 글자 없음)"""
+    groups, isolated = connected_components(tables_info)
+    ordered = [(name, 'connected') for group in groups for name in group] + [(name, 'isolated') for name in isolated]
+    per_row = max(1, int(math.ceil(math.sqrt(len(ordered) * 1.5))))
+    cell_height = HEADER_HEIGHT + PREVIEW_MAX_LINES * PREVIEW_LINE_HEIGHT + PREVIEW_GAP
+    
+    tables = []
+    for index, (table_name, kind) in enumerate(ordered):
+        header, border, background = PREVIEW_COLORS[kind]
+        lines = min(len(tables_info[table_name]['columns']), PREVIEW_MAX_LINES)
+        tables.append({
+            'name': table_name,
+            'x': (index % per_row) * (PREVIEW_TABLE_WIDTH + PREVIEW_GAP),
+            'y': (index // per_row) * cell_height,
+            'width': PREVIEW_TABLE_WIDTH,
+            'height': HEADER_HEIGHT + TEXT_PADDING + lines * PREVIEW_LINE_HEIGHT,
+            'header': header,
+            'border': border,
+            'background': background,
+            'sections': []
+        })
+    
+    edges = []
+    for table_name, table_info in tables_info.items():
+        for fk in table_info['foreign_keys']:
+            ref_table = fk['referred_table']
+            if ref_table in tables_info and ref_table != table_name:
+                edges.append({'from': table_name, 'to': ref_table, 'label': None})
+    return DiagramScene(tables, edges)
+
+
+def render_preview(tables_info, max_side=PREVIEW_MAX_SIDE):
+    """미리보기 장면을 긴 변이 max_side 이하가 되도록 렌더링한 이미지"""
+    scene = preview_scene(tables_info)
+    rasterizer = DiagramRasterizer(scene, min(1.0, max_side / max(scene.width, scene.height)))
+    return rasterizer.render_region(0, 0, *rasterizer.pixel_size)
+
+
+class DiagramRasterizer:
+    """장면의 임의 영역을 Pillow 이미지로 렌더링 (영역과 겹치는 요소만 그림)"""
+    
+    def __init__(self, scene, scale=1.0):
+        if Image is None:
+            raise Exception("PNG 내보내기에는 Pillow가 필요합니다. (pip install pillow)")
+        self.scene = scene
+        self.scale = scale
+        self.table_grid, self.edge_grid = scene.build_grids()
+        self.fonts = {}
+    
+    @property
+    def pixel_size(self):
+        return (
+            max(1, int(math.ceil(self.scene.width * self.scale))),
+            max(1, int(math.ceil(self.scene.height * self.scale)))
+        )
+    
+    def font(self, text, size, bold=False):
+        # 한글이 있으면 대체 글꼴 사용 (글꼴 파일이 없으면 Pillow 기본 글꼴)
+        name = 'Arial Bold' if bold else 'Arial'
+        if any(is_wide_char(ch) for ch in text):
+            name = CJK_FALLBACK[name]
+        pixel_size = max(1, int(round(size * self.scale)))
+        key = (name, pixel_size)
+        if key not in self.fonts:
+            font = load_font(name, pixel_size)
+            if font is None:
+                try:
+                    font = ImageFont.load_default(pixel_size)
+                except TypeError:
+                    font = ImageFont.load_default()
+            self.fonts[key] = font
+        return self.fonts[key]
+    
+    def scene_region(self, left, top, width, height):
+        """픽셀 영역에 해당하는 장면 좌표 (min_x, min_y, max_x, max_y)"""
+        origin_x = self.scene.min_x + left / self.scale
+        origin_y = self.scene.min_y + top / self.scale
+        return (origin_x, origin_y, origin_x + width / self.scale, origin_y + height / self.scale)
+    
+    def is_empty(self, left, top, width, height):
+        """영역에 그릴 테이블/관계가 없으면 True (빈 타일은 렌더링 없이 처리)"""
+        region = self.scene_region(left, top, width, height)
+        return not self.table_grid.query(region) and not self.edge_grid.query(region)
+    
+    def render_region(self, left, top, width, height):
+        """픽셀 좌표 (left, top)부터 width x height 영역을 RGB 이미지로 반환"""
+        scale = self.scale
+        region = self.scene_region(left, top, width, height)
+        origin_x, origin_y = region[0], region[1]
+        
+        image = Image.new('RGB', (width, height), 'white')
+        draw = ImageDraw.Draw(image)
+        
+        def px(x, y):
+            return ((x - origin_x) * scale, (y - origin_y) * scale)
+        
+        line_width = max(1, int(round(2 * scale)))
+        for index in sorted(self.edge_grid.query(region)):
+            edge = self.scene.edges[index]
+            x1, y1, x2, y2 = self.scene.segments[index]
+            draw.line([px(x1, y1), px(x2, y2)], fill=EDGE_COLOR, width=line_width)
+            draw.polygon([px(x, y) for x, y in _arrow_head(x1, y1, x2, y2)], fill=EDGE_COLOR)
+            if edge['label'] and EDGE_FONT_SIZE * scale >= 4:
+                mx, my = px((x1 + x2) / 2, (y1 + y2) / 2)
+                draw.text((mx, my), edge['label'], fill=EDGE_COLOR, font=self.font(edge['label'], EDGE_FONT_SIZE), anchor='mm')
+        
+        # 글자가 4px보다 작아지면 읽을 수 없으므로 상자만 그림
+        draw_text = COLUMN_FONT_SIZE * scale >= 4
+        for index in sorted(self.table_grid.query(region)):
+            table = self.scene.tables[index]
+            x0, y0 = px(table['x'], table['y'])
+            x1, y1 = px(table['x'] + table['width'], table['y'] + table['height'])
+            draw.rectangle([x0, y0, x1, y1], fill=table['background'], outline=table['border'], width=line_width)
+            draw.rectangle([x0, y0, x1, y0 + HEADER_HEIGHT * scale], fill=table['header'])
+            if not draw_text:
+                continue
+            
+            draw.text(
+                ((x0 + x1) / 2, y0 + HEADER_HEIGHT * scale / 2), table['name'], fill='white',
+                font=self.font(table['name'], HEADER_FONT_SIZE, bold=True), anchor='mm'
+            )
+            for offset_x, offset_y, text, color, size, bold, rule in table_text_lines(table):
+                if rule:
+                    ry = y0 + offset_y * scale
+                    draw.line([(x0, ry), (x1, ry)], fill=color, width=1)
+                    continue
+                draw.text((x0 + offset_x * scale, y0 + offset_y * scale), text, fill=color, font=self.font(text, size, bold))
+        
+        return image
+
+
+class PngStreamWriter:
+    """행 단위로 받아 바로 압축해 쓰는 PNG 기록기 (전체 이미지를 메모리에 두지 않음)"""
+    
+    def __init__(self, file, width, height):
+        self.file = file
+        self.width = width
+        self.height = height
+        self.rows_written = 0
+        self.compressor = zlib.compressobj(6)
+        
+        file.write(b'\x89PNG\r\n\x1a\n')
+        # 8비트 RGB, 비월주사 없음
+        self._chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+    
+    def _chunk(self, kind, data):
+        self.file.write(struct.pack('>I', len(data)))
+        self.file.write(kind)
+        self.file.write(data)
+        self.file.write(struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff))
+    
+    def write_image(self, image):
+        """image: 너비가 같은 RGB 이미지 (가로 띠)"""
+        raw = image.tobytes()
+        stride = self.width * 3
+        rows = bytearray()
+        for offset in range(0, len(raw), stride):
+            # 각 행 앞에 필터 종류(0: 없음)
+            rows.append(0)
+            rows.extend(raw[offset:offset + stride])
+        self.rows_written += image.size[1]
+        data = self.compressor.compress(bytes(rows))
+        if data:
+            self._chunk(b'IDAT', data)
+    
+    def close(self):
+        if self.rows_written != self.height:
+            raise Exception(f"PNG 행 수가 맞지 않습니다: {self.rows_written}/{self.height}")
+        self._chunk(b'IDAT', self.compressor.flush())
+        self._chunk(b'IEND', b'')
+
+
+def write_png(scene, output_path, scale=1.0, strip_height=512, progress=None):
+    """장면 전체를 가로 띠 단위로 렌더링하여 PNG로 저장 (메모리 사용은 띠 하나 크기로 제한)"""
+    rasterizer = DiagramRasterizer(scene, scale)
+    width, height = rasterizer.pixel_size
+    strip_height = max(1, min(strip_height, MAX_STRIP_BYTES // (width * 3)))
+    
+    with open(output_path, 'wb') as f:
+        writer = PngStreamWriter(f, width, height)
+        for top in range(0, height, strip_height):
+            rows = min(strip_height, height - top)
+            writer.write_image(rasterizer.render_region(0, top, width, rows))
+            if progress:
+                progress(top + rows, height)
+        writer.close()
+    return output_path
+
+
+class DeepZoomPyramid:
+    """장면을 Deep Zoom(DZI) 타일 피라미드로 렌더링 (타일 하나씩 좌표에서 직접 그려 메모리 사용이 타일 크기로 제한)
+    
+    레벨 max_level이 배율 scale의 전체 크기, 한 레벨 내려갈 때마다 1/2. 레벨 0은 1x1 픽셀
+    타일 경로: {name}_files/{level}/{col}_{row}.png, 설명 파일: {name}.dzi
+    """
+    
+    def __init__(self, scene, scale=1.0, tile_size=DEEP_ZOOM_TILE_SIZE, overlap=DEEP_ZOOM_OVERLAP):
+        if Image is None:
+            raise Exception("딥 줌 내보내기에는 Pillow가 필요합니다. (pip install pillow)")
+        self.scene = scene
+        self.scale = scale
+        self.tile_size = tile_size
+        self.overlap = overlap
+        self.width = max(1, int(math.ceil(scene.width * scale)))
+        self.height = max(1, int(math.ceil(scene.height * scale)))
+        self.max_level = int(math.ceil(math.log2(max(self.width, self.height))))
+        self.rasterizers = {}
+        self.blank_tiles = {}
+    
+    def level_size(self, level):
+        factor = 2 ** (self.max_level - level)
+        return max(1, int(math.ceil(self.width / factor))), max(1, int(math.ceil(self.height / factor)))
+    
+    def tile_count(self, level):
+        width, height = self.level_size(level)
+        return int(math.ceil(width / self.tile_size)), int(math.ceil(height / self.tile_size))
+    
+    def total_tiles(self):
+        return sum(cols * rows for cols, rows in (self.tile_count(level) for level in range(self.max_level + 1)))
+    
+    def tile_box(self, level, col, row):
+        """레벨 이미지에서 타일이 차지하는 (left, top, width, height). 이웃 타일과 overlap만큼 겹침"""
+        width, height = self.level_size(level)
+        left = col * self.tile_size - (self.overlap if col > 0 else 0)
+        top = row * self.tile_size - (self.overlap if row > 0 else 0)
+        right = min(width, (col + 1) * self.tile_size + self.overlap)
+        bottom = min(height, (row + 1) * self.tile_size + self.overlap)
+        return left, top, right - left, bottom - top
+    
+    def rasterizer(self, level):
+        rasterizer = self.rasterizers.get(level)
+        if rasterizer is None:
+            rasterizer = DiagramRasterizer(self.scene, self.scale / 2 ** (self.max_level - level))
+            self.rasterizers[level] = rasterizer
+        return rasterizer
+    
+    def tile_bytes(self, level, col, row):
+        """타일 PNG 바이트 (내용이 없는 타일은 크기별로 한 번만 인코딩)"""
+        left, top, width, height = self.tile_box(level, col, row)
+        rasterizer = self.rasterizer(level)
+        if rasterizer.is_empty(left, top, width, height):
+            data = self.blank_tiles.get((width, height))
+            if data is None:
+                data = self.encode(Image.new('RGB', (width, height), 'white'))
+                self.blank_tiles[(width, height)] = data
+            return data
+        return self.encode(rasterizer.render_region(left, top, width, height))
+    
+    @staticmethod
+    def encode(image):
+        buffer = io.BytesIO()
+        image.save(buffer, 'PNG')
+        return buffer.getvalue()
+    
+    def tile_path(self, files_dir, level, col, row):
+        return os.path.join(files_dir, str(level), f"{col}_{row}.png")
+    
+    def write_tile(self, files_dir, level, col, row):
+        """타일 파일을 만들고 경로 반환"""
+        return self.save_tile(files_dir, level, col, row, self.tile_bytes(level, col, row))
+    
+    def save_tile(self, files_dir, level, col, row, data):
+        """그려 둔 타일을 저장하고 경로 반환 (임시 파일에 쓴 뒤 바꿔 동시에 요청되어도 안전)
+        
+        레벨 폴더만 만들고 files_dir은 만들지 않으므로, 지워진 폴더에 쓰면 되살리지 않고 FileNotFoundError
+        """
+        path = self.tile_path(files_dir, level, col, row)
+        try:
+            os.mkdir(os.path.dirname(path))
+        except FileExistsError:
+            pass
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+        return path
+    
+    def manifest(self):
+        return {
+            'width': self.width,
+            'height': self.height,
+            'tileSize': self.tile_size,
+            'overlap': self.overlap,
+            'format': 'png',
+            'maxLevel': self.max_level
+        }
+    
+    def dzi_xml(self):
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<Image xmlns="{DEEP_ZOOM_NAMESPACE}" Format="png" Overlap="{self.overlap}" TileSize="{self.tile_size}">\n'
+            f'  <Size Width="{self.width}" Height="{self.height}"/>\n'
+            '</Image>\n'
+        )
+    
+    def write(self, output_dir, name='er_diagram', progress=None):
+        """전체 피라미드를 output_dir에 저장하고 .dzi 경로 반환 (progress(완료 타일 수, 전체 타일 수))"""
+        files_dir = os.path.join(output_dir, f"{name}_files")
+        os.makedirs(files_dir, exist_ok=True)
+        total = self.total_tiles()
+        done = 0
+        for level in range(self.max_level + 1):
+            cols, rows = self.tile_count(level)
+            for row in range(rows):
+                for col in range(cols):
+                    self.write_tile(files_dir, level, col, row)
+                    done += 1
+                    if progress:
+                        progress(done, total)
+        
+        dzi_path = os.path.join(output_dir, f"{name}.dzi")
+        with open(dzi_path, 'w', encoding='utf-8') as f:
+            f.write(self.dzi_xml())
+        return dzi_path
+
+
+def write_deep_zoom(scene, output_dir, name='er_diagram', scale=1.0, progress=None):
+    """장면을 Deep Zoom 타일 디렉터리와 .dzi 설명 파일로 저장"""
+    os.makedirs(output_dir, exist_ok=True)
+    return DeepZoomPyramid(scene, scale).write(output_dir, name, progress)
@@ -1,99 +1,159 @@
-from graphviz import Digraph
 import os
-import sys
-import shutil
-from pathlib import Path
+import time
+from concurrent.futures import ThreadPoolExecutor
+from graphviz import Digraph
+from graphviz_render import DEFAULT_RENDER_TIMEOUT, ENGINE_ATTRS, RenderCancelled, RenderTimeout, engine_chain, get_renderer
+from graphviz_render import probe_graphviz, select_engine, stitch_png, stitch_svg
+from schema_graph import connected_components
+
+
+# 이 수 이상이면 연결 그룹별로 나누어 동시에 렌더링
+SPLIT_MIN_TABLES = 30
+# 독립 테이블은 이 수만큼씩 묶어 한 조각으로 렌더링
+ISOLATED_BATCH = 40
+
+# 저장 가능한 형식 (벡터 형식은 확대해도 깨지지 않고 큰 스키마도 파일이 작음)
+OUTPUT_FORMATS = ('png', 'svg', 'pdf')
+
+
+def split_output_path(path, default_format='png'):
+    """'a/b.svg' -> ('a/b', 'svg'). 지원하지 않는 확장자는 그대로 두고 기본 형식 사용"""
+    base, ext = os.path.splitext(path)
+    fmt = ext[1:].lower()
+    if fmt in OUTPUT_FORMATS:
+        return base, fmt
+    return path, default_format
+
+
+STITCH_FORMATS = {
+    'png': stitch_png,
+    'svg': stitch_svg,
+}
 
 
 class ERDiagramGenerator:
-    def __init__(self):
+    def __init__(self, logger=None):
         self.graph = None
-        self._setup_graphviz_path()
+        self.logger = logger
+        # Graphviz 확인과 결과 캐시는 프로세스 전체에서 공유
+        self.renderer = get_renderer(logger)
     
-    def _setup_graphviz_path(self):
-        graphviz_paths = []
+    def build_graph(self, tables_info, engine='dot'):
+        """engine에 맞는 그래프 속성으로 DOT 그래프 구성"""
+        graph = Digraph(comment='ER Diagram', format='png', engine=engine)
+        graph.attr(**ENGINE_ATTRS[engine])
+        graph.attr('node', shape='record', style='rounded')
         
-        if sys.platform == 'win32':
-            common_paths = [
-                r'C:\Program Files\Graphviz\bin',
-                r'C:\Program Files (x86)\Graphviz\bin',
-                os.path.expanduser(r'~\AppData\Local\Programs\Graphviz\bin'),
-            ]
-            
-            for path in common_paths:
-                if os.path.exists(path):
-                    graphviz_paths.append(path)
-            
-            path_env = os.environ.get('PATH', '')
-            for path in path_env.split(os.pathsep):
-                if 'graphviz' in path.lower() and os.path.exists(path):
-                    graphviz_paths.append(path)
+        for table_name, table_info in tables_info.items():
+            self._add_table_node(graph, table_name, table_info)
         
-        dot_path = shutil.which('dot')
-        if dot_path:
-            dot_dir = os.path.dirname(dot_path)
-            if dot_dir not in graphviz_paths:
-                graphviz_paths.insert(0, dot_dir)
+        for table_name, table_info in tables_info.items():
+            self._add_relationships(graph, table_name, table_info, tables_info)
         
-        if graphviz_paths:
-            os.environ['PATH'] = os.pathsep.join(graphviz_paths) + os.pathsep + os.environ.get('PATH', '')
+        self.graph = graph
+        return graph
     
-    def generate(self, tables_info, output_path='er_diagram'):
-        try:
-            import subprocess
-            import sys
-            
-            dot_path = shutil.which('dot')
-            if not dot_path:
-                raise Exception("Graphviz 'dot' 실행 파일을 찾을 수 없습니다.")
-            
+    def render(self, tables_info, fmt='png', engine='auto', timeout=DEFAULT_RENDER_TIMEOUT, cancel_event=None):
+        """tables_info를 렌더링한 바이트. 제한 시간을 넘기면 더 가벼운 엔진으로 다시 시도"""
+        if engine == 'auto':
+            num_edges = sum(len(table_info['foreign_keys']) for table_info in tables_info.values())
+            engine = select_engine(len(tables_info), num_edges)
+        
+        for candidate in engine_chain(engine):
+            source = self.build_graph(tables_info, candidate).source
+            started = time.perf_counter()
             try:
-                test_result = subprocess.run(
-                    [dot_path, '-V'],
-                    capture_output=True,
-                    text=True,
-                    timeout=2
-                )
-            except subprocess.TimeoutExpired:
-                raise Exception("Graphviz 'dot' 실행이 타임아웃되었습니다. Graphviz 설치에 문제가 있을 수 있습니다.")
-            except Exception as test_error:
-                raise Exception(f"Graphviz 'dot' 실행 테스트 실패: {str(test_error)}")
-            
-            if test_result.returncode != 0:
-                raise Exception(f"Graphviz 'dot' 실행 테스트 실패: {test_result.stderr}")
-            
-            self.graph = Digraph(comment='ER Diagram', format='png')
-            self.graph.attr(rankdir='LR')
-            self.graph.attr('node', shape='record', style='rounded')
-            
-            for table_name, table_info in tables_info.items():
-                self._add_table_node(table_name, table_info)
+                # 같은 DOT 소스는 캐시된 결과를 그대로 사용
+                data = self.renderer.render(source, fmt, candidate, timeout=timeout, cancel_event=cancel_event)
+            except RenderTimeout as timeout_error:
+                if self.logger:
+                    self.logger.warning(f"{str(timeout_error)} - 다른 엔진으로 다시 시도")
+                continue
+            if self.logger:
+                self.logger.debug(f"Graphviz 렌더링 ({candidate}): {len(tables_info)}개 테이블, {time.perf_counter() - started:.2f}초")
+            return data
+        raise Exception(f"Graphviz 렌더링 시간 초과: 모든 엔진이 {timeout}초 안에 끝나지 않았습니다.")
+    
+    def split_pieces(self, tables_info):
+        """연결 그룹별 조각과 독립 테이블 묶음 (큰 조각부터)"""
+        groups, isolated = connected_components(tables_info)
+        pieces = [{name: tables_info[name] for name in group} for group in groups]
+        for start in range(0, len(isolated), ISOLATED_BATCH):
+            batch = isolated[start:start + ISOLATED_BATCH]
+            pieces.append({name: tables_info[name] for name in batch})
+        return pieces
+    
+    def render_components(self, tables_info, fmt='png', engine='auto', timeout=DEFAULT_RENDER_TIMEOUT, workers=None, cancel_event=None):
+        """연결 그룹별로 dot 프로세스를 동시에 실행하고 결과를 한 장으로 이어 붙임
+        
+        그룹마다 크기에 맞는 엔진을 따로 고르므로 큰 스키마도 작은 그룹은 dot으로 배치
+        """
+        if fmt not in STITCH_FORMATS:
+            raise Exception(f"이어 붙일 수 없는 형식입니다: {fmt}")
+        pieces = self.split_pieces(tables_info)
+        if len(pieces) == 1:
+            return self.render(tables_info, fmt, engine, timeout, cancel_event)
+        
+        workers = workers or os.cpu_count() or 1
+        started = time.perf_counter()
+        # 실제 작업은 dot 하위 프로세스가 하므로 스레드로 충분
+        with ThreadPoolExecutor(max_workers=min(workers, len(pieces))) as executor:
+            # 취소되면 실행 중인 조각은 dot을 종료하고, 아직 시작하지 않은 조각은 바로 끝남
+            results = list(executor.map(lambda piece: self.render(piece, fmt, engine, timeout, cancel_event), pieces))
+        rendered = time.perf_counter() - started
+        
+        data = STITCH_FORMATS[fmt](results)
+        if self.logger:
+            self.logger.info(
+                f"Graphviz 그룹별 렌더링: {len(pieces)}개 조각, 작업자 {workers}개, "
+                f"렌더링 {rendered:.2f}초, 이어 붙이기 {time.perf_counter() - started - rendered:.2f}초"
+            )
+        return data
+    
+    def generate(self, tables_info, output_path='er_diagram', engine='auto', timeout=DEFAULT_RENDER_TIMEOUT, split_components=None,
+                 fmt='png', cancel_event=None):
+        """engine: 'auto'(크기에 따라 선택), 'dot', 'neato', 'sfdp'
+        fmt: 'png', 'svg', 'pdf' (결과 파일은 output_path.fmt)
+        
+        split_components: None이면 테이블이 SPLIT_MIN_TABLES개 이상이고 연결 그룹이 여럿일 때 그룹별로 나누어 렌더링
+        (PDF는 이어 붙일 수 없으므로 한 그래프로 렌더링)
+        cancel_event: threading.Event. 설정되면 실행 중인 dot 프로세스를 종료하고 RenderCancelled를 그대로 전달
+        """
+        try:
+            if fmt not in OUTPUT_FORMATS:
+                raise Exception(f"지원하지 않는 형식입니다: {fmt}")
+            probe_graphviz()
             
-            for table_name, table_info in tables_info.items():
-                self._add_relationships(table_name, table_info, tables_info)
+            if split_components is None:
+                split_components = len(tables_info) >= SPLIT_MIN_TABLES
             
             try:
-                result_path = self.graph.render(output_path, cleanup=True)
-                if result_path and os.path.exists(result_path):
-                    return result_path
+                if split_components and fmt in STITCH_FORMATS:
+                    data = self.render_components(tables_info, fmt, engine, timeout, cancel_event=cancel_event)
                 else:
-                    expected_path = f"{output_path}.png"
-                    if os.path.exists(expected_path):
-                        return expected_path
-                    raise Exception("Graphviz 렌더링 결과 파일을 찾을 수 없습니다.")
+                    data = self.render(tables_info, fmt, engine, timeout, cancel_event)
+                
+                result_path = f"{output_path}.{fmt}"
+                with open(result_path, 'wb') as f:
+                    f.write(data)
+                return result_path
+            except RenderCancelled:
+                raise
             except Exception as render_error:
                 error_msg = str(render_error)
                 if 'NoneType' in error_msg or 'write' in error_msg.lower() or 'timeout' in error_msg.lower():
                     raise Exception(f"Graphviz 실행 중 오류 발생. Graphviz 설치를 확인하세요: {error_msg}")
                 raise
                 
+        except RenderCancelled:
+            raise
         except Exception as e:
             error_msg = str(e)
             if 'dot' in error_msg.lower() or 'graphviz' in error_msg.lower() or 'failed to execute' in error_msg.lower() or 'NoneType' in error_msg or 'timeout' in error_msg.lower():
                 raise Exception(f"Graphviz 실행 실패: {error_msg}")
             raise
     
-    def _add_table_node(self, table_name, table_info):
+    def _add_table_node(self, graph, table_name, table_info):
         label_parts = [f"<{table_name}> {table_name}"]
         
         for col in table_info['columns']:
@@ -106,16 +166,16 @@ class ERDiagramGenerator:
             label_parts.append(f"{col_name}: {col_type}{pk_marker}{nullable}")
         
         label = "|".join(label_parts)
-        self.graph.node(table_name, label=label)
+        graph.node(table_name, label=label)
     
-    def _add_relationships(self, table_name, table_info, all_tables_info):
+    def _add_relationships(self, graph, table_name, table_info, all_tables_info):
         for fk in table_info['foreign_keys']:
             ref_table = fk['referred_table']
             if ref_table in all_tables_info:
                 from_cols = ", ".join(fk['constrained_columns'])
                 to_cols = ", ".join(fk['referred_columns'])
                 
-                self.graph.edge(
+                graph.edge(
                     table_name,
                     ref_table,
                     label=f"{from_cols} -> {to_cols}"
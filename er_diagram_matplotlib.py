@@ -1,168 +1,92 @@
 import os
+import shutil
 import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 import matplotlib
 matplotlib.use('Agg')
 import matplotlib.pyplot as plt
-from matplotlib.patches import FancyBboxPatch, FancyArrowPatch, Rectangle
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.patches import FancyBboxPatch, FancyArrowPatch, Rectangle, Polygon
+from matplotlib.collections import PatchCollection, LineCollection
 import math
 import textwrap
+from schema_graph import build_fk_graph, connected_components
+
+try:
+    from pypdf import PdfWriter
+except ImportError:
+    PdfWriter = None
+
+
+OUTPUT_FORMATS = ('png', 'svg', 'pdf')
+DEFAULT_DPI = 200
+MIN_DPI = 20
+# 그림이 커져도 PNG가 이 픽셀 수를 넘지 않도록 dpi를 낮춤
+MAX_RASTER_PIXELS = 40_000_000
+
+TABLE_WIDTH = 2.8
+TABLE_HEIGHT = 2.0
+SPACING_X = 3.5
+SPACING_Y = 2.5
+MAX_VISIBLE_COLUMNS = 10
+
+# 일괄 그리기에서 화살촉 크기 (데이터 좌표)
+ARROW_LENGTH = 0.18
+ARROW_WIDTH = 0.1
+# 일괄 그리기의 테이블 글자 (단위: pt). 이름 줄과 빈 줄 하나만큼 머리글 아래가 밀리므로 이름은 짧게 줄바꿈
+BATCHED_FONT_SIZE = 7
+BATCHED_LINE_SPACING = 1.2
+BATCHED_TEXT_PADDING = 3
+BATCHED_NAME_CHARS = 34
+
+
+# 페이지 분할 PDF: 용지 크기는 인치 (A3 가로), 나머지 치수는 pt (1인치 = 72pt)
+PAGE_SIZE = (16.54, 11.69)
+PAGE_MARGIN = 36
+PAGE_TITLE_HEIGHT = 28
+PAGE_TABLE_WIDTH = 250
+PAGE_COLUMN_GAP = 24
+PAGE_BLOCK_GAP = 14
+PAGE_HEADER_HEIGHT = 16
+PAGE_LINE_HEIGHT = 9.5
+PAGE_PADDING = 5
+PAGE_FONT_SIZE = 7
+# 고정폭 7pt 글꼴 기준 한 줄에 들어가는 글자 수
+PAGE_LINE_CHARS = 44
+# 이보다 테이블이 많으면 PDF를 한 장짜리 대신 페이지 분할로 저장
+PAGED_PDF_MIN_TABLES = 150
+
+
+def raster_dpi(fig_width, fig_height, max_pixels=MAX_RASTER_PIXELS):
+    """그림 크기(인치)에 맞춘 PNG dpi (작은 그림은 기본값 유지)"""
+    dpi = math.sqrt(max_pixels / (fig_width * fig_height))
+    return max(MIN_DPI, min(DEFAULT_DPI, int(dpi)))
+
+
+def count_artists(ax):
+    """축에 추가된 그리기 객체 수 (컬렉션은 하나로 셈)"""
+    return len(ax.patches) + len(ax.texts) + len(ax.collections) + len(ax.lines)
 
 
 class ERDiagramMatplotlibGenerator:
-    def __init__(self):
-        pass
+    def __init__(self, batched=True):
+        """batched: 상자/머리글/관계선을 컬렉션으로 묶어 그림 (False면 테이블/관계마다 개별 객체)"""
+        self.batched = batched
     
-    def generate(self, tables_info, output_path='er_diagram'):
+    def generate(self, tables_info, output_path='er_diagram', fmt='png'):
+        """fmt: 'png', 'svg', 'pdf' (결과 파일은 output_path.fmt)"""
         fig = None
         try:
-            num_tables = len(tables_info)
-            if num_tables == 0:
-                raise Exception("표시할 테이블이 없습니다.")
-            
-            cols = max(3, math.ceil(math.sqrt(num_tables * 1.3)))
-            rows = math.ceil(num_tables / cols)
-            
-            fig_width = max(16, cols * 3.5)
-            fig_height = max(12, rows * 2.5)
-            
-            fig, ax = plt.subplots(figsize=(fig_width, fig_height))
-            ax.set_xlim(0, cols * 3.5)
-            ax.set_ylim(0, rows * 2.5)
-            ax.axis('off')
-            ax.set_facecolor('white')
-            
-            table_positions = {}
-            table_width = 2.8
-            table_height = 2.0
-            spacing_x = 3.5
-            spacing_y = 2.5
-            
-            start_x = 1.8
-            start_y = rows * 2.5 - 1.0
-            
-            idx = 0
-            for table_name in tables_info.keys():
-                col = idx % cols
-                row = idx // cols
-                x = start_x + (col * spacing_x)
-                y = start_y - (row * spacing_y)
-                table_positions[table_name] = (x, y)
-                idx += 1
-            
-            for table_name, (x, y) in table_positions.items():
-                table_info = tables_info[table_name]
-                
-                main_box = FancyBboxPatch(
-                    (x - table_width/2, y - table_height/2), 
-                    table_width, table_height,
-                    boxstyle="round,pad=0.1",
-                    edgecolor='#34495e',
-                    facecolor='#ffffff',
-                    linewidth=2.5,
-                    zorder=1
-                )
-                ax.add_patch(main_box)
-                
-                header_box = Rectangle(
-                    (x - table_width/2, y + table_height/2 - 0.4), 
-                    table_width, 0.4,
-                    edgecolor='#2c3e50',
-                    facecolor='#3498db',
-                    linewidth=2,
-                    zorder=2
-                )
-                ax.add_patch(header_box)
-                
-                table_name_wrapped = '\n'.join(textwrap.wrap(table_name, width=20))
-                ax.text(x, y + table_height/2 - 0.2, table_name_wrapped, 
-                       ha='center', va='center',
-                       fontsize=10, fontweight='bold', color='white',
-                       zorder=3)
-                
-                columns_text = []
-                max_cols = 10
-                shown_cols = table_info['columns'][:max_cols]
-                
-                for col in shown_cols:
-                    col_name = col['name']
-                    col_type = str(col['type']).split('(')[0].split('[')[0]
-                    
-                    pk_marker = " [PK]" if col_name in table_info['primary_keys'] else ""
-                    null_marker = " *" if not col.get('nullable', True) else ""
-                    
-                    col_display = f"{col_name}{pk_marker}{null_marker}"
-                    type_display = col_type[:18] if len(col_type) <= 18 else col_type[:15] + "..."
-                    
-                    display_text = f"{col_display:25s} {type_display}"
-                    columns_text.append(display_text)
-                
-                if len(table_info['columns']) > max_cols:
-                    columns_text.append(f"... (+{len(table_info['columns']) - max_cols}개 더)")
-                
-                columns_str = '\n'.join(columns_text)
-                ax.text(x, y - 0.1, columns_str, 
-                       ha='left', va='center',
-                       fontsize=7, family='monospace',
-                       bbox=dict(boxstyle='round,pad=0.1', facecolor='#f8f9fa', alpha=0.9, edgecolor='#dee2e6'),
-                       zorder=2)
+            if fmt not in OUTPUT_FORMATS:
+                raise Exception(f"지원하지 않는 형식입니다: {fmt}")
             
-            drawn_arrows = set()
-            for table_name, table_info in tables_info.items():
-                for fk in table_info['foreign_keys']:
-                    ref_table = fk['referred_table']
-                    if ref_table in table_positions:
-                        arrow_key = tuple(sorted([table_name, ref_table]))
-                        if arrow_key in drawn_arrows:
-                            continue
-                        drawn_arrows.add(arrow_key)
-                        
-                        x1, y1 = table_positions[table_name]
-                        x2, y2 = table_positions[ref_table]
-                        
-                        dx = x2 - x1
-                        dy = y2 - y1
-                        dist = math.sqrt(dx*dx + dy*dy)
-                        
-                        if dist < 0.1:
-                            continue
-                        
-                        start_x = x1 + (dx / dist) * (table_width/2)
-                        start_y = y1 + (dy / dist) * (table_height/2)
-                        end_x = x2 - (dx / dist) * (table_width/2)
-                        end_y = y2 - (dy / dist) * (table_height/2)
-                        
-                        arrow = FancyArrowPatch(
-                            (start_x, start_y), 
-                            (end_x, end_y),
-                            arrowstyle='->', 
-                            mutation_scale=30,
-                            linewidth=2.5, 
-                            color='#e74c3c', 
-                            alpha=0.8,
-                            zorder=0,
-                            connectionstyle="arc3,rad=0.15" if abs(dx) > 1 else None
-                        )
-                        ax.add_patch(arrow)
-                        
-                        fk_cols = fk['constrained_columns'][:2]
-                        label_text = ', '.join(fk_cols)
-                        if len(fk['constrained_columns']) > 2:
-                            label_text += f" (+{len(fk['constrained_columns'])-2})"
-                        
-                        mid_x = (start_x + end_x) / 2
-                        mid_y = (start_y + end_y) / 2
-                        ax.text(mid_x, mid_y - 0.2, label_text,
-                               ha='center', fontsize=7, color='#c0392b', fontweight='bold',
-                               bbox=dict(boxstyle='round,pad=0.15', facecolor='white', alpha=0.95, edgecolor='#e74c3c'),
-                               zorder=4)
+            fig, ax = self.build_figure(tables_info)
             
-            ax.text(cols * 3.5 / 2, 0.3, f'ER 다이어그램 (총 {num_tables}개 테이블)', 
-                   ha='center', fontsize=12, style='italic', color='#7f8c8d',
-                   bbox=dict(boxstyle='round,pad=0.3', facecolor='#ecf0f1', alpha=0.95, edgecolor='#bdc3c7'))
-            
-            output_file = f"{output_path}.png"
-            plt.savefig(output_file, dpi=200, bbox_inches='tight', format='png', 
-                       facecolor='white', edgecolor='none', pad_inches=0.2)
+            output_file = f"{output_path}.{fmt}"
+            # SVG 글자를 경로로 바꾸지 않아 파일이 작고 검색 가능
+            with plt.rc_context({'svg.fonttype': 'none'}):
+                fig.savefig(output_file, **self.save_options(fig, fmt))
             plt.close(fig)
             fig = None
             
@@ -170,9 +94,492 @@ class ERDiagramMatplotlibGenerator:
                 return output_file
             else:
                 raise Exception("이미지 파일이 생성되지 않았습니다.")
-                
+        
         except Exception as e:
             if fig is not None:
                 plt.close(fig)
             raise Exception(f"matplotlib 다이어그램 생성 실패: {str(e)}")
+    
+    def generate_paged(self, tables_info, output_path='er_diagram', workers=1, logger=None):
+        """연결 그룹별로 페이지를 나눈 PDF (output_path.pdf, 페이지마다 전체 컬럼과 다른 페이지 참조 표시)"""
+        try:
+            output_file = generate_paged_pdf(tables_info, output_path, workers=workers, logger=logger)
+        except Exception as e:
+            raise Exception(f"matplotlib 페이지 분할 PDF 생성 실패: {str(e)}")
+        if not os.path.exists(output_file):
+            raise Exception("PDF 파일이 생성되지 않았습니다.")
+        return output_file
+    
+    def save_options(self, fig, fmt):
+        """savefig 인자. 벡터 형식은 dpi와 무관하게 크기가 일정하고, PNG만 픽셀 수를 제한
+        
+        bbox_inches='tight'는 여백 계산을 위해 그림 전체를 한 번 더 그리므로
+        일괄 그리기에서는 축을 그림에 꽉 채우고 사용하지 않음
+        """
+        fig_width, fig_height = fig.get_size_inches()
+        return {
+            'dpi': raster_dpi(fig_width, fig_height) if fmt == 'png' else DEFAULT_DPI,
+            'bbox_inches': None if self.batched else 'tight',
+            'format': fmt,
+            'facecolor': 'white',
+            'edgecolor': 'none',
+            'pad_inches': 0.2
+        }
+    
+    def build_figure(self, tables_info):
+        """격자 배치로 모든 테이블과 관계를 그린 (fig, ax)"""
+        num_tables = len(tables_info)
+        if num_tables == 0:
+            raise Exception("표시할 테이블이 없습니다.")
+        
+        cols = max(3, math.ceil(math.sqrt(num_tables * 1.3)))
+        rows = math.ceil(num_tables / cols)
+        
+        fig_width = max(16, cols * 3.5)
+        fig_height = max(12, rows * 2.5)
+        
+        fig, ax = plt.subplots(figsize=(fig_width, fig_height))
+        if self.batched:
+            fig.subplots_adjust(left=0.01, right=0.99, bottom=0.01, top=0.99)
+        ax.set_xlim(0, cols * 3.5)
+        ax.set_ylim(0, rows * 2.5)
+        ax.axis('off')
+        ax.set_facecolor('white')
+        
+        table_positions = {}
+        start_x = 1.8
+        start_y = rows * 2.5 - 1.0
+        
+        idx = 0
+        for table_name in tables_info.keys():
+            col = idx % cols
+            row = idx // cols
+            x = start_x + (col * SPACING_X)
+            y = start_y - (row * SPACING_Y)
+            table_positions[table_name] = (x, y)
+            idx += 1
+        
+        edges = self._edge_segments(tables_info, table_positions)
+        if self.batched:
+            self._draw_tables_batched(ax, tables_info, table_positions)
+            self._draw_edges_batched(ax, edges)
+        else:
+            self._draw_tables(ax, tables_info, table_positions)
+            self._draw_edges(ax, edges)
+        
+        ax.text(cols * 3.5 / 2, 0.3, f'ER 다이어그램 (총 {num_tables}개 테이블)',
+               ha='center', fontsize=12, style='italic', color='#7f8c8d',
+               bbox=dict(boxstyle='round,pad=0.3', facecolor='#ecf0f1', alpha=0.95, edgecolor='#bdc3c7'))
+        return fig, ax
+    
+    def _columns_text(self, table_info, max_cols=MAX_VISIBLE_COLUMNS):
+        columns_text = []
+        shown_cols = table_info['columns'] if max_cols is None else table_info['columns'][:max_cols]
+        
+        for col in shown_cols:
+            col_name = col['name']
+            col_type = str(col['type']).split('(')[0].split('[')[0]
+            
+            pk_marker = " [PK]" if col_name in table_info['primary_keys'] else ""
+            null_marker = " *" if not col.get('nullable', True) else ""
+            
+            col_display = f"{col_name}{pk_marker}{null_marker}"
+            type_display = col_type[:18] if len(col_type) <= 18 else col_type[:15] + "..."
+            
+            display_text = f"{col_display:25s} {type_display}"
+            columns_text.append(display_text)
+        
+        if max_cols is not None and len(table_info['columns']) > max_cols:
+            columns_text.append(f"... (+{len(table_info['columns']) - max_cols}개 더)")
+        
+        return '\n'.join(columns_text)
+    
+    def _edge_segments(self, tables_info, table_positions):
+        """[(시작 x, 시작 y, 끝 x, 끝 y, 라벨, 가로 거리)] (테이블 쌍마다 한 번)"""
+        edges = []
+        drawn_arrows = set()
+        for table_name, table_info in tables_info.items():
+            for fk in table_info['foreign_keys']:
+                ref_table = fk['referred_table']
+                if ref_table in table_positions:
+                    arrow_key = tuple(sorted([table_name, ref_table]))
+                    if arrow_key in drawn_arrows:
+                        continue
+                    drawn_arrows.add(arrow_key)
+                    
+                    x1, y1 = table_positions[table_name]
+                    x2, y2 = table_positions[ref_table]
+                    
+                    dx = x2 - x1
+                    dy = y2 - y1
+                    dist = math.sqrt(dx*dx + dy*dy)
+                    
+                    if dist < 0.1:
+                        continue
+                    
+                    start_x = x1 + (dx / dist) * (TABLE_WIDTH/2)
+                    start_y = y1 + (dy / dist) * (TABLE_HEIGHT/2)
+                    end_x = x2 - (dx / dist) * (TABLE_WIDTH/2)
+                    end_y = y2 - (dy / dist) * (TABLE_HEIGHT/2)
+                    
+                    fk_cols = fk['constrained_columns'][:2]
+                    label_text = ', '.join(fk_cols)
+                    if len(fk['constrained_columns']) > 2:
+                        label_text += f" (+{len(fk['constrained_columns'])-2})"
+                    
+                    edges.append((start_x, start_y, end_x, end_y, label_text, dx))
+        return edges
+    
+    def _draw_tables(self, ax, tables_info, table_positions):
+        for table_name, (x, y) in table_positions.items():
+            table_info = tables_info[table_name]
+            
+            main_box = FancyBboxPatch(
+                (x - TABLE_WIDTH/2, y - TABLE_HEIGHT/2),
+                TABLE_WIDTH, TABLE_HEIGHT,
+                boxstyle="round,pad=0.1",
+                edgecolor='#34495e',
+                facecolor='#ffffff',
+                linewidth=2.5,
+                zorder=1
+            )
+            ax.add_patch(main_box)
+            
+            header_box = Rectangle(
+                (x - TABLE_WIDTH/2, y + TABLE_HEIGHT/2 - 0.4),
+                TABLE_WIDTH, 0.4,
+                edgecolor='#2c3e50',
+                facecolor='#3498db',
+                linewidth=2,
+                zorder=2
+            )
+            ax.add_patch(header_box)
+            
+            table_name_wrapped = '\n'.join(textwrap.wrap(table_name, width=20))
+            ax.text(x, y + TABLE_HEIGHT/2 - 0.2, table_name_wrapped,
+                   ha='center', va='center',
+                   fontsize=10, fontweight='bold', color='white',
+                   zorder=3)
+            
+            ax.text(x, y - 0.1, self._columns_text(table_info),
+                   ha='left', va='center',
+                   fontsize=7, family='monospace',
+                   bbox=dict(boxstyle='round,pad=0.1', facecolor='#f8f9fa', alpha=0.9, edgecolor='#dee2e6'),
+                   zorder=2)
+    
+    def _draw_edges(self, ax, edges):
+        for start_x, start_y, end_x, end_y, label_text, dx in edges:
+            arrow = FancyArrowPatch(
+                (start_x, start_y),
+                (end_x, end_y),
+                arrowstyle='->',
+                mutation_scale=30,
+                linewidth=2.5,
+                color='#e74c3c',
+                alpha=0.8,
+                zorder=0,
+                connectionstyle="arc3,rad=0.15" if abs(dx) > 1 else None
+            )
+            ax.add_patch(arrow)
+            
+            mid_x = (start_x + end_x) / 2
+            mid_y = (start_y + end_y) / 2
+            ax.text(mid_x, mid_y - 0.2, label_text,
+                   ha='center', fontsize=7, color='#c0392b', fontweight='bold',
+                   bbox=dict(boxstyle='round,pad=0.15', facecolor='white', alpha=0.95, edgecolor='#e74c3c'),
+                   zorder=4)
+    
+    def _draw_tables_batched(self, ax, tables_info, table_positions):
+        """상자/머리글은 컬렉션 두 개로, 글자는 테이블마다 이름과 컬럼 목록을 합친 하나(말풍선 상자 없이)
+        
+        글자 객체 하나는 색과 굵기가 하나뿐이므로 머리글을 옅은 색으로 칠하고 이름을 첫 줄에 진한 글자로 둔다.
+        머리글 높이는 이름 줄 수에 맞춰 pt를 데이터 좌표로 바꿔 정함
+        """
+        # 축 높이(pt) / y 범위 = 데이터 1단위당 pt
+        y_min, y_max = ax.get_ylim()
+        points_per_unit = ax.bbox.height / ax.figure.dpi * 72 / (y_max - y_min)
+        line_height = BATCHED_FONT_SIZE * BATCHED_LINE_SPACING / points_per_unit
+        padding = BATCHED_TEXT_PADDING / points_per_unit
+        
+        boxes = []
+        headers = []
+        for table_name, (x, y) in table_positions.items():
+            left = x - TABLE_WIDTH/2
+            top = y + TABLE_HEIGHT/2
+            boxes.append(FancyBboxPatch(
+                (left, y - TABLE_HEIGHT/2),
+                TABLE_WIDTH, TABLE_HEIGHT,
+                boxstyle="round,pad=0.1"
+            ))
+            
+            name_lines = textwrap.wrap(table_name, width=BATCHED_NAME_CHARS) or ['']
+            header_height = len(name_lines) * line_height + padding * 2
+            headers.append(Rectangle((left, top - header_height), TABLE_WIDTH, header_height))
+            
+            # 이름 아래에 빈 줄을 두어 컬럼 목록이 머리글 밖에서 시작
+            text = '\n'.join(name_lines) + '\n\n' + self._columns_text(tables_info[table_name])
+            ax.text(left + padding, top - padding, text,
+                   ha='left', va='top', linespacing=BATCHED_LINE_SPACING,
+                   fontsize=BATCHED_FONT_SIZE, family='monospace', color='#2c3e50',
+                   zorder=3)
+        
+        ax.add_collection(PatchCollection(boxes, facecolor='#ffffff', edgecolor='#34495e', linewidth=2.5, zorder=1))
+        ax.add_collection(PatchCollection(headers, facecolor='#d6eaf8', edgecolor='#2c3e50', linewidth=2, zorder=2))
+    
+    def _draw_edges_batched(self, ax, edges):
+        """관계선은 직선 LineCollection 하나와 화살촉 PatchCollection 하나로 그림"""
+        if not edges:
+            return
+        
+        segments = []
+        heads = []
+        for start_x, start_y, end_x, end_y, label_text, _ in edges:
+            segments.append([(start_x, start_y), (end_x, end_y)])
+            
+            angle = math.atan2(end_y - start_y, end_x - start_x)
+            base_x = end_x - ARROW_LENGTH * math.cos(angle)
+            base_y = end_y - ARROW_LENGTH * math.sin(angle)
+            offset_x = ARROW_WIDTH * math.sin(angle)
+            offset_y = ARROW_WIDTH * math.cos(angle)
+            heads.append(Polygon([
+                (end_x, end_y),
+                (base_x + offset_x, base_y - offset_y),
+                (base_x - offset_x, base_y + offset_y)
+            ], closed=True))
+            
+            mid_x = (start_x + end_x) / 2
+            mid_y = (start_y + end_y) / 2
+            ax.text(mid_x, mid_y - 0.2, label_text,
+                   ha='center', fontsize=7, color='#c0392b', fontweight='bold',
+                   zorder=4)
+        
+        ax.add_collection(LineCollection(segments, colors='#e74c3c', linewidths=2.5, alpha=0.8, zorder=0))
+        ax.add_collection(PatchCollection(heads, facecolor='#e74c3c', edgecolor='none', alpha=0.8, zorder=0))
+
+
+def _component_order(group, parents, children):
+    """연결 그룹 안에서 관계가 많은 테이블부터 너비 우선 순서 (이웃 테이블이 가까이 놓이도록)"""
+    members = set(group)
+    degree = {name: len(parents[name]) + len(children[name]) for name in group}
+    start = min(group, key=lambda name: (-degree[name], name))
+    order = [start]
+    visited = {start}
+    queue = deque([start])
+    while queue:
+        current = queue.popleft()
+        for neighbor in sorted((parents[current] | children[current]) & members):
+            if neighbor not in visited:
+                visited.add(neighbor)
+                order.append(neighbor)
+                queue.append(neighbor)
+    return order
+
+
+def _fit_line(text, width=PAGE_LINE_CHARS):
+    return text if len(text) <= width else text[:width - 3] + "..."
+
+
+def layout_pages(tables_info, page_size=PAGE_SIZE):
+    """연결 그룹 순서대로 테이블을 페이지의 세로 단에 채워 넣은 페이지 목록
+    
+    테이블은 전체 컬럼을 표시하고, 한 단에 들어가지 않으면 여러 조각(계속)으로 나눈다.
+    반환: [{'number', 'label', 'blocks': [{'table', 'part', 'parts', 'x', 'y', 'height', 'lines', 'refs', 'markers'}]}]
+    """
+    page_width = page_size[0] * 72
+    page_height = page_size[1] * 72
+    top = PAGE_MARGIN + PAGE_TITLE_HEIGHT
+    bottom = page_height - PAGE_MARGIN
+    num_columns = max(1, int((page_width - 2 * PAGE_MARGIN + PAGE_COLUMN_GAP) // (PAGE_TABLE_WIDTH + PAGE_COLUMN_GAP)))
+    max_lines = max(1, int((bottom - top - PAGE_HEADER_HEIGHT - 2 * PAGE_PADDING) // PAGE_LINE_HEIGHT))
+    
+    parents, children = build_fk_graph(tables_info)
+    groups, isolated = connected_components(tables_info)
+    sequences = [(f"연결 그룹 {index + 1} ({len(group)}개)", _component_order(group, parents, children))
+                 for index, group in enumerate(groups)]
+    if isolated:
+        sequences.append((f"독립 테이블 ({len(isolated)}개)", isolated))
+    
+    pages = []
+    state = {'page': None, 'column': num_columns, 'y': top}
+    
+    def next_column(label):
+        state['column'] += 1
+        state['y'] = top
+        if state['column'] >= num_columns:
+            state['page'] = {'number': len(pages) + 1, 'label': label, 'blocks': []}
+            pages.append(state['page'])
+            state['column'] = 0
+    
+    first_page = {}
+    for label, names in sequences:
+        # 연결 그룹은 새 단에서 시작
+        if state['y'] > top or state['page'] is None:
+            next_column(label)
+        for table_name in names:
+            lines = [_column_entry(col, tables_info[table_name]) for col in tables_info[table_name]['columns']] or [("", None)]
+            chunks = [lines[i:i + max_lines] for i in range(0, len(lines), max_lines)]
+            for part, chunk in enumerate(chunks):
+                height = PAGE_HEADER_HEIGHT + 2 * PAGE_PADDING + len(chunk) * PAGE_LINE_HEIGHT
+                if state['y'] + height > bottom and state['y'] > top:
+                    next_column(label)
+                x = PAGE_MARGIN + state['column'] * (PAGE_TABLE_WIDTH + PAGE_COLUMN_GAP)
+                state['page']['blocks'].append({
+                    'table': table_name,
+                    'part': part + 1,
+                    'parts': len(chunks),
+                    'x': x,
+                    'y': state['y'],
+                    'height': height,
+                    'lines': [text for text, _ in chunk],
+                    'refs': [ref for _, ref in chunk]
+                })
+                first_page.setdefault(table_name, state['page']['number'])
+                state['y'] += height + PAGE_BLOCK_GAP
+    
+    # 참조 표시는 모든 테이블의 페이지가 정해진 뒤에 채움
+    for page in pages:
+        for block in page['blocks']:
+            block['markers'] = [_reference_marker(ref, first_page.get(ref), page['number']) for ref in block['refs']]
+    return pages
+
+
+def _reference_marker(ref, ref_page, page_number):
+    """FK 컬럼 옆 참조 표시. 다른 페이지에 있는 테이블이면 페이지 번호를 붙임"""
+    if ref is None:
+        return ""
+    if ref_page is None or ref_page == page_number:
+        return f"→ {ref}"
+    return f"→ {ref} (p.{ref_page})"
+
+
+def _column_entry(col, table_info):
+    """(표시 문자열, 참조 테이블 또는 None)"""
+    col_name = col['name']
+    col_type = str(col['type']).split('(')[0].split('[')[0]
+    pk_marker = " [PK]" if col_name in table_info['primary_keys'] else ""
+    null_marker = " *" if not col.get('nullable', True) else ""
+    ref = None
+    for fk in table_info['foreign_keys']:
+        if col_name in fk['constrained_columns']:
+            ref = fk['referred_table']
+            break
+    return _fit_line(f"{col_name}{pk_marker}{null_marker}  {col_type}", PAGE_LINE_CHARS - (18 if ref else 0)), ref
+
+
+def draw_page(page, total_pages, page_size=PAGE_SIZE):
+    """페이지 하나를 그린 Figure (좌표는 pt, 위에서 아래로)"""
+    page_width = page_size[0] * 72
+    page_height = page_size[1] * 72
+    fig = plt.figure(figsize=page_size)
+    ax = fig.add_axes([0, 0, 1, 1])
+    ax.set_xlim(0, page_width)
+    ax.set_ylim(page_height, 0)
+    ax.axis('off')
+    
+    ax.text(PAGE_MARGIN, PAGE_MARGIN, f"ER 다이어그램 - {page['label']}", fontsize=11, fontweight='bold',
+            color='#2c3e50', va='top')
+    ax.text(page_width - PAGE_MARGIN, PAGE_MARGIN, f"{page['number']} / {total_pages}", fontsize=9,
+            color='#7f8c8d', va='top', ha='right')
+    
+    boxes = []
+    headers = []
+    positions = {}
+    for block in page['blocks']:
+        x, y = block['x'], block['y']
+        boxes.append(Rectangle((x, y), PAGE_TABLE_WIDTH, block['height']))
+        headers.append(Rectangle((x, y), PAGE_TABLE_WIDTH, PAGE_HEADER_HEIGHT))
+        title = block['table'] if block['parts'] == 1 else f"{block['table']} ({block['part']}/{block['parts']})"
+        ax.text(x + PAGE_PADDING, y + PAGE_HEADER_HEIGHT / 2, _fit_line(title, 36), fontsize=8, fontweight='bold',
+                color='white', va='center', zorder=3)
+        
+        text_y = y + PAGE_HEADER_HEIGHT + PAGE_PADDING
+        ax.text(x + PAGE_PADDING, text_y, '\n'.join(block['lines']), fontsize=PAGE_FONT_SIZE, family='monospace',
+                va='top', linespacing=1.15, zorder=3)
+        if any(block['markers']):
+            ax.text(x + PAGE_TABLE_WIDTH - PAGE_PADDING, text_y, '\n'.join(block['markers']), fontsize=PAGE_FONT_SIZE,
+                    family='monospace', va='top', ha='right', linespacing=1.15, color='#1976d2', zorder=3)
+        if block['part'] == 1:
+            positions[block['table']] = (x, y)
+    
+    # 같은 페이지 안의 관계는 선으로 연결 (다른 페이지는 컬럼 옆 참조 표시로 대신함)
+    segments = []
+    for block in page['blocks']:
+        for row, ref in enumerate(block['refs']):
+            target = positions.get(ref)
+            if target is None or ref == block['table']:
+                continue
+            row_y = block['y'] + PAGE_HEADER_HEIGHT + PAGE_PADDING + (row + 0.5) * PAGE_LINE_HEIGHT
+            source_x = block['x'] + PAGE_TABLE_WIDTH if target[0] > block['x'] else block['x']
+            target_x = target[0] if target[0] > block['x'] else target[0] + PAGE_TABLE_WIDTH
+            segments.append([(source_x, row_y), (target_x, target[1] + PAGE_HEADER_HEIGHT / 2)])
+    
+    if segments:
+        ax.add_collection(LineCollection(segments, colors='#e74c3c', linewidths=0.8, alpha=0.6, zorder=0))
+    ax.add_collection(PatchCollection(boxes, facecolor='#ffffff', edgecolor='#34495e', linewidth=1, zorder=1))
+    ax.add_collection(PatchCollection(headers, facecolor='#3498db', edgecolor='#2c3e50', linewidth=1, zorder=2))
+    return fig
+
+
+def render_pages(pages, total_pages, output_file, page_size=PAGE_SIZE):
+    """페이지를 하나씩 그려 바로 PDF에 쓰고 닫음 (메모리에는 한 페이지만 유지)"""
+    with PdfPages(output_file) as pdf:
+        for page in pages:
+            fig = draw_page(page, total_pages, page_size)
+            pdf.savefig(fig)
+            plt.close(fig)
+    return output_file
+
+
+def generate_paged_pdf(tables_info, output_path='er_diagram', page_size=PAGE_SIZE, workers=1, logger=None):
+    """연결 그룹별로 나눈 여러 페이지 PDF (output_path.pdf)
+    
+    workers > 1이고 pypdf가 있으면 페이지 묶음을 프로세스 풀에서 따로 그린 뒤 합침
+    """
+    if not tables_info:
+        raise Exception("표시할 테이블이 없습니다.")
+    output_file = f"{output_path}.pdf"
+    pages = layout_pages(tables_info, page_size)
+    total_pages = len(pages)
+    
+    if workers > 1 and total_pages > 1:
+        if PdfWriter is None:
+            if logger:
+                logger.warning("pypdf가 없어 PDF 페이지를 순차적으로 생성합니다. (pip install pypdf)")
+        else:
+            try:
+                return _render_pages_parallel(pages, total_pages, output_file, page_size, workers, logger)
+            except Exception as e:
+                if logger:
+                    logger.warning(f"병렬 PDF 생성 실패, 순차 처리로 대체: {str(e)}")
+    
+    render_pages(pages, total_pages, output_file, page_size)
+    if logger:
+        logger.info(f"페이지 분할 PDF 생성: {len(tables_info)}개 테이블, {total_pages}페이지")
+    return output_file
+
 
+def _render_pages_parallel(pages, total_pages, output_file, page_size, workers, logger=None):
+    temp_dir = tempfile.mkdtemp(prefix='erd_pdf_')
+    try:
+        # 연속된 페이지 묶음을 작업자마다 하나씩 맡겨 합칠 파일 수를 줄임
+        batch = math.ceil(total_pages / workers)
+        batches = [pages[i:i + batch] for i in range(0, total_pages, batch)]
+        part_files = [os.path.join(temp_dir, f"part_{index:04d}.pdf") for index in range(len(batches))]
+        with ProcessPoolExecutor(max_workers=min(workers, len(batches))) as executor:
+            futures = [
+                executor.submit(render_pages, pages_batch, total_pages, part_file, page_size)
+                for pages_batch, part_file in zip(batches, part_files)
+            ]
+            for future in futures:
+                future.result()
+        
+        writer = PdfWriter()
+        for part_file in part_files:
+            writer.append(part_file)
+        with open(output_file, 'wb') as f:
+            writer.write(f)
+        if logger:
+            logger.info(f"페이지 분할 PDF 생성 (작업자 {len(batches)}개): {total_pages}페이지")
+        return output_file
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
@@ -2,10 +2,32 @@ import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from PIL import Image, ImageTk
 import io
+import queue
 import tempfile
+import threading
+import time
 import os
-from er_diagram import ERDiagramGenerator
+from canvas_renderer import SceneCanvasRenderer
+from diagram_export import DiagramScene, render_preview
+from er_diagram import ERDiagramGenerator, split_output_path
+from graphviz_render import RenderCancelled
 from er_diagram_matplotlib import ERDiagramMatplotlibGenerator
+from er_diagram_web import ERDiagramWebEditor
+from tile_pyramid import TilePyramid
+
+
+MIN_SCALE = 0.02
+MAX_SCALE = 3.0
+ZOOM_STEP = 1.2
+# 이 시간 안에 들어온 휠 입력은 합쳐서 한 번만 확대/축소
+ZOOM_COALESCE_MS = 40
+# 생성 스레드 결과 확인 간격
+POLL_MS = 100
+# 이전 작업이 렌더링 잠금을 쥐고 있을 때 취소 여부를 확인하며 기다리는 간격(초)
+LOCK_WAIT_SECONDS = 0.2
+
+# pyplot 전역 상태를 공유하므로 취소된 작업이 끝나기 전에 다음 생성이 겹치지 않도록 직렬화
+_render_lock = threading.Lock()
 
 
 class ERDiagramViewer:
@@ -17,6 +39,27 @@ class ERDiagramViewer:
         self.image = None
         self.photo = None
         self.scale_factor = 1.0
+        # 화면에 표시한 이미지를 만든 생성기 (SVG/PDF 저장 시 같은 생성기로 다시 생성)
+        self.generator = None
+        self.render_pending = None
+        self.pyramid = None
+        # 화면에 놓인 타일: (level, col, row, 화면 좌표) -> (캔버스 항목, PhotoImage)
+        self.tile_items = {}
+        self.wheel_steps = 0
+        self.wheel_anchor = None
+        self.wheel_pending = None
+        # 백그라운드 생성: 작업 번호가 바뀌면 이전 작업 결과는 버림
+        self.job_id = 0
+        self.cancel_event = None
+        self.messages = queue.Queue()
+        self.poll_pending = None
+        self.job_started = None
+        self.job_stage = ""
+        self.showing_preview = False
+        # 벡터 보기: 레이아웃 좌표로 캔버스 항목을 직접 그림 (비트맵 생성 없이)
+        self.scene = None
+        self.scene_pending = False
+        self.renderer = None
         
     def show(self):
         if not self.tables_info:
@@ -26,6 +69,7 @@ class ERDiagramViewer:
         self.window = tk.Toplevel(self.parent)
         self.window.title("ER 다이어그램 뷰어")
         self.window.geometry("1000x700")
+        self.window.protocol("WM_DELETE_WINDOW", self.close)
         
         toolbar = ttk.Frame(self.window)
         toolbar.pack(fill=tk.X, padx=5, pady=5)
@@ -36,8 +80,16 @@ class ERDiagramViewer:
         ttk.Button(toolbar, text="확대", command=self.zoom_in).pack(side=tk.LEFT, padx=5)
         ttk.Button(toolbar, text="축소", command=self.zoom_out).pack(side=tk.LEFT, padx=5)
         ttk.Button(toolbar, text="원본 크기", command=self.zoom_reset).pack(side=tk.LEFT, padx=5)
+        ttk.Separator(toolbar, orient=tk.VERTICAL).pack(side=tk.LEFT, padx=5, fill=tk.Y)
+        self.vector_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(toolbar, text="벡터 보기", variable=self.vector_var, command=self.toggle_vector).pack(side=tk.LEFT, padx=5)
         ttk.Label(toolbar, text="확대/축소: 마우스 휠 또는 버튼 사용", font=("맑은 고딕", 9)).pack(side=tk.LEFT, padx=10)
         
+        self.progress = ttk.Progressbar(toolbar, mode='indeterminate', length=120)
+        self.progress.pack(side=tk.RIGHT, padx=5)
+        self.status_var = tk.StringVar()
+        ttk.Label(toolbar, textvariable=self.status_var, font=("맑은 고딕", 9)).pack(side=tk.RIGHT, padx=5)
+        
         canvas_frame = ttk.Frame(self.window)
         canvas_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
@@ -55,8 +107,8 @@ class ERDiagramViewer:
         )
         self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         
-        h_scrollbar.config(command=self.canvas.xview)
-        v_scrollbar.config(command=self.canvas.yview)
+        h_scrollbar.config(command=self.on_xview)
+        v_scrollbar.config(command=self.on_yview)
         
         self.canvas.bind("<MouseWheel>", self.on_mousewheel)
         self.canvas.bind("<Button-4>", self.on_mousewheel)
@@ -64,34 +116,81 @@ class ERDiagramViewer:
         self.canvas.bind("<Button-1>", self.on_canvas_click)
         self.canvas.bind("<B1-Motion>", self.on_canvas_drag)
         self.canvas.bind("<ButtonRelease-1>", self.on_canvas_release)
-        
-        self.canvas_start_x = 0
-        self.canvas_start_y = 0
-        self.canvas_scroll_x = 0
-        self.canvas_scroll_y = 0
+        self.canvas.bind("<Double-Button-1>", self.on_canvas_double_click)
+        self.canvas.bind("<Configure>", lambda event: self.schedule_render())
         
         self.generate_and_display()
     
     def generate_and_display(self):
-        temp_dir = tempfile.gettempdir()
-        temp_base = os.path.join(temp_dir, f"erd_temp_{os.getpid()}")
+        """작업 스레드에서 미리보기와 전체 다이어그램을 생성 (창은 계속 반응)"""
+        self.cancel_generation()
+        self.job_id += 1
+        self.cancel_event = threading.Event()
+        self.generator = None
+        self.job_started = time.time()
+        self.set_stage("미리보기 생성 중")
+        self.progress.start(15)
+        
+        worker = threading.Thread(
+            target=self._generate_worker, args=(self.job_id, self.cancel_event, self.tables_info), daemon=True
+        )
+        worker.start()
+        if self.poll_pending is None:
+            self.poll_pending = self.window.after(POLL_MS, self.poll_generation)
+    
+    def cancel_generation(self):
+        """진행 중인 생성 작업 취소 (실행 중인 dot 프로세스는 바로 종료, matplotlib 단계는 끝난 뒤 결과를 버림)"""
+        if self.cancel_event is not None:
+            self.cancel_event.set()
+            self.cancel_event = None
+            if self.logger:
+                self.logger.info("ER 다이어그램 생성 취소 (뷰어)")
+    
+    def _generate_worker(self, job_id, cancel_event, tables_info):
+        def post(kind, *payload):
+            self.messages.put((job_id, kind) + payload)
         
         try:
+            preview = render_preview(tables_info)
+            if not cancel_event.is_set():
+                post('preview', preview, TilePyramid(preview))
+        except Exception as e:
             if self.logger:
-                self.logger.info("ER 다이어그램 생성 시작 (뷰어) - Graphviz 시도")
-            
-            generator = ERDiagramGenerator()
-            result_path = generator.generate(self.tables_info, temp_base)
-            
-            if result_path and os.path.exists(result_path):
-                if self.logger:
-                    self.logger.info(f"ER 다이어그램 생성 성공 (Graphviz): {result_path}")
-                self.load_image(result_path)
+                self.logger.warning(f"미리보기 생성 실패: {str(e)}")
+        
+        # 취소된 이전 작업이 아직 잠금을 쥐고 있으면 (matplotlib 저장 중 등) 기다리는 동안에도 취소할 수 있게 나누어 대기
+        if not _render_lock.acquire(blocking=False):
+            post('stage', "이전 생성 작업 종료 대기 중")
+            while not _render_lock.acquire(timeout=LOCK_WAIT_SECONDS):
+                if cancel_event.is_set():
+                    return
+        try:
+            if cancel_event.is_set():
                 return
-            else:
+            self._render_full(tables_info, cancel_event, post)
+        finally:
+            _render_lock.release()
+    
+    def _render_full(self, tables_info, cancel_event, post):
+        temp_base = os.path.join(tempfile.gettempdir(), f"erd_temp_{os.getpid()}")
+        
+        try:
+            if self.logger:
+                self.logger.info("ER 다이어그램 생성 시작 (뷰어) - Graphviz 시도")
+            post('stage', "Graphviz로 생성 중")
+            generator = ERDiagramGenerator(self.logger)
+            result_path = generator.generate(tables_info, temp_base, cancel_event=cancel_event)
+            if not (result_path and os.path.exists(result_path)):
                 raise Exception("Graphviz 다이어그램 생성 실패 - 파일 없음")
-                
+            if self.logger:
+                self.logger.info(f"ER 다이어그램 생성 성공 (Graphviz): {result_path}")
+        
+        except RenderCancelled:
+            return
         except Exception as e:
+            # 취소된 작업은 matplotlib 대체 생성을 시작하지 않음
+            if cancel_event.is_set():
+                return
             error_msg = str(e)
             if self.logger:
                 self.logger.warning(f"Graphviz 다이어그램 생성 실패, matplotlib로 대체 시도: {error_msg}")
@@ -99,34 +198,120 @@ class ERDiagramViewer:
             try:
                 if self.logger:
                     self.logger.info("matplotlib로 ER 다이어그램 생성 시작")
-                matplotlib_generator = ERDiagramMatplotlibGenerator()
-                result_path = matplotlib_generator.generate(self.tables_info, temp_base)
-                
-                if result_path and os.path.exists(result_path):
-                    if self.logger:
-                        self.logger.info(f"ER 다이어그램 생성 성공 (matplotlib): {result_path}")
-                    self.load_image(result_path)
-                else:
+                post('stage', "matplotlib로 생성 중")
+                generator = ERDiagramMatplotlibGenerator()
+                result_path = generator.generate(tables_info, temp_base)
+                if not (result_path and os.path.exists(result_path)):
                     raise Exception("matplotlib 다이어그램 생성 실패")
-                    
+                if self.logger:
+                    self.logger.info(f"ER 다이어그램 생성 성공 (matplotlib): {result_path}")
             except Exception as e2:
                 if self.logger:
                     self.logger.error(f"모든 다이어그램 생성 방법 실패: {str(e2)}", exc_info=True)
-                messagebox.showerror(
-                    "오류",
-                    f"다이어그램 생성에 실패했습니다.\n\n"
-                    f"Graphviz 오류: {error_msg}\n"
-                    f"matplotlib 오류: {str(e2)}\n\n"
-                    "로그 파일을 확인하세요."
-                )
+                post('error', error_msg, str(e2))
+                return
+        
+        if cancel_event.is_set():
+            return
+        try:
+            post('stage', "이미지 준비 중")
+            # 이미지 디코딩과 피라미드 레벨 생성도 작업 스레드에서 처리
+            img = Image.open(result_path)
+            img.load()
+            post('image', generator, img, TilePyramid(img))
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"이미지 로드 실패: {str(e)}", exc_info=True)
+            post('error', None, f"이미지 로드 실패: {str(e)}")
+    
+    def poll_generation(self):
+        """작업 스레드가 보낸 결과를 Tk 스레드에서 반영"""
+        self.poll_pending = None
+        finished = False
+        while True:
+            try:
+                message = self.messages.get_nowait()
+            except queue.Empty:
+                break
+            job_id, kind, *payload = message
+            if kind in ('scene', 'scene_error'):
+                self.on_scene_ready(kind, *payload)
+                continue
+            if job_id != self.job_id:
+                continue
+            if kind == 'stage':
+                self.job_stage = payload[0]
+            elif kind == 'preview':
+                self.show_image(*payload, preview=True)
+                self.job_stage = "미리보기 표시 중 - 전체 다이어그램 생성 중"
+            elif kind == 'image':
+                generator, img, pyramid = payload
+                self.generator = generator
+                self.show_image(img, pyramid)
+                finished = True
+                if self.logger:
+                    self.logger.info(f"이미지 로드 성공: {img.width}x{img.height}, {time.time() - self.job_started:.1f}초")
+            elif kind == 'error':
+                finished = True
+                self.show_generation_error(*payload)
+        
+        if finished:
+            self.cancel_event = None
+            self.progress.stop()
+            self.status_var.set("" if self.generator else "생성 실패")
+        elif self.cancel_event is not None:
+            self.set_stage(self.job_stage)
+        if self.cancel_event is not None or self.scene_pending:
+            self.poll_pending = self.window.after(POLL_MS, self.poll_generation)
+    
+    def set_stage(self, stage):
+        self.job_stage = stage
+        self.status_var.set(f"{stage}... ({time.time() - self.job_started:.0f}초)")
+    
+    def show_generation_error(self, graphviz_error, matplotlib_error):
+        if graphviz_error is None:
+            messagebox.showerror("오류", matplotlib_error, parent=self.window)
+            return
+        messagebox.showerror(
+            "오류",
+            f"다이어그램 생성에 실패했습니다.\n\n"
+            f"Graphviz 오류: {graphviz_error}\n"
+            f"matplotlib 오류: {matplotlib_error}\n\n"
+            "로그 파일을 확인하세요.",
+            parent=self.window
+        )
+    
+    def close(self):
+        """창을 닫으면 진행 중인 생성과 예약된 화면 갱신을 모두 취소"""
+        self.cancel_generation()
+        if self.renderer:
+            self.renderer.cancel()
+        for pending in (self.poll_pending, self.render_pending, self.wheel_pending):
+            if pending is not None:
+                self.window.after_cancel(pending)
+        self.poll_pending = self.render_pending = self.wheel_pending = None
+        self.tile_items.clear()
+        self.window.destroy()
+    
+    def show_image(self, image, pyramid, preview=False):
+        """새 이미지로 교체하고 원본 크기, 왼쪽 위부터 표시"""
+        self.image = image
+        self.pyramid = pyramid
+        self.showing_preview = preview
+        self.scale_factor = 1.0
+        if self.vector_var.get():
+            return
+        self.canvas.xview_moveto(0)
+        self.canvas.yview_moveto(0)
+        self.update_display()
     
     def load_image(self, image_path):
         try:
             if self.logger:
                 self.logger.debug(f"이미지 로드 시도: {image_path}")
             img = Image.open(image_path)
-            self.image = img
-            self.update_display()
+            img.load()
+            self.show_image(img, TilePyramid(img))
             if self.logger:
                 self.logger.info(f"이미지 로드 성공: {image_path}, 크기: {img.width}x{img.height}")
         except Exception as e:
@@ -138,68 +323,229 @@ class ERDiagramViewer:
         if not self.image:
             return
         
-        width = int(self.image.width * self.scale_factor)
-        height = int(self.image.height * self.scale_factor)
+        # 전체 크기는 스크롤 영역으로만 두고, 실제로는 보이는 타일만 그림
+        width, height = self.pyramid.display_size(self.scale_factor)
+        self.canvas.config(scrollregion=(0, 0, width, height))
+        self.clear_tiles()
+        self.render_visible()
+    
+    def clear_tiles(self):
+        self.canvas.delete("view")
+        self.tile_items.clear()
+    
+    def schedule_render(self):
+        """스크롤/창 크기 변경이 연달아 들어와도 한 번만 다시 그림"""
+        if self.renderer:
+            self.renderer.schedule_sync()
+            return
+        if self.render_pending is None and self.image:
+            self.render_pending = self.canvas.after_idle(self.render_visible)
+    
+    def render_visible(self):
+        """현재 배율에 맞는 피라미드 레벨에서 창에 보이는 타일만 배치 (이미 놓인 타일은 그대로 둠)"""
+        self.render_pending = None
+        if not self.pyramid or self.vector_var.get():
+            return
+        
+        left = max(0, self.canvas.canvasx(0))
+        top = max(0, self.canvas.canvasy(0))
+        tiles = self.pyramid.visible_tiles(
+            self.scale_factor, left, top, self.canvas.winfo_width(), self.canvas.winfo_height()
+        )
+        
+        visible = set()
+        for level, col, row, (x0, y0, x1, y1) in tiles:
+            key = (level, col, row, x0, y0)
+            visible.add(key)
+            if key in self.tile_items:
+                continue
+            photo = ImageTk.PhotoImage(self.pyramid.tile(level, col, row, (x1 - x0, y1 - y0)))
+            item = self.canvas.create_image(x0, y0, anchor=tk.NW, image=photo, tags="view")
+            self.tile_items[key] = (item, photo)
+        
+        for key in [key for key in self.tile_items if key not in visible]:
+            item, _ = self.tile_items.pop(key)
+            self.canvas.delete(item)
+    
+    def on_xview(self, *args):
+        self.canvas.xview(*args)
+        self.schedule_render()
+    
+    def on_yview(self, *args):
+        self.canvas.yview(*args)
+        self.schedule_render()
+    
+    def set_scale(self, scale, anchor=None):
+        """배율 변경. anchor(창 좌표) 아래의 다이어그램 지점이 제자리에 남도록 스크롤 위치를 맞춤"""
+        scale = min(max(scale, MIN_SCALE), MAX_SCALE)
+        if not self.pyramid or scale == self.scale_factor:
+            self.scale_factor = scale
+            return
         
-        resized_img = self.image.resize((width, height), Image.Resampling.LANCZOS)
-        self.photo = ImageTk.PhotoImage(resized_img)
+        if anchor is None:
+            anchor = (self.canvas.winfo_width() / 2, self.canvas.winfo_height() / 2)
+        point_x = self.canvas.canvasx(anchor[0]) / self.scale_factor
+        point_y = self.canvas.canvasy(anchor[1]) / self.scale_factor
         
-        self.canvas.delete("all")
-        self.canvas.create_image(0, 0, anchor=tk.NW, image=self.photo)
-        self.canvas.config(scrollregion=self.canvas.bbox("all"))
+        self.scale_factor = scale
+        width, height = self.pyramid.display_size(scale)
+        self.canvas.config(scrollregion=(0, 0, width, height))
+        self.canvas.xview_moveto(max(0, point_x * scale - anchor[0]) / max(width, 1))
+        self.canvas.yview_moveto(max(0, point_y * scale - anchor[1]) / max(height, 1))
+        self.clear_tiles()
+        self.render_visible()
+    
+    def zoom_by(self, factor, anchor=None):
+        if self.renderer:
+            self.renderer.zoom_by(factor, anchor)
+        else:
+            self.set_scale(self.scale_factor * factor, anchor)
     
     def zoom_in(self):
-        self.scale_factor = min(self.scale_factor * 1.2, 3.0)
-        self.update_display()
+        self.zoom_by(ZOOM_STEP)
     
     def zoom_out(self):
-        self.scale_factor = max(self.scale_factor / 1.2, 0.3)
-        self.update_display()
+        self.zoom_by(1 / ZOOM_STEP)
     
     def zoom_reset(self):
-        self.scale_factor = 1.0
-        self.update_display()
+        if self.renderer:
+            self.renderer.zoom_to(1.0)
+        else:
+            self.set_scale(1.0)
     
     def regenerate(self):
         if self.logger:
             self.logger.info("ER 다이어그램 재생성 요청")
-        self.scale_factor = 1.0
+        self.scene = None
         self.generate_and_display()
+        if self.renderer:
+            self.start_scene_job()
+    
+    def toggle_vector(self):
+        if not self.vector_var.get():
+            # 장면 계산이 끝나기 전에 끄면 렌더러가 아직 없음 (도착한 장면은 on_scene_ready에서 보관만 함)
+            if self.renderer:
+                self.renderer.cancel()
+                self.renderer.clear()
+                self.renderer = None
+            self.status_var.set("")
+            self.update_display()
+            return
+        
+        self.clear_tiles()
+        if self.scene is None:
+            self.start_scene_job()
+        else:
+            self.show_vector()
+    
+    def start_scene_job(self):
+        """웹 편집기와 같은 레이아웃 좌표로 장면을 작업 스레드에서 계산"""
+        if self.scene_pending:
+            return
+        self.scene_pending = True
+        self.status_var.set("벡터 보기 레이아웃 계산 중...")
+        
+        def build(tables_info):
+            try:
+                started = time.time()
+                scene = DiagramScene.from_editor(ERDiagramWebEditor(tables_info, self.logger))
+                if self.logger:
+                    self.logger.info(f"벡터 보기 장면 생성: {len(scene.tables)}개 테이블, {time.time() - started:.1f}초")
+                self.messages.put((None, 'scene', scene))
+            except Exception as e:
+                if self.logger:
+                    self.logger.error(f"벡터 보기 장면 생성 실패: {str(e)}", exc_info=True)
+                self.messages.put((None, 'scene_error', str(e)))
+        
+        threading.Thread(target=build, args=(self.tables_info,), daemon=True).start()
+        if self.poll_pending is None:
+            self.poll_pending = self.window.after(POLL_MS, self.poll_generation)
+    
+    def on_scene_ready(self, kind, payload):
+        self.scene_pending = False
+        if kind == 'scene_error':
+            self.status_var.set("")
+            messagebox.showerror("오류", f"벡터 보기 생성 실패: {payload}", parent=self.window)
+            self.vector_var.set(False)
+            self.update_display()
+            return
+        self.scene = payload
+        if self.vector_var.get():
+            self.show_vector()
+    
+    def show_vector(self):
+        if self.renderer:
+            self.renderer.clear()
+        self.clear_tiles()
+        self.renderer = SceneCanvasRenderer(self.canvas, self.scene, on_select=self.on_table_selected)
+        self.renderer.fit()
+        self.status_var.set(f"벡터 보기: {len(self.scene.tables)}개 테이블 (더블클릭하면 관계 강조)")
+    
+    def on_table_selected(self, table_name):
+        if table_name is None:
+            self.status_var.set("")
+            return
+        table_info = self.tables_info.get(table_name, {})
+        self.status_var.set(
+            f"{table_name}: 컬럼 {len(table_info.get('columns', []))}개, "
+            f"관계 {len(self.renderer.table_edges.get(table_name, []))}개"
+        )
+    
+    def on_canvas_double_click(self, event):
+        if self.renderer:
+            self.renderer.select(self.renderer.table_at(self.canvas.canvasx(event.x), self.canvas.canvasy(event.y)))
     
     def on_canvas_click(self, event):
-        self.canvas_start_x = event.x
-        self.canvas_start_y = event.y
+        self.canvas.scan_mark(event.x, event.y)
     
     def on_canvas_drag(self, event):
-        dx = event.x - self.canvas_start_x
-        dy = event.y - self.canvas_start_y
         self.canvas.scan_dragto(event.x, event.y, gain=1)
-        self.canvas_start_x = event.x
-        self.canvas_start_y = event.y
+        self.schedule_render()
     
     def on_canvas_release(self, event):
         pass
     
     def on_mousewheel(self, event):
         if event.delta > 0 or event.num == 4:
-            self.zoom_in()
+            self.wheel_steps += 1
         elif event.delta < 0 or event.num == 5:
-            self.zoom_out()
+            self.wheel_steps -= 1
+        else:
+            return
+        self.wheel_anchor = (event.x, event.y)
+        if self.wheel_pending is None:
+            self.wheel_pending = self.canvas.after(ZOOM_COALESCE_MS, self.apply_wheel_zoom)
+    
+    def apply_wheel_zoom(self):
+        """연속된 휠 입력을 모아 한 번에 확대/축소"""
+        self.wheel_pending = None
+        steps = self.wheel_steps
+        self.wheel_steps = 0
+        if steps:
+            self.zoom_by(ZOOM_STEP ** steps, self.wheel_anchor)
     
     def save_image(self):
         if not self.image:
             messagebox.showwarning("경고", "저장할 이미지가 없습니다.")
             return
+        if self.showing_preview:
+            messagebox.showwarning("경고", "아직 다이어그램을 생성하는 중입니다. 미리보기는 저장할 수 없습니다.")
+            return
         
         output_path = filedialog.asksaveasfilename(
             title="ER 다이어그램 저장",
             defaultextension=".png",
-            filetypes=[("PNG 파일", "*.png"), ("JPEG 파일", "*.jpg"), ("모든 파일", "*.*")]
+            filetypes=[("PNG 파일", "*.png"), ("JPEG 파일", "*.jpg"), ("SVG 파일", "*.svg"), ("PDF 파일", "*.pdf"), ("모든 파일", "*.*")]
         )
         
         if output_path:
             try:
-                self.image.save(output_path)
+                base_path, output_format = split_output_path(output_path)
+                if output_format in ('svg', 'pdf') and self.generator is not None:
+                    # 벡터 형식은 화면 이미지가 아니라 같은 생성기로 다시 생성
+                    output_path = self.generator.generate(self.tables_info, base_path, fmt=output_format)
+                else:
+                    self.image.save(output_path)
                 messagebox.showinfo("성공", f"이미지가 저장되었습니다.\n{output_path}")
             except Exception as e:
                 messagebox.showerror("오류", f"이미지 저장 실패: {str(e)}")
@@ -1,35 +1,700 @@
 import os
+import sys
 import json
+import atexit
+import shutil
+import uuid
+import threading
+import time
+from collections import deque
 import tempfile
 import webbrowser
 from pathlib import Path
-import http.server
-import socketserver
-import threading
-import time
+from urllib.parse import urlencode
 import math
+from concurrent.futures import ProcessPoolExecutor
+from layout_packer import SkylinePacker, ShelfPacker
+from component_layout import encode_component, layout_component
+from layout_store import LayoutStore
+from spatial_index import SpatialGrid
+from schema_graph import CLUSTER_METHODS, FOCUS_DIRECTIONS, build_clusters, build_fk_graph, k_hop_neighborhood
+from search_index import SearchIndex
+from diagram_export import DiagramScene, DeepZoomPyramid, write_deep_zoom, write_png, write_svg
+from text_metrics import measure_text
+from web_server import get_server, CACHE_IMMUTABLE
+
+
+VIS_NETWORK_VERSION = '9.1.2'
+VIS_NETWORK_ROUTE = f"/static/vis-network/{VIS_NETWORK_VERSION}/vis-network.min.js"
+VIS_NETWORK_CDN_URL = f"https://unpkg.com/vis-network@{VIS_NETWORK_VERSION}/standalone/umd/vis-network.min.js"
+
+def get_resource_dir():
+    # PyInstaller 실행 파일에서는 번들이 풀린 임시 폴더 기준
+    return getattr(sys, '_MEIPASS', os.path.dirname(os.path.abspath(__file__)))
+
+
+def get_vis_network_path():
+    return os.path.join(get_resource_dir(), 'static', 'vis-network', VIS_NETWORK_VERSION, 'vis-network.min.js')
+
+
+EDITOR_PAGE_PATH = '/editor/index.html'
+DEEP_ZOOM_PAGE_PATH = '/deepzoom/index.html'
+
+MAX_CHUNK_SIZE = 5000
+MAX_DETAIL_BATCH = 200
+MAX_FOCUS_HOPS = 6
+MAX_SEARCH_RESULTS = 100
+# 서버 PNG 내보내기 배율 범위 (배율이 크면 파일이 매우 커짐)
+MIN_EXPORT_SCALE = 0.1
+MAX_EXPORT_SCALE = 4.0
+
+# 다시 연결한 페이지에 재전송할 수 있도록 보관하는 최근 이벤트 수
+EVENT_HISTORY = 100
+# 끊긴 연결을 감지하기 위해 이벤트가 없을 때 보내는 주석 간격(초)
+EVENT_KEEPALIVE = 15
+
+# 노드 라벨 상세 단계 (축소: 이름만, 중간: PK/FK, 확대: 전체 컬럼)
+LOD_NAME = 'name'
+LOD_KEYS = 'keys'
+LOD_FULL = 'full'
+
+# 묶음 노드 ID 접두어 (테이블 노드와 구분)
+CLUSTER_NODE_PREFIX = '__cluster__:'
+
+# 서버에 보관하는 편집기 수와 유휴 시간(초). 넘으면 오래 쓰지 않은 편집기부터 목록에서 빼고 데이터를 정리
+MAX_OPEN_DIAGRAMS = 8
+DIAGRAM_IDLE_SECONDS = 30 * 60
+
+# 딥 줌 보기용 임시 타일 폴더. 새로 만들면 이전 폴더를 지우고, 남은 폴더는 프로그램 종료 시 삭제
+_deep_zoom_dirs = set()
+_deep_zoom_dirs_lock = threading.Lock()
+
+
+def _make_deep_zoom_dir():
+    path = tempfile.mkdtemp(prefix='erd_deepzoom_')
+    with _deep_zoom_dirs_lock:
+        _deep_zoom_dirs.add(path)
+    return path
+
+
+def _remove_deep_zoom_dir(path):
+    with _deep_zoom_dirs_lock:
+        _deep_zoom_dirs.discard(path)
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def _remove_all_deep_zoom_dirs():
+    with _deep_zoom_dirs_lock:
+        paths = list(_deep_zoom_dirs)
+        _deep_zoom_dirs.clear()
+    for path in paths:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+atexit.register(_remove_all_deep_zoom_dirs)
+
+
+def register_api_routes(server, editor):
+    """편집기 페이지와 데이터 API 경로를 서버에 한 번만 등록"""
+    with server.lock:
+        if getattr(server, 'diagrams', None) is not None:
+            return
+        server.diagrams = {}
+    
+    # 페이지는 데이터가 없는 정적 문서이므로 모든 다이어그램이 공유 (브라우저 캐시 재사용)
+    server.publish(EDITOR_PAGE_PATH, editor.build_html().encode('utf-8'), 'text/html; charset=utf-8')
+    server.publish(DEEP_ZOOM_PAGE_PATH, build_deep_zoom_html().encode('utf-8'), 'text/html; charset=utf-8')
+    server.add_route('GET', r'/diagram/([0-9a-f]+)/', _handle_editor_page)
+    server.add_route('GET', r'/diagram/([0-9a-f]+)/deepzoom/', _handle_deep_zoom_page)
+    server.add_route('GET', r'/api/diagram/([0-9a-f]+)/meta', _handle_meta)
+    server.add_route('GET', r'/api/diagram/([0-9a-f]+)/(nodes|edges)', _handle_items)
+    server.add_route('GET', r'/api/diagram/([0-9a-f]+)/details', _handle_details)
+    server.add_route('GET', r'/api/diagram/([0-9a-f]+)/clusters', _handle_clusters)
+    server.add_route('GET', r'/api/diagram/([0-9a-f]+)/focus', _handle_focus)
+    server.add_route('PUT', r'/api/diagram/([0-9a-f]+)/positions', _handle_positions)
+    server.add_route('GET', r'/api/diagram/([0-9a-f]+)/events', _handle_events)
+    server.add_route('GET', r'/api/search', _handle_search)
+    server.add_route('GET', r'/api/diagram/([0-9a-f]+)/export\.(svg|png)', _handle_export)
+    server.add_route('GET', r'/api/diagram/([0-9a-f]+)/clusters/([0-9]+)', _handle_cluster_members)
+    server.add_route('GET', r'/api/diagram/([0-9a-f]+)/deepzoom/manifest', _handle_deep_zoom_manifest)
+    server.add_route('GET', r'/api/diagram/([0-9a-f]+)/deepzoom/([0-9a-f]+)/([0-9]+)/([0-9]+)_([0-9]+)\.png', _handle_deep_zoom_tile)
+
+
+def register_diagram(server, editor):
+    """편집기를 서버 목록의 가장 최근 위치에 두고, 보관 한도를 넘거나 오래 쓰지 않은 편집기를 정리"""
+    with server.lock:
+        server.diagrams.pop(editor.diagram_id, None)
+        server.diagrams[editor.diagram_id] = editor
+        editor.last_access = time.monotonic()
+        editor.closed = False
+    evict_diagrams(server)
+
+
+def evict_diagrams(server, now=None):
+    """유휴 시간이 지났거나 보관 수를 넘은 편집기를 목록에서 빼고 release()로 정리. 반환: 정리한 편집기 목록
+    
+    이벤트 연결(SSE)이 열린 편집기는 페이지가 떠 있는 것이므로 유휴로 보지 않고, 보관 수를 넘을 때도 마지막에 고름
+    """
+    now = time.monotonic() if now is None else now
+    with server.lock:
+        diagrams = server.diagrams
+        evicted = [
+            editor for editor in diagrams.values()
+            if editor.event_streams == 0 and now - editor.last_access > DIAGRAM_IDLE_SECONDS
+        ]
+        for editor in evicted:
+            del diagrams[editor.diagram_id]
+        while len(diagrams) > MAX_OPEN_DIAGRAMS:
+            # 목록은 최근 사용 순. 가장 최근 편집기는 남김
+            entries = list(diagrams.values())[:-1]
+            candidates = [editor for editor in entries if editor.event_streams == 0] or entries
+            editor = candidates[0]
+            del diagrams[editor.diagram_id]
+            evicted.append(editor)
+    
+    for editor in evicted:
+        editor.release()
+        if server.logger:
+            server.logger.info(f"편집기 정리: {editor.diagram_id} ({len(editor.tables_info)}개 테이블)")
+    return evicted
+
+
+def _find_diagram(request, match):
+    diagram_id = match.group(1)
+    with request.server.lock:
+        editor = request.server.diagrams.pop(diagram_id, None)
+        if editor is not None:
+            # 최근 사용 순서 유지 (오래 쓰지 않은 편집기부터 정리)
+            request.server.diagrams[diagram_id] = editor
+            editor.last_access = time.monotonic()
+    if editor is None:
+        request.send_json({'error': '다이어그램을 찾을 수 없습니다.'}, status=404)
+    return editor
+
+
+def _handle_editor_page(request, match):
+    request.send_document(request.server.documents[EDITOR_PAGE_PATH])
+
+
+def _handle_deep_zoom_page(request, match):
+    request.send_document(request.server.documents[DEEP_ZOOM_PAGE_PATH])
+
+
+def _handle_meta(request, match):
+    editor = _find_diagram(request, match)
+    if editor is None:
+        return
+    visjs_data = editor.get_visjs_data()
+    request.send_json({
+        'id': editor.diagram_id,
+        'tables': len(visjs_data['nodes']),
+        'edges': len(visjs_data['edges']),
+        'eventId': editor.last_event_id()
+    })
+
+
+def _handle_items(request, match):
+    editor = _find_diagram(request, match)
+    if editor is None:
+        return
+    items = editor.get_visjs_data()[match.group(2)]
+    offset = max(0, request.query_int('offset', 0))
+    limit = min(MAX_CHUNK_SIZE, max(1, request.query_int('limit', 500)))
+    request.send_json({
+        'total': len(items),
+        'offset': offset,
+        'items': items[offset:offset + limit]
+    })
+
+
+def _handle_details(request, match):
+    editor = _find_diagram(request, match)
+    if editor is None:
+        return
+    # ?name=A&name=B 형식 (테이블 이름에 쉼표가 있어도 안전)
+    names = request.query.get('name', [])[:MAX_DETAIL_BATCH]
+    request.send_json({'items': editor.build_detail_labels(names)})
+
+
+def _cluster_method(request):
+    method = request.query_param('by', 'component')
+    if method not in CLUSTER_METHODS:
+        request.send_json({'error': f"지원하지 않는 묶음 방식입니다: {method}"}, status=400)
+        return None
+    return method
+
+
+def _handle_clusters(request, match):
+    editor = _find_diagram(request, match)
+    if editor is None:
+        return
+    method = _cluster_method(request)
+    if method is None:
+        return
+    request.send_json(editor.build_cluster_view(method))
+
+
+def _handle_cluster_members(request, match):
+    editor = _find_diagram(request, match)
+    if editor is None:
+        return
+    method = _cluster_method(request)
+    if method is None:
+        return
+    members = editor.build_cluster_members(method, match.group(2))
+    if members is None:
+        request.send_json({'error': '묶음을 찾을 수 없습니다.'}, status=404)
+        return
+    request.send_json(members)
+
+
+def _handle_focus(request, match):
+    editor = _find_diagram(request, match)
+    if editor is None:
+        return
+    direction = request.query_param('direction', 'both')
+    if direction not in FOCUS_DIRECTIONS:
+        request.send_json({'error': f"지원하지 않는 방향입니다: {direction}"}, status=400)
+        return
+    hops = min(MAX_FOCUS_HOPS, max(0, request.query_int('hops', 2)))
+    view = editor.build_focus_view(request.query_param('table', ''), hops, direction)
+    if view is None:
+        request.send_json({'error': '테이블을 찾을 수 없습니다.'}, status=404)
+        return
+    request.send_json(view)
+
+
+def _handle_positions(request, match):
+    editor = _find_diagram(request, match)
+    if editor is None:
+        return
+    try:
+        body = request.read_json()
+    except ValueError:
+        body = None
+    if not isinstance(body, dict) or not isinstance(body.get('positions'), dict):
+        request.send_json({'error': '잘못된 요청입니다.'}, status=400)
+        return
+    count, saved = editor.update_positions(body['positions'])
+    request.send_json({'updated': count, 'saved': saved})
+
+
+def _handle_search(request, match):
+    """/api/search?q=...&diagram=<id> (diagram이 없으면 가장 최근에 사용한 다이어그램)"""
+    diagram_id = request.query_param('diagram')
+    with request.server.lock:
+        if diagram_id is None and request.server.diagrams:
+            diagram_id = next(reversed(request.server.diagrams))
+        editor = request.server.diagrams.get(diagram_id)
+    if editor is None:
+        request.send_json({'error': '다이어그램을 찾을 수 없습니다.'}, status=404)
+        return
+    
+    query = request.query_param('q', '')
+    limit = min(MAX_SEARCH_RESULTS, max(1, request.query_int('limit', 20)))
+    started = time.perf_counter()
+    total, results = editor.get_search_index().search(query, limit)
+    request.send_json({
+        'query': query,
+        'total': total,
+        'tookMs': round((time.perf_counter() - started) * 1000, 1),
+        'results': results
+    })
+
+
+def _handle_export(request, match):
+    """전체 다이어그램을 서버에서 SVG/PNG로 그려 내려받기 (브라우저 캔버스 크기와 무관)"""
+    editor = _find_diagram(request, match)
+    if editor is None:
+        return
+    file_format = match.group(2)
+    try:
+        scale = float(request.query_param('scale', 1.0))
+    except ValueError:
+        scale = 1.0
+    scale = min(MAX_EXPORT_SCALE, max(MIN_EXPORT_SCALE, scale))
+    
+    fd, temp_path = tempfile.mkstemp(suffix=f".{file_format}")
+    os.close(fd)
+    try:
+        if file_format == 'svg':
+            editor.export_svg(temp_path)
+            content_type = 'image/svg+xml'
+        else:
+            editor.export_png(temp_path, scale)
+            content_type = 'image/png'
+        request.send_file(temp_path, content_type, f"er_diagram.{file_format}")
+    finally:
+        os.remove(temp_path)
+
+
+def _handle_deep_zoom_manifest(request, match):
+    """딥 줌 피라미드 정보. refresh=1이면 현재 좌표로 다시 구성 (타일은 요청될 때 그림)"""
+    editor = _find_diagram(request, match)
+    if editor is None:
+        return
+    try:
+        scale = float(request.query_param('scale', 1.0))
+    except ValueError:
+        scale = 1.0
+    scale = min(MAX_EXPORT_SCALE, max(MIN_EXPORT_SCALE, scale))
+    deep_zoom = editor.get_deep_zoom(refresh=request.query_param('refresh') == '1', scale=scale)
+    manifest = dict(deep_zoom['pyramid'].manifest())
+    manifest['token'] = deep_zoom['token']
+    manifest['tables'] = len(deep_zoom['pyramid'].scene.tables)
+    request.send_json(manifest)
+
+
+def _handle_deep_zoom_tile(request, match):
+    editor = _find_diagram(request, match)
+    if editor is None:
+        return
+    path = editor.deep_zoom_tile(match.group(2), int(match.group(3)), int(match.group(4)), int(match.group(5)))
+    if path is None:
+        request.send_json({'error': '타일을 찾을 수 없습니다.'}, status=404)
+        return
+    # 토큰이 경로에 들어 있어 좌표가 바뀌면 주소도 바뀌므로 오래 캐시해도 됨
+    try:
+        request.send_file(path, 'image/png', cache_control=CACHE_IMMUTABLE)
+    except FileNotFoundError:
+        # 응답 직전에 새 피라미드로 바뀌어 이전 토큰의 폴더가 지워진 경우
+        request.send_json({'error': '타일을 찾을 수 없습니다.'}, status=404)
+
+
+def _handle_events(request, match):
+    """스키마 변경 알림 (Server-Sent Events). 연결이 끊길 때까지 유지"""
+    editor = _find_diagram(request, match)
+    if editor is None:
+        return
+    try:
+        # EventSource가 다시 연결할 때는 마지막으로 받은 ID를 헤더로 보냄
+        last_id = int(request.headers.get('Last-Event-ID') or request.query_param('since'))
+    except (TypeError, ValueError):
+        last_id = editor.last_event_id()
+    
+    with request.server.lock:
+        editor.event_streams += 1
+    try:
+        request.start_event_stream()
+        # 편집기가 정리되면 연결을 닫음 (페이지의 다시 연결은 404로 끝남)
+        while not editor.closed:
+            events = editor.wait_events(last_id, EVENT_KEEPALIVE)
+            if not events:
+                if editor.closed or request.client_closed():
+                    break
+                request.send_event(comment='ping')
+                continue
+            if events[0][0] > last_id + 1:
+                # 보관 기간이 지난 이벤트가 있으면 페이지를 새로 불러오도록 알림
+                request.send_event({}, 'reload', events[-1][0])
+            else:
+                for event_id, event, data in events:
+                    request.send_event(data, event, event_id)
+            last_id = events[-1][0]
+    finally:
+        # 페이지가 닫히면 이때부터 유휴 시간을 셈
+        with request.server.lock:
+            editor.event_streams -= 1
+            editor.last_access = time.monotonic()
+        evict_diagrams(request.server)
+
+
+def build_deep_zoom_html():
+    """딥 줌 타일 보기 페이지 (다이어그램 데이터 없이 주소의 ID로 피라미드 정보와 타일을 불러옴)"""
+    return """<!DOCTYPE html>
+<html lang="ko">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>ER 다이어그램 딥 줌 보기</title>
+    <style>
+        body {
+            margin: 0;
+            padding: 0;
+            font-family: '맑은 고딕', Arial, sans-serif;
+            overflow: hidden;
+        }
+        #toolbar {
+            background: #f5f5f5;
+            padding: 8px 10px;
+            border-bottom: 1px solid #ddd;
+            display: flex;
+            align-items: center;
+            gap: 10px;
+            height: 32px;
+        }
+        button {
+            padding: 6px 14px;
+            background: #1976d2;
+            color: white;
+            border: none;
+            border-radius: 4px;
+            cursor: pointer;
+            font-size: 14px;
+        }
+        button:hover {
+            background: #1565c0;
+        }
+        #status {
+            color: #666;
+            font-size: 13px;
+        }
+        #viewport {
+            position: absolute;
+            top: 49px;
+            left: 0;
+            right: 0;
+            bottom: 0;
+            overflow: hidden;
+            background: white;
+            cursor: grab;
+            touch-action: none;
+        }
+        #viewport.dragging {
+            cursor: grabbing;
+        }
+        #viewport img {
+            position: absolute;
+            user-select: none;
+            -webkit-user-drag: none;
+        }
+    </style>
+</head>
+<body>
+    <div id="toolbar">
+        <button onclick="zoomBy(1.5)">확대</button>
+        <button onclick="zoomBy(1 / 1.5)">축소</button>
+        <button onclick="fit()">전체 보기</button>
+        <span id="status">불러오는 중...</span>
+    </div>
+    <div id="viewport"></div>
+    <script type="text/javascript">
+        var diagramId = location.pathname.split('/')[2];
+        var apiBase = '/api/diagram/' + diagramId + '/deepzoom';
+        var viewport = document.getElementById('viewport');
+        // zoom: 화면 픽셀 / 원본(최대 레벨) 픽셀, offsetX/Y: 화면 왼쪽 위에 놓인 원본 좌표
+        var info = null;
+        var zoom = 1;
+        var minZoom = 0.01;
+        var maxZoom = 4;
+        var offsetX = 0;
+        var offsetY = 0;
+        // 레벨/열_행 -> img 요소 (화면 밖으로 나가면 제거)
+        var tiles = {};
+        var renderPending = false;
+        
+        function setStatus(text) {
+            document.getElementById('status').textContent = text;
+        }
+        
+        function levelScale(level) {
+            return Math.pow(2, level - info.maxLevel);
+        }
+        
+        // 화면 배율보다 해상도가 낮지 않은 가장 작은 레벨
+        function levelFor(value) {
+            var level = info.maxLevel + Math.ceil(Math.log2(value));
+            return Math.max(0, Math.min(info.maxLevel, level));
+        }
+        
+        function tileBox(level, col, row) {
+            var scale = levelScale(level);
+            var width = Math.ceil(info.width * scale);
+            var height = Math.ceil(info.height * scale);
+            var size = info.tileSize;
+            var left = col * size - (col > 0 ? info.overlap : 0);
+            var top = row * size - (row > 0 ? info.overlap : 0);
+            var right = Math.min(width, (col + 1) * size + info.overlap);
+            var bottom = Math.min(height, (row + 1) * size + info.overlap);
+            return {left: left / scale, top: top / scale, width: (right - left) / scale, height: (bottom - top) / scale};
+        }
+        
+        function placeTile(img) {
+            var box = tileBox(+img.dataset.level, +img.dataset.col, +img.dataset.row);
+            img.style.left = ((box.left - offsetX) * zoom) + 'px';
+            img.style.top = ((box.top - offsetY) * zoom) + 'px';
+            img.style.width = (box.width * zoom) + 'px';
+            img.style.height = (box.height * zoom) + 'px';
+        }
+        
+        function scheduleRender() {
+            if (renderPending || !info) return;
+            renderPending = true;
+            requestAnimationFrame(render);
+        }
+        
+        function render() {
+            renderPending = false;
+            var level = levelFor(zoom);
+            var scale = levelScale(level);
+            var size = info.tileSize / scale;
+            var cols = Math.ceil(Math.ceil(info.width * scale) / info.tileSize);
+            var rows = Math.ceil(Math.ceil(info.height * scale) / info.tileSize);
+            var right = offsetX + viewport.clientWidth / zoom;
+            var bottom = offsetY + viewport.clientHeight / zoom;
+            var col0 = Math.max(0, Math.floor(offsetX / size));
+            var row0 = Math.max(0, Math.floor(offsetY / size));
+            var col1 = Math.min(cols - 1, Math.floor(right / size));
+            var row1 = Math.min(rows - 1, Math.floor(bottom / size));
+            
+            var wanted = {};
+            var loaded = true;
+            for (var row = row0; row <= row1; row++) {
+                for (var col = col0; col <= col1; col++) {
+                    var key = level + '/' + col + '_' + row;
+                    wanted[key] = true;
+                    var img = tiles[key];
+                    if (!img) {
+                        img = document.createElement('img');
+                        img.dataset.level = level;
+                        img.dataset.col = col;
+                        img.dataset.row = row;
+                        img.draggable = false;
+                        img.onload = scheduleRender;
+                        img.src = apiBase + '/' + info.token + '/' + key + '.png';
+                        tiles[key] = img;
+                        viewport.appendChild(img);
+                    }
+                    img.style.zIndex = 1;
+                    placeTile(img);
+                    if (!img.complete) loaded = false;
+                }
+            }
+            
+            // 다른 레벨 타일은 새 타일이 모두 도착할 때까지 뒤에 깔아 두어 빈 화면이 보이지 않게 함
+            for (var key in tiles) {
+                if (wanted[key]) continue;
+                var old = tiles[key];
+                if (loaded || +old.dataset.level === level) {
+                    old.remove();
+                    delete tiles[key];
+                } else {
+                    old.style.zIndex = 0;
+                    placeTile(old);
+                }
+            }
+        }
+        
+        function zoomAt(factor, screenX, screenY) {
+            var next = Math.max(minZoom, Math.min(maxZoom, zoom * factor));
+            offsetX += screenX / zoom - screenX / next;
+            offsetY += screenY / zoom - screenY / next;
+            zoom = next;
+            scheduleRender();
+        }
+        
+        function zoomBy(factor) {
+            zoomAt(factor, viewport.clientWidth / 2, viewport.clientHeight / 2);
+        }
+        
+        function fit() {
+            var width = viewport.clientWidth;
+            var height = viewport.clientHeight;
+            zoom = Math.min(width / info.width, height / info.height);
+            minZoom = Math.min(zoom / 2, 1);
+            offsetX = -(width / zoom - info.width) / 2;
+            offsetY = -(height / zoom - info.height) / 2;
+            scheduleRender();
+        }
+        
+        viewport.addEventListener('wheel', function(event) {
+            event.preventDefault();
+            var rect = viewport.getBoundingClientRect();
+            zoomAt(Math.pow(1.2, -Math.sign(event.deltaY)), event.clientX - rect.left, event.clientY - rect.top);
+        }, {passive: false});
+        
+        var dragStart = null;
+        viewport.addEventListener('pointerdown', function(event) {
+            dragStart = {x: event.clientX, y: event.clientY, offsetX: offsetX, offsetY: offsetY};
+            viewport.setPointerCapture(event.pointerId);
+            viewport.classList.add('dragging');
+        });
+        viewport.addEventListener('pointermove', function(event) {
+            if (!dragStart) return;
+            offsetX = dragStart.offsetX - (event.clientX - dragStart.x) / zoom;
+            offsetY = dragStart.offsetY - (event.clientY - dragStart.y) / zoom;
+            scheduleRender();
+        });
+        viewport.addEventListener('pointerup', function() {
+            dragStart = null;
+            viewport.classList.remove('dragging');
+        });
+        window.addEventListener('resize', scheduleRender);
+        
+        fetch(apiBase + '/manifest' + location.search)
+            .then(function(response) {
+                if (!response.ok) throw response.status;
+                return response.json();
+            })
+            .then(function(manifest) {
+                info = manifest;
+                fit();
+                setStatus(manifest.tables + '개 테이블, ' + manifest.width + 'x' + manifest.height + 'px (타일은 처음 볼 때 서버에서 그림)');
+            })
+            .catch(function(error) {
+                setStatus('불러오기 실패: ' + error);
+            });
+    </script>
+</body>
+</html>
+"""
 
 
 class ERDiagramWebEditor:
-    def __init__(self, tables_info, logger=None):
+    def __init__(self, tables_info, logger=None, connection_key=None, layout_store=None, layout_workers=1):
         self.tables_info = tables_info
         self.logger = logger
+        self.layout_workers = layout_workers
+        # 이 크기 이상의 그룹만 작업자 프로세스로 보내고, 합계가 작으면 풀을 띄우지 않음
+        self.parallel_min_component = 200
+        self.parallel_min_total = 2000
+        self.connection_key = connection_key
+        self.layout_store = layout_store
+        if connection_key and layout_store is None:
+            self.layout_store = LayoutStore()
         self.port = 8765
         self.server_thread = None
         self.httpd = None
+        self.diagram_id = uuid.uuid4().hex[:12]
+        self.visjs_data = None
+        self.cluster_sets = {}
+        self.fk_graph = None
+        self.schema_fingerprint = None
+        self.next_edge_id = 0
+        self.events = deque(maxlen=EVENT_HISTORY)
+        self.event_condition = threading.Condition()
+        self.event_counter = 0
+        self.search_index = None
+        self.search_lock = threading.Lock()
+        self.focus_max_nodes = 2000
+        self.data_lock = threading.Lock()
+        # 딥 줌 보기: {'token', 'pyramid', 'dir'} (타일은 요청될 때 그려 dir에 보관)
+        self.deep_zoom = None
+        self.deep_zoom_lock = threading.Lock()
+        # 서버 목록 관리 (server.lock으로 보호): 마지막 사용 시각, 열린 이벤트 연결 수, 정리 여부
+        self.last_access = time.monotonic()
+        self.event_streams = 0
+        self.closed = False
+        self.group_spacing = 250
+        self.isolated_spacing = 150
+        # 노드 여백(margin 10 x 2)과 컬럼 좌우 패딩, 테두리를 더한 값
+        self.table_padding = 40
+        self.min_table_width = 150
         
-    def build_graph(self):
+    def build_graph(self, tables_info=None):
+        if tables_info is None:
+            tables_info = self.tables_info
         graph = {}
         degrees = {}
         
-        for table_name in self.tables_info.keys():
+        for table_name in tables_info.keys():
             graph[table_name] = set()
             degrees[table_name] = 0
         
-        for table_name, table_info in self.tables_info.items():
+        for table_name, table_info in tables_info.items():
             for fk in table_info['foreign_keys']:
                 ref_table = fk['referred_table']
-                if ref_table in self.tables_info:
+                if ref_table in tables_info:
                     graph[table_name].add(ref_table)
                     graph[ref_table].add(table_name)
                     degrees[table_name] += 1
@@ -44,13 +709,17 @@ class ERDiagramWebEditor:
         groups = []
         isolated = []
         
+        # 긴 FK 체인에서도 재귀 한도에 걸리지 않도록 스택으로 탐색
         def dfs(node, group):
-            if node in visited:
-                return
+            stack = [node]
             visited.add(node)
-            group.add(node)
-            for neighbor in graph[node]:
-                dfs(neighbor, group)
+            while stack:
+                current = stack.pop()
+                group.add(current)
+                for neighbor in graph[current]:
+                    if neighbor not in visited:
+                        visited.add(neighbor)
+                        stack.append(neighbor)
         
         for table_name in self.tables_info.keys():
             if table_name not in visited:
@@ -69,7 +738,8 @@ class ERDiagramWebEditor:
         
         max_degree = -1
         center = None
-        for node in group:
+        # 동률일 때도 결과가 항상 같도록 이름 순으로 비교
+        for node in sorted(group):
             if degrees[node] > max_degree:
                 max_degree = degrees[node]
                 center = node
@@ -85,7 +755,7 @@ class ERDiagramWebEditor:
         while len(visited) < len(group):
             next_layer = []
             for node in layers[current_layer]:
-                for neighbor in graph[node]:
+                for neighbor in sorted(graph[node]):
                     if neighbor in group and neighbor not in visited:
                         next_layer.append(neighbor)
                         visited.add(neighbor)
@@ -108,16 +778,31 @@ class ERDiagramWebEditor:
                     return True
         return False
     
-    def calculate_table_size(self, table_info):
-        max_col_name_len = max([len(col['name']) for col in table_info['columns']], default=0)
-        max_type_len = max([len(str(col['type']).split('(')[0].split('[')[0]) for col in table_info['columns']], default=0)
-        
-        table_name_len = len(table_info.get('name', ''))
+    def find_referenced_tables(self):
+        """다른 테이블이 참조하는(부모) 테이블 집합"""
+        referenced = set()
+        for table_name, table_info in self.tables_info.items():
+            for fk in table_info.get('foreign_keys', []):
+                if fk['referred_table'] != table_name:
+                    referenced.add(fk['referred_table'])
+        return referenced
+    
+    def calculate_table_size(self, table_info, table_name=''):
         num_cols = len(table_info['columns'])
         
-        # 더 정확한 크기 계산
-        content_width = max(max_col_name_len + max_type_len + 50, table_name_len + 20)
-        width = max(350, content_width * 7.5)
+        # 라벨과 같은 글꼴 메트릭으로 너비 측정 (헤더 10px 굵게, 컬럼 8px)
+        content_width = measure_text(table_name or table_info.get('name', ''), 'Arial Bold', 10)
+        separator_width = measure_text(': ', 'Arial', 8)
+        not_null_width = measure_text(' *', 'Arial', 8)
+        for col in table_info['columns']:
+            col_type = str(col['type']).split('(')[0].split('[')[0]
+            col_width = measure_text(col['name'], 'Arial', 8) + separator_width + measure_text(col_type, 'Arial', 8)
+            if not col.get('nullable', True):
+                col_width += not_null_width
+            if col_width > content_width:
+                content_width = col_width
+        
+        width = max(self.min_table_width, content_width + self.table_padding)
         
         # PK, FK, 일반 컬럼 섹션 고려
         pk_count = len([c for c in table_info.get('primary_keys', [])])
@@ -137,378 +822,932 @@ class ERDiagramWebEditor:
         
         return width, height
     
-    def convert_to_visjs_format(self):
-        nodes = []
-        edges = []
+    def compute_group_layout(self, group, graph, degrees, table_sizes, referenced):
+        """연결 그룹 하나를 중심 테이블이 (0, 0)인 로컬 좌표로 배치"""
+        names, payload = encode_component(group, graph, table_sizes, referenced, degrees)
+        center_index, coords = layout_component(payload)
+        return names[center_index], dict(zip(names, coords))
+    
+    def layout_components(self, payloads):
+        """압축된 연결 그룹들을 배치. 큰 그룹이 여러 개면 프로세스 풀에서 병렬로 처리"""
+        results = [None] * len(payloads)
+        
+        large = [i for i, payload in enumerate(payloads) if len(payload[0]) >= self.parallel_min_component]
+        large_total = sum(len(payloads[i][0]) for i in large)
+        
+        if self.layout_workers > 1 and len(large) > 1 and large_total >= self.parallel_min_total:
+            # 큰 그룹부터 제출하여 작업자 간 부하를 고르게 함
+            large.sort(key=lambda i: -len(payloads[i][0]))
+            try:
+                with ProcessPoolExecutor(max_workers=min(self.layout_workers, len(large))) as executor:
+                    futures = [(i, executor.submit(layout_component, payloads[i])) for i in large]
+                    
+                    # 작업자가 도는 동안 작은 그룹은 현재 프로세스에서 처리
+                    large_set = set(large)
+                    for i, payload in enumerate(payloads):
+                        if i not in large_set:
+                            results[i] = layout_component(payload)
+                    
+                    for i, future in futures:
+                        results[i] = future.result()
+                
+                if self.logger:
+                    self.logger.debug(f"병렬 레이아웃: {len(large)}개 그룹, {large_total}개 테이블, 작업자 {self.layout_workers}개")
+            except Exception as e:
+                if self.logger:
+                    self.logger.warning(f"병렬 레이아웃 실패, 순차 처리로 대체: {str(e)}")
         
+        for i, payload in enumerate(payloads):
+            if results[i] is None:
+                results[i] = layout_component(payload)
+        
+        return results
+    
+    def compute_layout(self):
+        """전체 테이블 좌표 계산 (그룹별 배치 후 바운딩 박스 패킹)"""
         groups, isolated, graph, degrees = self.find_connected_groups()
         
         table_sizes = {}
         for table_name, table_info in self.tables_info.items():
-            table_sizes[table_name] = self.calculate_table_size(table_info)
+            table_sizes[table_name] = self.calculate_table_size(table_info, table_name)
+        
+        referenced = self.find_referenced_tables()
         
         x_start = 600
         y_start = 600
-        group_spacing_x = 3000
-        group_spacing_y = 3000
-        isolated_spacing_x = 500
-        isolated_spacing_y = 450
         
-        initial_positions = {}
+        centers = set()
+        local_layouts = []
+        pack_items = []
         
-        group_idx = 0
-        for group in groups:
-            center = self.find_center_node(group, graph, degrees)
-            layers = self.layout_by_layers(center, group, graph, table_sizes)
-            
-            group_x = x_start + (group_idx % 2) * group_spacing_x
-            group_y = y_start + (group_idx // 2) * group_spacing_y
-            
-            center_width, center_height = table_sizes[center]
-            center_x = group_x
-            center_y = group_y
+        encoded = [encode_component(group, graph, table_sizes, referenced, degrees) for group in groups]
+        results = self.layout_components([payload for _, payload in encoded])
+        
+        for group_idx, ((names, _), (center_index, coords)) in enumerate(zip(encoded, results)):
+            centers.add(names[center_index])
+            local_positions = dict(zip(names, coords))
             
-            for table_name in group:
-                table_info = self.tables_info[table_name]
+            min_x, min_y, max_x, max_y = self.bounding_box(local_positions, table_sizes)
+            local_layouts.append((local_positions, min_x, min_y))
+            pack_items.append((('group', group_idx), max_x - min_x, max_y - min_y))
+        
+        # 고립 테이블은 선반 방식으로 하나의 블록으로 묶은 뒤 함께 패킹
+        isolated_positions = {}
+        if isolated:
+            isolated_packer = ShelfPacker(spacing=self.isolated_spacing)
+            isolated_offsets, isolated_block = isolated_packer.pack(
+                [(table_name, table_sizes[table_name][0], table_sizes[table_name][1]) for table_name in isolated]
+            )
+            for table_name, (x, y) in isolated_offsets.items():
                 width, height = table_sizes[table_name]
-                
-                if table_name == center:
-                    x = center_x
-                    y = center_y
-                else:
-                    layer = None
-                    for l, nodes_in_layer in layers.items():
-                        if table_name in nodes_in_layer:
-                            layer = l
-                            break
-                    
-                    if layer is None:
-                        x = center_x
-                        y = center_y
-                    else:
-                        layer_nodes = layers[layer]
-                        node_idx = layer_nodes.index(table_name)
-                        num_in_layer = len(layer_nodes)
-                        
-                        if layer == 1:
-                            # 각 노드의 실제 크기 계산
-                            node_width, node_height = table_sizes[table_name]
-                            center_size = max(center_width, center_height)
-                            node_size = max(node_width, node_height)
-                            
-                            # 충분한 간격 확보 (최소 100px 여유)
-                            radius = center_size / 2 + node_size / 2 + 350
-                            
-                            is_parent = self.is_parent_table(table_name, graph)
-                            
-                            # 부모는 위쪽, 자식은 아래쪽 배치
-                            if is_parent:
-                                y = center_y - radius
-                                # 위쪽에 여러 개일 때 원형 배치
-                                if num_in_layer > 1:
-                                    angle_step = 2 * math.pi / num_in_layer
-                                    angle = node_idx * angle_step - math.pi / 2
-                                    x = center_x + radius * 0.9 * math.cos(angle)
-                                else:
-                                    x = center_x
-                            else:
-                                y = center_y + radius
-                                # 아래쪽에 여러 개일 때 원형 배치
-                                if num_in_layer > 1:
-                                    angle_step = 2 * math.pi / num_in_layer
-                                    angle = node_idx * angle_step + math.pi / 2
-                                    x = center_x + radius * 0.9 * math.cos(angle)
-                                else:
-                                    x = center_x
-                        else:
-                            prev_layer_nodes = layers[layer - 1]
-                            parent_node = None
-                            for prev_node in prev_layer_nodes:
-                                if table_name in graph[prev_node]:
-                                    parent_node = prev_node
-                                    break
-                            
-                            if parent_node:
-                                parent_pos = initial_positions.get(parent_node, {'x': center_x, 'y': center_y})
-                                parent_width, parent_height = table_sizes[parent_node]
-                                parent_size = max(parent_width, parent_height)
-                                node_size = max(width, height)
-                                
-                                # 충분한 간격 확보
-                                radius = parent_size / 2 + node_size / 2 + 300
-                                
-                                siblings = [n for n in layer_nodes if n != table_name and n in graph.get(parent_node, set())]
-                                
-                                # 부모의 위치에 따라 배치 방향 결정
-                                parent_angle = math.atan2(parent_pos['y'] - center_y, parent_pos['x'] - center_x)
-                                
-                                if len(siblings) == 0:
-                                    # 부모 아래쪽에 배치
-                                    angle_offset = math.pi / 2
-                                else:
-                                    # 형제들과 함께 원형 배치
-                                    angle_step = 2 * math.pi / (len(siblings) + 1)
-                                    sibling_pos = siblings.index(table_name) if table_name in siblings else node_idx
-                                    angle_offset = (sibling_pos + 1) * angle_step
-                                
-                                angle = parent_angle + angle_offset
-                                
-                                x = parent_pos['x'] + radius * math.cos(angle)
-                                y = parent_pos['y'] + radius * math.sin(angle)
-                            else:
-                                radius = max(center_width, center_height) / 2 + max(width, height) / 2 + 250 * layer
-                                angle_step = 2 * math.pi / num_in_layer if num_in_layer > 0 else 0
-                                angle = node_idx * angle_step - math.pi / 2
-                                x = center_x + radius * math.cos(angle)
-                                y = center_y + radius * math.sin(angle)
-                
-                pk_columns = []
-                fk_columns = []
-                other_columns = []
-                
-                for col_info in table_info['columns']:
-                    col_name = col_info['name']
-                    col_type = str(col_info['type']).split('(')[0].split('[')[0]
-                    nullable = col_info.get('nullable', True)
-                    
-                    is_pk = col_name in table_info['primary_keys']
-                    is_fk = any(col_name in fk['constrained_columns'] for fk in table_info.get('foreign_keys', []))
-                    
-                    col_display = f"{col_name}: {col_type}"
-                    if not nullable:
-                        col_display += " *"
-                    
-                    if is_pk:
-                        pk_columns.append(col_display)
-                    elif is_fk:
-                        fk_columns.append(col_display)
-                    else:
-                        other_columns.append(col_display)
-                
-                # HTML 형식으로 라벨 생성 (이스케이프 없이)
-                label_parts = []
-                
-                # 테이블 이름 헤더
-                header_style = "font-weight:bold;font-size:10px;padding:4px 2px;background:#2c3e50;color:white;text-align:center;"
-                label_parts.append(f"<div style='{header_style}'>{table_name}</div>")
-                
-                if pk_columns:
-                    label_parts.append("<div style='border-top:2px solid #d32f2f;margin:2px 0;'></div>")
-                    label_parts.append("<div style='color:#d32f2f;font-weight:bold;font-size:8px;padding:2px;'>PK</div>")
-                    for col in pk_columns:
-                        col_escaped = col.replace("'", "&#39;").replace('"', "&quot;")
-                        label_parts.append(f"<div style='font-size:8px;padding:1px 4px;'>{col_escaped}</div>")
-                
-                if fk_columns:
-                    label_parts.append("<div style='border-top:1px solid #1976d2;margin:2px 0;'></div>")
-                    label_parts.append("<div style='color:#1976d2;font-weight:bold;font-size:8px;padding:2px;'>FK</div>")
-                    for col in fk_columns:
-                        col_escaped = col.replace("'", "&#39;").replace('"', "&quot;")
-                        label_parts.append(f"<div style='font-size:8px;padding:1px 4px;'>{col_escaped}</div>")
-                
-                if other_columns:
-                    if pk_columns or fk_columns:
-                        label_parts.append("<div style='border-top:1px solid #999;margin:2px 0;'></div>")
-                    for col in other_columns:
-                        col_escaped = col.replace("'", "&#39;").replace('"', "&quot;")
-                        label_parts.append(f"<div style='font-size:8px;padding:1px 4px;'>{col_escaped}</div>")
-                
-                label = "".join(label_parts)
-                
-                node_color = {
-                    'background': '#fff3e0' if table_name == center else '#e3f2fd',
-                    'border': '#f57c00' if table_name == center else '#1976d2',
-                    'highlight': {
-                        'background': '#ffe0b2' if table_name == center else '#bbdefb',
-                        'border': '#e65100' if table_name == center else '#0d47a1'
-                    }
-                }
-                
-                node = {
-                    'id': table_name,
-                    'label': label,
-                    'x': x,
-                    'y': y,
-                    'shape': 'box',
-                    'color': {
-                        'background': '#ffffff',
-                        'border': '#2c3e50',
-                        'highlight': {
-                            'background': '#ecf0f1',
-                            'border': '#34495e'
-                        }
-                    },
-                    'font': {
-                        'face': 'Arial',
-                        'size': 9,
-                        'multi': 'html',
-                        'align': 'left'
-                    },
-                    'widthConstraint': {
-                        'maximum': width
-                    },
-                    'borderWidth': 2,
-                    'borderWidthSelected': 3
+                isolated_positions[table_name] = (x + width / 2, y + height / 2)
+            pack_items.append((('isolated', 0), isolated_block[0], isolated_block[1]))
+        
+        packer = SkylinePacker(spacing=self.group_spacing)
+        offsets, canvas_size = packer.pack(pack_items)
+        
+        positions = {}
+        for group_idx, (local_positions, min_x, min_y) in enumerate(local_layouts):
+            offset_x, offset_y = offsets[('group', group_idx)]
+            for table_name, (x, y) in local_positions.items():
+                positions[table_name] = {
+                    'x': x_start + offset_x + (x - min_x),
+                    'y': y_start + offset_y + (y - min_y)
                 }
-                nodes.append(node)
-                initial_positions[table_name] = {'x': x, 'y': y}
-            
-            group_idx += 1
         
-        isolated_start_x = x_start
-        isolated_start_y = y_start + (len(groups) + 1) * group_spacing_y
+        if isolated:
+            offset_x, offset_y = offsets[('isolated', 0)]
+            for table_name in isolated:
+                x, y = isolated_positions[table_name]
+                positions[table_name] = {'x': x_start + offset_x + x, 'y': y_start + offset_y + y}
         
-        isolated_cols = max(4, int((len(isolated) ** 0.5) * 1.3))
-        isolated_idx = 0
-        for table_name in isolated:
-            table_info = self.tables_info[table_name]
-            col = isolated_idx % isolated_cols
-            row = isolated_idx // isolated_cols
-            
-            width, height = table_sizes[table_name]
-            
-            x = isolated_start_x + col * isolated_spacing_x
-            y = isolated_start_y + row * isolated_spacing_y
-            
-            pk_columns = []
-            fk_columns = []
-            other_columns = []
-            
-            for col_info in table_info['columns']:
-                col_name = col_info['name']
-                col_type = str(col_info['type']).split('(')[0].split('[')[0]
-                nullable = col_info.get('nullable', True)
-                
-                is_pk = col_name in table_info['primary_keys']
-                is_fk = any(col_name in fk['constrained_columns'] for fk in table_info.get('foreign_keys', []))
+        return {
+            'positions': positions,
+            'table_sizes': table_sizes,
+            'centers': centers,
+            'isolated': isolated,
+            'canvas_size': canvas_size
+        }
+    
+    def resolve_layout(self):
+        """저장된 좌표가 있으면 재사용하고, 그 이후 추가된 테이블만 배치"""
+        if not self.connection_key:
+            layout = self.compute_layout()
+            layout['source'] = 'computed'
+            return layout
+        
+        fingerprint = self.get_schema_fingerprint()
+        stored = self.layout_store.load(self.connection_key)
+        
+        if not stored:
+            layout = self.compute_layout()
+            layout['source'] = 'computed'
+            self.layout_store.save(self.connection_key, fingerprint, layout['positions'])
+            if self.logger:
+                self.logger.info(f"레이아웃 계산 및 저장: {len(layout['positions'])}개 테이블")
+            return layout
+        
+        table_sizes = {}
+        for table_name, table_info in self.tables_info.items():
+            table_sizes[table_name] = self.calculate_table_size(table_info, table_name)
+        
+        graph, degrees = self.build_graph()
+        # 자기 자신만 참조하는 테이블도 고립 테이블로 본다 (compute_layout, apply_schema_delta와 같은 기준)
+        isolated = [table_name for table_name in self.tables_info.keys() if not (graph[table_name] - {table_name})]
+        
+        positions = {}
+        for table_name, pos in stored.get('positions', {}).items():
+            if table_name in self.tables_info:
+                positions[table_name] = {'x': pos['x'], 'y': pos['y']}
+        new_tables = [table_name for table_name in self.tables_info.keys() if table_name not in positions]
+        
+        if stored.get('fingerprint') == fingerprint and not new_tables:
+            source = 'stored'
+        else:
+            source = 'incremental'
+            positions = self.place_new_tables(positions, new_tables, graph, table_sizes)
+            self.layout_store.save(self.connection_key, fingerprint, positions)
+        
+        if self.logger:
+            self.logger.info(f"저장된 레이아웃 사용 ({source}): 새 테이블 {len(new_tables)}개 배치")
+        
+        return {
+            'positions': positions,
+            'table_sizes': table_sizes,
+            'centers': set(),
+            'isolated': isolated,
+            'source': source
+        }
+    
+    def get_schema_fingerprint(self):
+        if self.schema_fingerprint is None:
+            self.schema_fingerprint = LayoutStore.schema_fingerprint(self.tables_info)
+        return self.schema_fingerprint
+    
+    def update_positions(self, updates):
+        """편집기에서 옮긴 테이블 좌표를 반영하고 저장소에 병합
+        
+        updates: {테이블: {'x': x, 'y': y}}
+        반환: (반영한 테이블 수, 파일 저장 여부)
+        """
+        positions = {}
+        for table_name, pos in updates.items():
+            if table_name not in self.tables_info or not isinstance(pos, dict):
+                continue
+            x, y = pos.get('x'), pos.get('y')
+            if not isinstance(x, (int, float)) or not isinstance(y, (int, float)):
+                continue
+            if not (math.isfinite(x) and math.isfinite(y)):
+                continue
+            positions[table_name] = {'x': x, 'y': y}
+        
+        if not positions:
+            return 0, False
+        
+        # 페이지를 다시 열었을 때 바로 옮긴 위치로 보이도록 메모리의 노드 데이터도 갱신
+        with self.data_lock:
+            if self.visjs_data is not None:
+                node_index = self.visjs_data['node_index']
+                for table_name, pos in positions.items():
+                    # 스키마 변경을 반영하는 중이면 새 테이블의 노드가 아직 없을 수 있음
+                    node = node_index.get(table_name)
+                    if node is None:
+                        continue
+                    node['x'] = pos['x']
+                    node['y'] = pos['y']
+                    self.visjs_data['initial_positions'][table_name] = dict(pos)
+        
+        saved = False
+        if self.connection_key:
+            saved = self.layout_store.merge_positions(self.connection_key, self.get_schema_fingerprint(), positions)
+        
+        if self.logger:
+            self.logger.info(f"테이블 좌표 저장: {len(positions)}개 (파일 저장: {saved})")
+        return len(positions), saved
+    
+    def place_new_tables(self, positions, new_tables, graph, table_sizes, tables_info=None):
+        """기존 좌표는 유지하고 새 테이블을 FK 이웃 근처의 빈 자리에 배치"""
+        if tables_info is None:
+            tables_info = self.tables_info
+        grid = SpatialGrid(cell_size=800)
+        placed = dict(positions)
+        for table_name, pos in placed.items():
+            grid.insert(table_name, self.node_rect(pos['x'], pos['y'], table_sizes[table_name]))
+        
+        # 이웃이 이미 배치된 테이블부터 차례로 배치 (새 테이블끼리 연결된 경우 포함)
+        pending = list(new_tables)
+        progress = True
+        while pending and progress:
+            progress = False
+            remaining = []
+            for table_name in pending:
+                anchors = [placed[n] for n in sorted(graph[table_name]) if n in placed]
+                if not anchors:
+                    remaining.append(table_name)
+                    continue
                 
-                col_display = f"{col_name}: {col_type}"
-                if not nullable:
-                    col_display += " *"
+                anchor_x = sum(pos['x'] for pos in anchors) / len(anchors)
+                anchor_y = sum(pos['y'] for pos in anchors) / len(anchors)
+                x, y = self.find_free_position(grid, anchor_x, anchor_y, table_sizes[table_name])
                 
-                if is_pk:
-                    pk_columns.append(col_display)
-                elif is_fk:
-                    fk_columns.append(col_display)
-                else:
-                    other_columns.append(col_display)
-            
-            # HTML 형식으로 라벨 생성 (이스케이프 없이)
-            label_parts = []
-            
-            # 테이블 이름 헤더
-            header_style = "font-weight:bold;font-size:10px;padding:4px 2px;background:#757575;color:white;text-align:center;"
-            label_parts.append(f"<div style='{header_style}'>{table_name}</div>")
-            
-            if pk_columns:
-                label_parts.append("<div style='border-top:2px solid #d32f2f;margin:2px 0;'></div>")
-                label_parts.append("<div style='color:#d32f2f;font-weight:bold;font-size:8px;padding:2px;'>PK</div>")
-                for col in pk_columns:
-                    col_escaped = col.replace("'", "&#39;").replace('"', "&quot;")
-                    label_parts.append(f"<div style='font-size:8px;padding:1px 4px;'>{col_escaped}</div>")
+                placed[table_name] = {'x': x, 'y': y}
+                grid.insert(table_name, self.node_rect(x, y, table_sizes[table_name]))
+                progress = True
+            pending = remaining
+        
+        # 기존 테이블과 연결되지 않은 새 테이블은 따로 배치하여 기존 영역 아래에 붙인다
+        if pending:
+            sub_editor = ERDiagramWebEditor({table_name: tables_info[table_name] for table_name in pending})
+            sub_layout = sub_editor.compute_layout()
+            sub_positions = {name: (pos['x'], pos['y']) for name, pos in sub_layout['positions'].items()}
+            sub_min_x, sub_min_y, _, _ = self.bounding_box(sub_positions, table_sizes)
             
-            if fk_columns:
-                label_parts.append("<div style='border-top:1px solid #1976d2;margin:2px 0;'></div>")
-                label_parts.append("<div style='color:#1976d2;font-weight:bold;font-size:8px;padding:2px;'>FK</div>")
-                for col in fk_columns:
-                    col_escaped = col.replace("'", "&#39;").replace('"', "&quot;")
-                    label_parts.append(f"<div style='font-size:8px;padding:1px 4px;'>{col_escaped}</div>")
+            bounds = grid.bounds() or (0, 0, 0, 0)
+            offset_x = bounds[0] - sub_min_x
+            offset_y = bounds[3] + self.group_spacing - sub_min_y
+            for table_name, (x, y) in sub_positions.items():
+                placed[table_name] = {'x': x + offset_x, 'y': y + offset_y}
+        
+        return placed
+    
+    def node_rect(self, x, y, size, margin=0):
+        width, height = size
+        return (x - width / 2 - margin, y - height / 2 - margin, x + width / 2 + margin, y + height / 2 + margin)
+    
+    def find_free_position(self, grid, anchor_x, anchor_y, size, gap=120, max_rings=60):
+        """기준점에서 나선형으로 바깥쪽을 탐색하여 겹치지 않는 첫 위치 반환"""
+        width, height = size
+        step = max(width, height) / 2 + gap
+        
+        for ring in range(1, max_rings + 1):
+            radius = ring * step
+            count = 8 * ring
+            for i in range(count):
+                # 아래쪽(자식 방향)부터 시계 방향으로 탐색
+                angle = math.pi / 2 + 2 * math.pi * i / count
+                x = anchor_x + radius * math.cos(angle)
+                y = anchor_y + radius * math.sin(angle)
+                if not grid.intersects(self.node_rect(x, y, size, gap / 2)):
+                    return x, y
+        
+        bounds = grid.bounds() or (0, 0, 0, 0)
+        return anchor_x, bounds[3] + gap + height / 2
+    
+    def bounding_box(self, positions, table_sizes):
+        """노드 중심 좌표와 크기로 (min_x, min_y, max_x, max_y) 계산"""
+        min_x = min_y = math.inf
+        max_x = max_y = -math.inf
+        for table_name, (x, y) in positions.items():
+            width, height = table_sizes[table_name]
+            min_x = min(min_x, x - width / 2)
+            min_y = min(min_y, y - height / 2)
+            max_x = max(max_x, x + width / 2)
+            max_y = max(max_y, y + height / 2)
+        return min_x, min_y, max_x, max_y
+    
+    def classify_columns(self, table_info):
+        """컬럼 표시 문자열을 (PK, FK, 나머지)로 분류"""
+        pk_columns = []
+        fk_columns = []
+        other_columns = []
+        
+        for col_info in table_info['columns']:
+            col_name = col_info['name']
+            col_type = str(col_info['type']).split('(')[0].split('[')[0]
+            nullable = col_info.get('nullable', True)
             
-            if other_columns:
-                if pk_columns or fk_columns:
-                    label_parts.append("<div style='border-top:1px solid #999;margin:2px 0;'></div>")
-                for col in other_columns:
-                    col_escaped = col.replace("'", "&#39;").replace('"', "&quot;")
-                    label_parts.append(f"<div style='font-size:8px;padding:1px 4px;'>{col_escaped}</div>")
+            is_pk = col_name in table_info['primary_keys']
+            is_fk = any(col_name in fk['constrained_columns'] for fk in table_info.get('foreign_keys', []))
             
-            label = "".join(label_parts)
+            col_display = f"{col_name}: {col_type}"
+            if not nullable:
+                col_display += " *"
             
-            node = {
-                'id': table_name,
-                'label': label,
-                'x': x,
-                'y': y,
-                'shape': 'box',
-                'color': {
-                    'background': '#f5f5f5',
-                    'border': '#757575',
-                    'highlight': {
-                        'background': '#e0e0e0',
-                        'border': '#616161'
-                    }
-                },
-                'font': {
-                    'face': 'Arial',
-                    'size': 9,
-                    'multi': 'html',
-                    'align': 'left'
-                },
-                'widthConstraint': {
-                    'maximum': width
-                },
-                'borderWidth': 2,
-                'borderWidthSelected': 3
+            if is_pk:
+                pk_columns.append(col_display)
+            elif is_fk:
+                fk_columns.append(col_display)
+            else:
+                other_columns.append(col_display)
+        
+        return pk_columns, fk_columns, other_columns
+    
+    def build_node_label(self, table_name, table_info, header_background, detail=LOD_FULL):
+        """detail: LOD_NAME(이름만), LOD_KEYS(PK/FK 컬럼), LOD_FULL(전체 컬럼)"""
+        # HTML 형식으로 라벨 생성 (이스케이프 없이)
+        label_parts = []
+        
+        # 테이블 이름 헤더
+        header_style = f"font-weight:bold;font-size:10px;padding:4px 2px;background:{header_background};color:white;text-align:center;"
+        label_parts.append(f"<div style='{header_style}'>{table_name}</div>")
+        
+        if detail == LOD_NAME:
+            return "".join(label_parts)
+        
+        pk_columns, fk_columns, other_columns = self.classify_columns(table_info)
+        
+        if pk_columns:
+            label_parts.append("<div style='border-top:2px solid #d32f2f;margin:2px 0;'></div>")
+            label_parts.append("<div style='color:#d32f2f;font-weight:bold;font-size:8px;padding:2px;'>PK</div>")
+            for col in pk_columns:
+                col_escaped = col.replace("'", "&#39;").replace('"', "&quot;")
+                label_parts.append(f"<div style='font-size:8px;padding:1px 4px;'>{col_escaped}</div>")
+        
+        if fk_columns:
+            label_parts.append("<div style='border-top:1px solid #1976d2;margin:2px 0;'></div>")
+            label_parts.append("<div style='color:#1976d2;font-weight:bold;font-size:8px;padding:2px;'>FK</div>")
+            for col in fk_columns:
+                col_escaped = col.replace("'", "&#39;").replace('"', "&quot;")
+                label_parts.append(f"<div style='font-size:8px;padding:1px 4px;'>{col_escaped}</div>")
+        
+        if other_columns and detail == LOD_FULL:
+            if pk_columns or fk_columns:
+                label_parts.append("<div style='border-top:1px solid #999;margin:2px 0;'></div>")
+            for col in other_columns:
+                col_escaped = col.replace("'", "&#39;").replace('"', "&quot;")
+                label_parts.append(f"<div style='font-size:8px;padding:1px 4px;'>{col_escaped}</div>")
+        
+        return "".join(label_parts)
+    
+    def node_colors(self, is_isolated):
+        """(헤더 배경색, vis.js 노드 색상)"""
+        if is_isolated:
+            return '#757575', {
+                'background': '#f5f5f5',
+                'border': '#757575',
+                'highlight': {
+                    'background': '#e0e0e0',
+                    'border': '#616161'
+                }
             }
-            nodes.append(node)
-            initial_positions[table_name] = {'x': x, 'y': y}
-            
-            isolated_idx += 1
+        return '#2c3e50', {
+            'background': '#ffffff',
+            'border': '#2c3e50',
+            'highlight': {
+                'background': '#ecf0f1',
+                'border': '#34495e'
+            }
+        }
+    
+    def build_node(self, table_name, x, y, size, is_isolated, tables_info=None):
+        table_info = (self.tables_info if tables_info is None else tables_info)[table_name]
+        width, height = size
+        header_background, color = self.node_colors(is_isolated)
+        
+        # 전체 컬럼 라벨은 보내지 않고, 축소 상태의 이름 라벨과 중간 단계의 PK/FK 라벨만 포함
+        name_label = self.build_node_label(table_name, table_info, header_background, LOD_NAME)
+        return {
+            'id': table_name,
+            'label': name_label,
+            'nameLabel': name_label,
+            'keysLabel': self.build_node_label(table_name, table_info, header_background, LOD_KEYS),
+            'x': x,
+            'y': y,
+            'shape': 'box',
+            'color': color,
+            'font': {
+                'face': 'Arial',
+                'size': 9,
+                'multi': 'html',
+                'align': 'left'
+            },
+            # 상세 단계가 바뀌어도 상자 크기가 유지되도록 레이아웃 크기로 고정
+            'widthConstraint': {
+                'minimum': width,
+                'maximum': width
+            },
+            'heightConstraint': {
+                'minimum': height,
+                'valign': 'top'
+            },
+            'borderWidth': 2,
+            'borderWidthSelected': 3
+        }
+    
+    def build_detail_labels(self, table_names):
+        """전체 컬럼 라벨 (편집기에서 화면에 들어오거나 선택된 테이블만 요청)"""
+        # 전체 레이아웃 없이 (포커스 보기 등) 요청될 수 있으므로 FK 그래프로 고립 여부 판단
+        tables_info, (parents, children) = self.snapshot_fk_graph()
+        labels = {}
+        for table_name in table_names:
+            table_info = tables_info.get(table_name)
+            if table_info is None:
+                continue
+            header_background, _ = self.node_colors(not parents[table_name] and not children[table_name])
+            labels[table_name] = self.build_node_label(table_name, table_info, header_background, LOD_FULL)
+        return labels
+    
+    def build_edge(self, edge_id, table_name, fk):
+        return {
+            'id': f"edge_{edge_id}",
+            'from': table_name,
+            'to': fk['referred_table'],
+            'arrows': {
+                'to': {
+                    'enabled': True,
+                    'scaleFactor': 1.5,
+                    'type': 'arrow'
+                }
+            },
+            'color': {
+                'color': '#2c3e50',
+                'highlight': '#34495e'
+            },
+            'label': ', '.join(fk['constrained_columns'][:2]),
+            'font': {
+                'size': 8,
+                'align': 'middle',
+                'color': '#2c3e50'
+            },
+            'smooth': {
+                'type': 'straightCross',
+                'roundness': 0
+            },
+            'width': 2,
+            'dashes': False
+        }
+    
+    def convert_to_visjs_format(self):
+        nodes = []
+        edges = []
+        
+        layout = self.resolve_layout()
+        positions = layout['positions']
+        table_sizes = layout['table_sizes']
+        isolated = set(layout['isolated'])
+        
+        initial_positions = {}
+        for table_name, pos in positions.items():
+            nodes.append(self.build_node(table_name, pos['x'], pos['y'], table_sizes[table_name], table_name in isolated))
+            initial_positions[table_name] = {'x': pos['x'], 'y': pos['y']}
         
-        edge_id = 0
         for table_name, table_info in self.tables_info.items():
             for fk in table_info['foreign_keys']:
-                ref_table = fk['referred_table']
-                if ref_table in self.tables_info:
-                    edge = {
-                        'id': f"edge_{edge_id}",
-                        'from': table_name,
-                        'to': ref_table,
-                        'arrows': {
-                            'to': {
-                                'enabled': True,
-                                'scaleFactor': 1.5,
-                                'type': 'arrow'
-                            }
-                        },
-                        'color': {
-                            'color': '#2c3e50',
-                            'highlight': '#34495e'
-                        },
-                        'label': ', '.join(fk['constrained_columns'][:2]),
-                        'font': {
-                            'size': 8,
-                            'align': 'middle',
-                            'color': '#2c3e50'
-                        },
-                        'smooth': {
-                            'type': 'straightCross',
-                            'roundness': 0
-                        },
-                        'width': 2,
-                        'dashes': False
-                    }
-                    edges.append(edge)
-                    edge_id += 1
+                if fk['referred_table'] in self.tables_info:
+                    edges.append(self.build_edge(len(edges), table_name, fk))
+        self.next_edge_id = len(edges)
+        
+        return self.index_visjs_data(nodes, edges, initial_positions, isolated)
+    
+    def index_visjs_data(self, nodes, edges, initial_positions, isolated):
+        # 묶음 펼치기 요청에서 멤버 노드/간선을 바로 찾기 위한 색인
+        node_index = {node['id']: node for node in nodes}
+        edges_by_table = {}
+        for edge in edges:
+            edges_by_table.setdefault(edge['from'], []).append(edge)
+            if edge['to'] != edge['from']:
+                edges_by_table.setdefault(edge['to'], []).append(edge)
+        
+        return {
+            'nodes': nodes,
+            'edges': edges,
+            'initial_positions': initial_positions,
+            'isolated': isolated,
+            'node_index': node_index,
+            'edges_by_table': edges_by_table
+        }
+    
+    def last_event_id(self):
+        with self.event_condition:
+            return self.event_counter
+    
+    def publish_event(self, event, data):
+        with self.event_condition:
+            self.event_counter += 1
+            self.events.append((self.event_counter, event, data))
+            self.event_condition.notify_all()
+    
+    def wait_events(self, after_id, timeout):
+        """after_id 이후의 이벤트 목록 (없으면 timeout초 동안 대기)"""
+        with self.event_condition:
+            self.event_condition.wait_for(lambda: self.event_counter > after_id or self.closed, timeout)
+            return [item for item in self.events if item[0] > after_id]
+    
+    def release(self):
+        """서버 목록에서 빠진 편집기의 레이아웃/검색 데이터와 딥 줌 임시 폴더를 정리하고 이벤트 연결을 깨움"""
+        with self.data_lock:
+            self.closed = True
+            self.visjs_data = None
+            self.cluster_sets = {}
+            self.fk_graph = None
+        self.reset_search_index()
+        with self.deep_zoom_lock:
+            if self.deep_zoom is not None:
+                _remove_deep_zoom_dir(self.deep_zoom['dir'])
+                self.deep_zoom = None
+        with self.event_condition:
+            self.event_condition.notify_all()
+    
+    def swap_tables_info(self, tables_info, fingerprint=None):
+        """스키마 정보를 바꾸고 거기서 계산한 캐시를 비움 (data_lock을 잡은 상태에서 호출)"""
+        self.tables_info = tables_info
+        self.fk_graph = None
+        self.cluster_sets = {}
+        self.schema_fingerprint = fingerprint
+    
+    def reset_search_index(self):
+        # 교체 전 스키마로 만들던 색인은 search_lock이 풀린 뒤 여기서 버려짐
+        with self.search_lock:
+            self.search_index = None
+    
+    def apply_schema_delta(self, delta):
+        """스키마 변경분을 반영하고 열린 페이지에 노드/간선 변경을 알림
+        
+        기존 테이블 좌표는 유지하고 새 테이블만 이웃 근처에 배치 (감시 스레드에서 호출됨)
+        delta: {'added': {테이블: 정보}, 'changed': {테이블: 정보}, 'removed': [테이블...]}
+        """
+        if self.closed:
+            return None
+        added = delta.get('added', {})
+        changed = delta.get('changed', {})
+        removed = set(delta.get('removed', []))
+        
+        # GUI가 들고 있는 원본을 바꾸지 않도록 복사본을 고쳐서 계산하고, 끝에서 vis.js 데이터와 함께 교체
+        # (요청 스레드는 교체 전까지 이전 스키마의 tables_info/visjs_data/캐시를 짝지어 사용)
+        with self.data_lock:
+            tables_info = {name: info for name, info in self.tables_info.items() if name not in removed}
+            tables_info.update(added)
+            tables_info.update(changed)
+            visjs_data = self.visjs_data
+            if visjs_data is None:
+                self.swap_tables_info(tables_info)
+        if visjs_data is None:
+            self.reset_search_index()
+            return None
+        
+        affected = set(added) | set(changed) | removed
+        
+        graph, degrees = self.build_graph(tables_info)
+        table_sizes = {name: self.calculate_table_size(info, name) for name, info in tables_info.items()}
+        
+        positions = {name: dict(pos) for name, pos in visjs_data['initial_positions'].items() if name in tables_info}
+        new_tables = [name for name in tables_info if name not in positions]
+        positions = self.place_new_tables(positions, new_tables, graph, table_sizes, tables_info)
+        
+        # 연결이 생기거나 끊겨 고립 여부가 바뀐 이웃 테이블도 다시 그림
+        candidates = set()
+        for name in affected:
+            for edge in visjs_data['edges_by_table'].get(name, []):
+                candidates.update((edge['from'], edge['to']))
+            candidates.update(graph.get(name, ()))
+        isolated = set(visjs_data['isolated']) - removed
+        flipped = set()
+        for name in candidates - removed:
+            now_isolated = not (graph[name] - {name})
+            if now_isolated != (name in isolated):
+                flipped.add(name)
+                if now_isolated:
+                    isolated.add(name)
+                else:
+                    isolated.discard(name)
+        isolated.update(name for name in new_tables if not (graph[name] - {name}))
+        
+        rebuilt = {}
+        for name in (set(new_tables) | set(changed) | flipped):
+            pos = positions[name]
+            rebuilt[name] = self.build_node(name, pos['x'], pos['y'], table_sizes[name], name in isolated, tables_info)
+        
+        nodes = [rebuilt.get(node['id'], node) for node in visjs_data['nodes'] if node['id'] not in removed]
+        nodes.extend(rebuilt[name] for name in new_tables)
+        
+        # 바뀐/삭제된 테이블의 FK 간선은 지우고 새 정의로 다시 만든다
+        removed_edges = []
+        edges = []
+        for edge in visjs_data['edges']:
+            if edge['from'] in changed or edge['from'] in removed or edge['to'] in removed:
+                removed_edges.append(edge['id'])
+            else:
+                edges.append(edge)
+        added_edges = []
+        for name in sorted(set(changed) | set(new_tables)):
+            for fk in tables_info[name]['foreign_keys']:
+                if fk['referred_table'] in tables_info:
+                    added_edges.append(self.build_edge(self.next_edge_id, name, fk))
+                    self.next_edge_id += 1
+        # 그대로인 테이블도 새로 생긴 테이블을 참조하던 FK는 이제 간선을 그릴 수 있음
+        for name in sorted(set(tables_info) - set(changed) - set(new_tables)):
+            for fk in tables_info[name]['foreign_keys']:
+                if fk['referred_table'] in added:
+                    added_edges.append(self.build_edge(self.next_edge_id, name, fk))
+                    self.next_edge_id += 1
+        edges.extend(added_edges)
+        
+        fingerprint = LayoutStore.schema_fingerprint(tables_info)
+        with self.data_lock:
+            if self.closed or self.visjs_data is None:
+                return None
+            # 계산하는 동안 페이지에서 옮긴 좌표(update_positions)를 되돌리지 않도록 최신 좌표를 우선
+            latest = self.visjs_data['initial_positions']
+            initial_positions = {}
+            for name, pos in positions.items():
+                pos = latest.get(name, pos)
+                initial_positions[name] = {'x': pos['x'], 'y': pos['y']}
+            for name, node in rebuilt.items():
+                node['x'] = initial_positions[name]['x']
+                node['y'] = initial_positions[name]['y']
+            # 스키마 정보와 vis.js 데이터를 한 번에 바꿔 요청이 서로 다른 시점의 데이터를 짝짓지 않게 함
+            self.swap_tables_info(tables_info, fingerprint)
+            self.visjs_data = self.index_visjs_data(nodes, edges, initial_positions, isolated)
+            # 저장도 잠금 안에서 해야 이후의 좌표 병합(merge_positions)이 이 저장보다 먼저 끝나 덮이지 않음
+            if self.connection_key:
+                self.layout_store.save(self.connection_key, fingerprint, initial_positions)
+        self.reset_search_index()
+        
+        # 기존 노드는 페이지에서 옮긴 위치를 유지하도록 좌표를 빼고 보냄
+        updated_nodes = []
+        for name in sorted(set(changed) | flipped):
+            if name in new_tables:
+                continue
+            node = dict(rebuilt[name])
+            node.pop('x')
+            node.pop('y')
+            updated_nodes.append(node)
+        
+        payload = {
+            'addedNodes': [rebuilt[name] for name in new_tables],
+            'updatedNodes': updated_nodes,
+            'removedNodes': sorted(removed),
+            'addedEdges': added_edges,
+            'removedEdges': removed_edges
+        }
+        self.publish_event('schema', payload)
+        
+        if self.logger:
+            self.logger.info(
+                f"스키마 변경 반영: 추가 {len(new_tables)}, 변경 {len(updated_nodes)}, 삭제 {len(removed)}, "
+                f"간선 +{len(added_edges)}/-{len(removed_edges)}"
+            )
+        return payload
+    
+    def get_search_index(self):
+        with self.search_lock:
+            if self.search_index is None:
+                started = time.perf_counter()
+                self.search_index = SearchIndex(self.tables_info)
+                if self.logger:
+                    self.logger.info(f"검색 색인 생성: {len(self.tables_info)}개 테이블, {time.perf_counter() - started:.2f}초")
+            return self.search_index
+    
+    def export_svg(self, output_path):
+        """현재 좌표(저장된 좌표 포함)로 전체 다이어그램을 SVG로 저장"""
+        started = time.perf_counter()
+        scene = DiagramScene.from_editor(self)
+        write_svg(scene, output_path)
+        if self.logger:
+            self.logger.info(f"SVG 내보내기: {len(scene.tables)}개 테이블, {time.perf_counter() - started:.2f}초 ({output_path})")
+        return output_path
+    
+    def export_png(self, output_path, scale=1.0):
+        """현재 좌표로 전체 다이어그램을 PNG로 저장 (가로 띠 단위로 그려 메모리 사용 제한)"""
+        started = time.perf_counter()
+        scene = DiagramScene.from_editor(self)
+        write_png(scene, output_path, scale)
+        if self.logger:
+            self.logger.info(
+                f"PNG 내보내기: {len(scene.tables)}개 테이블, {scene.width * scale:.0f}x{scene.height * scale:.0f}px, "
+                f"{time.perf_counter() - started:.2f}초 ({output_path})"
+            )
+        return output_path
+    
+    def export_deep_zoom(self, output_dir, scale=1.0, name='er_diagram', progress=None):
+        """현재 좌표로 전체 다이어그램을 Deep Zoom 타일 디렉터리(.dzi + {name}_files)로 저장"""
+        started = time.perf_counter()
+        scene = DiagramScene.from_editor(self)
+        dzi_path = write_deep_zoom(scene, output_dir, name, scale, progress)
+        if self.logger:
+            self.logger.info(
+                f"딥 줌 내보내기: {len(scene.tables)}개 테이블, {scene.width * scale:.0f}x{scene.height * scale:.0f}px, "
+                f"{time.perf_counter() - started:.2f}초 ({dzi_path})"
+            )
+        return dzi_path
+    
+    def get_deep_zoom(self, refresh=False, scale=1.0):
+        """딥 줌 보기용 피라미드. 처음 요청, refresh, 배율 변경 시 현재 좌표로 새로 구성"""
+        with self.deep_zoom_lock:
+            current = self.deep_zoom
+            if current is None or refresh or current['pyramid'].scale != scale:
+                pyramid = DeepZoomPyramid(DiagramScene.from_editor(self), scale)
+                self.deep_zoom = {
+                    'token': uuid.uuid4().hex[:8],
+                    'pyramid': pyramid,
+                    'dir': _make_deep_zoom_dir()
+                }
+                if current is not None:
+                    _remove_deep_zoom_dir(current['dir'])
+                if self.logger:
+                    self.logger.info(f"딥 줌 보기 준비: {pyramid.width}x{pyramid.height}px, 레벨 {pyramid.max_level + 1}개")
+            return self.deep_zoom
+    
+    def deep_zoom_tile(self, token, level, col, row):
+        """타일 파일 경로 (없으면 그려서 저장). 토큰이 다르거나 범위를 벗어나거나 피라미드가 바뀌었으면 None"""
+        with self.deep_zoom_lock:
+            deep_zoom = self.deep_zoom
+        if self.closed or deep_zoom is None or deep_zoom['token'] != token:
+            return None
+        pyramid = deep_zoom['pyramid']
+        if level > pyramid.max_level:
+            return None
+        cols, rows = pyramid.tile_count(level)
+        if col >= cols or row >= rows:
+            return None
+        path = pyramid.tile_path(deep_zoom['dir'], level, col, row)
+        if os.path.exists(path):
+            return path
+        
+        # 그리기는 잠금 밖에서 하고, 폴더를 지우는 refresh/release와 겹치지 않도록 저장만 잠금 안에서
+        data = pyramid.tile_bytes(level, col, row)
+        with self.deep_zoom_lock:
+            if self.closed or self.deep_zoom is not deep_zoom:
+                return None
+            try:
+                return pyramid.save_tile(deep_zoom['dir'], level, col, row, data)
+            except FileNotFoundError:
+                return None
+    
+    def get_fk_graph(self):
+        return self.snapshot_fk_graph()[1]
+    
+    def snapshot_fk_graph(self):
+        """(tables_info, FK 그래프)를 같은 스키마 시점으로 반환
+        
+        스키마 변경 반영과 섞여 이전 스키마로 만든 캐시가 남지 않도록 data_lock 안에서 만든다
+        """
+        with self.data_lock:
+            if self.fk_graph is None:
+                self.fk_graph = build_fk_graph(self.tables_info)
+            return self.tables_info, self.fk_graph
+    
+    def build_focus_view(self, table_name, hops=2, direction='both', max_nodes=None):
+        """table_name에서 hops 단계 이내의 테이블만 새로 배치한 부분 다이어그램
+        
+        전체 레이아웃을 계산하지 않으므로 큰 스키마에서도 바로 응답
+        """
+        tables_info, (parents, children) = self.snapshot_fk_graph()
+        if table_name not in tables_info:
+            return None
+        if max_nodes is None:
+            max_nodes = self.focus_max_nodes
+        
+        distances, truncated = k_hop_neighborhood(table_name, parents, children, hops, direction, max_nodes)
+        
+        # 부분 그래프 안의 간선만으로 배치 (포커스 테이블이 중심, 참조 대상은 위쪽)
+        graph = {name: set() for name in distances}
+        referenced = set()
+        for name in distances:
+            for parent in parents[name]:
+                if parent in distances:
+                    graph[name].add(parent)
+                    graph[parent].add(name)
+                    referenced.add(parent)
+        
+        table_sizes = {name: self.calculate_table_size(tables_info[name], name) for name in distances}
+        names, payload = encode_component(distances, graph, table_sizes, referenced)
+        center_index, coords = layout_component(payload, center=names.index(table_name))
+        
+        nodes = []
+        for name, (x, y) in zip(names, coords):
+            node = self.build_node(name, x, y, table_sizes[name], not graph[name], tables_info)
+            node['hops'] = distances[name]
+            if name == table_name:
+                node['borderWidth'] = 4
+                node['color'] = dict(node['color'], border='#d32f2f')
+            nodes.append(node)
+        
+        edges = []
+        for name in names:
+            for fk in tables_info[name]['foreign_keys']:
+                if fk['referred_table'] in distances:
+                    edges.append(self.build_edge(len(edges), name, fk))
         
-        return {'nodes': nodes, 'edges': edges, 'initial_positions': initial_positions}
+        return {
+            'focus': table_name,
+            'hops': hops,
+            'direction': direction,
+            'truncated': truncated,
+            'nodes': nodes,
+            'edges': edges
+        }
+    
+    def snapshot_clusters(self, method):
+        """(vis.js 데이터, 묶음)을 같은 스키마 시점으로 반환 (묶음은 data_lock 안에서 만들어 보관)"""
+        with self.data_lock:
+            if self.visjs_data is None:
+                self.visjs_data = self.convert_to_visjs_format()
+            cluster_set = self.cluster_sets.get(method)
+            if cluster_set is None:
+                groups, isolated, graph, degrees = self.find_connected_groups()
+                cluster_set = build_clusters(method, self.tables_info, graph, degrees, groups, isolated)
+                self.cluster_sets[method] = cluster_set
+            return self.visjs_data, cluster_set
     
-    def create_html_file(self):
-        visjs_data = self.convert_to_visjs_format()
-        initial_positions = visjs_data.get('initial_positions', {})
+    def build_cluster_node(self, cluster, positions):
+        members = cluster['members']
+        center_x = sum(positions[name]['x'] for name in members) / len(members)
+        center_y = sum(positions[name]['y'] for name in members) / len(members)
+        # 멤버 수에 따라 완만하게 커지는 상자
+        width = min(600, self.min_table_width + 40 * math.sqrt(len(members)))
+        height = min(400, 60 + 20 * math.sqrt(len(members)))
         
-        initial_positions_json = json.dumps(initial_positions, ensure_ascii=False)
+        header_style = "font-weight:bold;font-size:11px;padding:4px 2px;background:#1976d2;color:white;text-align:center;"
+        label = (
+            f"<div style='{header_style}'>{cluster['label']}</div>"
+            f"<div style='font-size:9px;padding:2px 4px;'>테이블 {len(members)}개</div>"
+        )
+        return {
+            'id': CLUSTER_NODE_PREFIX + cluster['id'],
+            'clusterId': cluster['id'],
+            'size': len(members),
+            'label': label,
+            'x': center_x,
+            'y': center_y,
+            'shape': 'box',
+            'color': {
+                'background': '#e3f2fd',
+                'border': '#1976d2',
+                'highlight': {
+                    'background': '#bbdefb',
+                    'border': '#1565c0'
+                }
+            },
+            'font': {
+                'face': 'Arial',
+                'size': 10,
+                'multi': 'html',
+                'align': 'center'
+            },
+            'widthConstraint': {
+                'minimum': width,
+                'maximum': width
+            },
+            'heightConstraint': {
+                'minimum': height,
+                'valign': 'middle'
+            },
+            'borderWidth': 3,
+            'borderWidthSelected': 4
+        }
+    
+    def build_cluster_view(self, method):
+        """묶음 노드와 묶음 간 FK 개수를 가중치로 한 간선"""
+        visjs_data, cluster_set = self.snapshot_clusters(method)
+        positions = visjs_data['initial_positions']
         
-        # HTML이 제대로 렌더링되도록 노드 데이터 처리
-        nodes_data = []
-        for node in visjs_data['nodes']:
-            node_copy = node.copy()
-            # label은 이미 HTML 형식이므로 그대로 사용
-            nodes_data.append(node_copy)
+        nodes = [self.build_cluster_node(cluster, positions) for cluster in cluster_set.clusters]
+        edges = []
+        for (source, target), weight in sorted(cluster_set.edge_weights.items(), key=lambda item: (int(item[0][0]), int(item[0][1]))):
+            edges.append({
+                'from': source,
+                'to': target,
+                'weight': weight
+            })
         
-        edges_data = visjs_data['edges']
+        return {'method': method, 'tables': len(positions), 'nodes': nodes, 'edges': edges}
+    
+    def build_cluster_members(self, method, cluster_id):
+        """펼친 묶음의 테이블 노드와 멤버에 연결된 FK 간선 (간선 양끝의 묶음 ID 포함)"""
+        visjs_data, cluster_set = self.snapshot_clusters(method)
+        cluster = cluster_set.get(cluster_id)
+        if cluster is None:
+            return None
         
-        nodes_json = json.dumps(nodes_data, ensure_ascii=False)
-        edges_json = json.dumps(edges_data, ensure_ascii=False)
+        nodes = [visjs_data['node_index'][name] for name in cluster['members']]
+        
+        edges = []
+        seen = set()
+        for name in cluster['members']:
+            for edge in visjs_data['edges_by_table'].get(name, []):
+                if edge['id'] in seen:
+                    continue
+                seen.add(edge['id'])
+                edge = dict(edge)
+                edge['fromCluster'] = cluster_set.cluster_of[edge['from']]
+                edge['toCluster'] = cluster_set.cluster_of[edge['to']]
+                edges.append(edge)
+        
+        return {'id': cluster['id'], 'nodes': nodes, 'edges': edges}
+    
+    def get_visjs_data(self):
+        """vis.js 데이터는 한 번만 계산하고 API 요청마다 재사용"""
+        with self.data_lock:
+            if self.visjs_data is None:
+                self.visjs_data = self.convert_to_visjs_format()
+            return self.visjs_data
+    
+    def build_html(self, script_src=None, inline=False):
+        if script_src is None:
+            script_src = VIS_NETWORK_ROUTE
+        
+        # 서버 없이 파일로 열 때만 데이터를 페이지에 직접 넣는다
+        inline_script = ""
+        if inline:
+            visjs_data = self.get_visjs_data()
+            inline_data = {
+                'nodes': visjs_data['nodes'],
+                'edges': visjs_data['edges'],
+                'details': self.build_detail_labels(self.tables_info)
+            }
+            inline_json = json.dumps(inline_data, ensure_ascii=False).replace('</', '<\\/')
+            inline_script = f"<script type=\"text/javascript\">var ERD_INLINE_DATA = {inline_json};</script>"
         
         html_content = f"""<!DOCTYPE html>
 <html lang="ko">
@@ -516,7 +1755,7 @@ class ERDiagramWebEditor:
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>ER 다이어그램 편집기</title>
-    <script type="text/javascript" src="https://unpkg.com/vis-network/standalone/umd/vis-network.min.js"></script>
+    <script type="text/javascript" src="{script_src}"></script>
     <style>
         body {{
             margin: 0;
@@ -549,6 +1788,37 @@ class ERDiagramWebEditor:
             height: calc(100vh - 60px);
             background: white;
         }}
+        #searchBox {{
+            padding: 6px 8px;
+            border: 1px solid #ccc;
+            border-radius: 4px;
+            width: 200px;
+        }}
+        #searchResults {{
+            display: none;
+            position: absolute;
+            top: 50px;
+            z-index: 10;
+            background: white;
+            border: 1px solid #ccc;
+            box-shadow: 0 2px 6px rgba(0,0,0,0.2);
+            max-height: 400px;
+            overflow-y: auto;
+            width: 360px;
+            font-size: 12px;
+        }}
+        #searchResults div {{
+            padding: 6px 10px;
+            cursor: pointer;
+            border-bottom: 1px solid #eee;
+        }}
+        #searchResults div:hover {{
+            background: #e3f2fd;
+        }}
+        #searchResults .columns {{
+            color: #666;
+            font-size: 11px;
+        }}
         .info {{
             margin-left: auto;
             color: #666;
@@ -565,21 +1835,73 @@ class ERDiagramWebEditor:
 </head>
 <body>
     <div id="toolbar">
-        <button onclick="saveImage()">이미지 저장</button>
+        <button onclick="saveImage('png')">이미지 저장</button>
+        <button onclick="saveImage('svg')">SVG 저장</button>
+        <button onclick="openDeepZoom()">딥 줌 보기</button>
         <button onclick="autoLayout()">자동 배치</button>
         <button onclick="resetLayout()">초기화</button>
         <button onclick="exportJSON()">JSON 내보내기</button>
         <button onclick="importJSON()">JSON 가져오기</button>
-        <div class="info">테이블을 드래그하여 이동할 수 있습니다. 마우스 휠로 확대/축소 가능합니다.</div>
+        <select id="clusterMode" onchange="changeClusterMode(this.value)">
+            <option value="none">묶지 않음</option>
+            <option value="component">연결 그룹별 묶기</option>
+            <option value="prefix">접두어별 묶기</option>
+            <option value="community">커뮤니티별 묶기</option>
+        </select>
+        <select id="focusHops">
+            <option value="1">1단계</option>
+            <option value="2" selected>2단계</option>
+            <option value="3">3단계</option>
+        </select>
+        <select id="focusDirection">
+            <option value="both">부모/자식</option>
+            <option value="parents">부모만</option>
+            <option value="children">자식만</option>
+        </select>
+        <button onclick="focusSelected()">선택 테이블 포커스</button>
+        <button onclick="showAll()">전체 보기</button>
+        <input id="searchBox" type="search" placeholder="테이블/컬럼 검색">
+        <div class="info" id="info">테이블을 드래그하여 이동할 수 있습니다. 마우스 휠로 확대/축소 가능합니다.</div>
     </div>
+    <div id="searchResults"></div>
     <div id="mynetwork"></div>
-    
+    {inline_script}
     <script type="text/javascript">
-        var nodesData = {nodes_json};
-        var edgesData = {edges_json};
+        var CHUNK_SIZE = 500;
+        var DETAIL_BATCH = 100;
+        // 확대 비율에 따른 라벨 상세 단계 경계
+        var LOD_NAME_SCALE = 0.35;
+        var LOD_KEYS_SCALE = 0.8;
+        var LARGE_SCHEMA = 1000;
+        // 이보다 테이블이 많으면 처음부터 묶음 노드로 표시
+        var CLUSTER_THRESHOLD = 2000;
+        var CLUSTER_PREFIX = '{CLUSTER_NODE_PREFIX}';
+        var diagramId = location.pathname.split('/')[2];
+        var apiBase = '/api/diagram/' + diagramId;
+        
+        var nodes = new vis.DataSet();
+        var edges = new vis.DataSet();
+        var initialPositions = {{}};
+        var fullLabels = window.ERD_INLINE_DATA ? ERD_INLINE_DATA.details : {{}};
+        var pendingDetails = {{}};
+        var nodeLevel = {{}};
+        var currentLod = null;
+        var lodTimer = null;
         
-        var nodes = new vis.DataSet(nodesData);
-        var edges = new vis.DataSet(edgesData);
+        var pageParams = new URLSearchParams(location.search);
+        var clusterMode = pageParams.get('cluster');
+        var focusTable = pageParams.get('focus');
+        
+        var lastEventId = 0;
+        
+        var SAVE_DELAY = 1000;
+        var pendingPositions = {{}};
+        var saveTimer = null;
+        var clusterNodes = {{}};
+        var clusterEdges = [];
+        var expandedClusters = {{}};
+        var loadingClusters = {{}};
+        var memberCluster = {{}};
         
         var container = document.getElementById('mynetwork');
         var data = {{
@@ -654,20 +1976,537 @@ class ERDiagramWebEditor:
         }};
         
         var network = new vis.Network(container, data, options);
+        var infoText = document.getElementById('info').textContent;
+        
+        function setStatus(text) {{
+            document.getElementById('info').textContent = text || infoText;
+        }}
+        
+        function addNodes(items) {{
+            for (var i = 0; i < items.length; i++) {{
+                initialPositions[items[i].id] = {{x: items[i].x, y: items[i].y}};
+            }}
+            nodes.add(items);
+        }}
+        
+        function lodForScale(scale) {{
+            if (scale < LOD_NAME_SCALE) return 'name';
+            if (scale < LOD_KEYS_SCALE) return 'keys';
+            return 'full';
+        }}
+        
+        function visibleNodeIds() {{
+            var scale = network.getScale();
+            var center = network.getViewPosition();
+            var halfWidth = container.clientWidth / 2 / scale + 300;
+            var halfHeight = container.clientHeight / 2 / scale + 300;
+            var positions = network.getPositions();
+            var ids = [];
+            for (var id in positions) {{
+                var pos = positions[id];
+                if (Math.abs(pos.x - center.x) < halfWidth && Math.abs(pos.y - center.y) < halfHeight) {{
+                    ids.push(id);
+                }}
+            }}
+            return ids;
+        }}
+        
+        function scheduleLod() {{
+            if (lodTimer) clearTimeout(lodTimer);
+            lodTimer = setTimeout(updateLod, 120);
+        }}
+        
+        // 화면에 보이는 노드와 선택된 노드만 상세 라벨로 바꾸고, 벗어난 노드는 이름 라벨로 되돌림
+        // (상세 라벨 수가 화면 크기로 제한되어 스키마가 커져도 프레임당 그리기 비용이 일정)
+        function updateLod() {{
+            lodTimer = null;
+            var level = lodForScale(network.getScale());
+            if (level !== currentLod) {{
+                network.setOptions({{nodes: {{shadow: {{enabled: level !== 'name'}}}}}});
+                currentLod = level;
+            }}
+            
+            var wanted = {{}};
+            if (level !== 'name') {{
+                visibleNodeIds().forEach(function(id) {{ wanted[id] = level; }});
+            }}
+            network.getSelectedNodes().forEach(function(id) {{ wanted[id] = 'full'; }});
+            for (var id in nodeLevel) {{
+                if (!(id in wanted)) wanted[id] = 'name';
+            }}
+            
+            var updates = [];
+            var missing = [];
+            for (var id in wanted) {{
+                if (id.indexOf(CLUSTER_PREFIX) === 0) continue;
+                var target = wanted[id];
+                if (target === 'full' && !(id in fullLabels)) {{
+                    if (!pendingDetails[id]) missing.push(id);
+                    target = 'keys';
+                }}
+                if ((nodeLevel[id] || 'name') === target) continue;
+                var node = nodes.get(id);
+                if (!node) continue;
+                var label = target === 'full' ? fullLabels[id] : (target === 'keys' ? node.keysLabel : node.nameLabel);
+                updates.push({{id: id, label: label}});
+                if (target === 'name') {{
+                    delete nodeLevel[id];
+                }} else {{
+                    nodeLevel[id] = target;
+                }}
+            }}
+            if (updates.length > 0) nodes.update(updates);
+            
+            for (var i = 0; i < missing.length; i += DETAIL_BATCH) {{
+                loadDetails(missing.slice(i, i + DETAIL_BATCH));
+            }}
+        }}
+        
+        function loadDetails(ids) {{
+            if (window.ERD_INLINE_DATA) return;
+            ids.forEach(function(id) {{ pendingDetails[id] = true; }});
+            var query = ids.map(function(id) {{ return 'name=' + encodeURIComponent(id); }}).join('&');
+            fetch(apiBase + '/details?' + query)
+                .then(function(response) {{ return response.json(); }})
+                .then(function(data) {{
+                    for (var id in data.items) {{
+                        fullLabels[id] = data.items[id];
+                    }}
+                    ids.forEach(function(id) {{ delete pendingDetails[id]; }});
+                    scheduleLod();
+                }})
+                .catch(function(error) {{
+                    ids.forEach(function(id) {{ delete pendingDetails[id]; }});
+                    setStatus('컬럼 정보 불러오기 실패: ' + error);
+                }});
+        }}
         
-        network.fit({{
-            animation: {{
-                duration: 500,
-                easingFunction: 'easeInOutQuad'
+        // 노드/간선을 조각 단위로 받아 바로 추가하여 큰 스키마도 먼저 보이는 것부터 표시
+        function loadChunks(kind, offset, onDone) {{
+            fetch(apiBase + '/' + kind + '?offset=' + offset + '&limit=' + CHUNK_SIZE)
+                .then(function(response) {{ return response.json(); }})
+                .then(function(data) {{
+                    if (kind === 'nodes') {{
+                        addNodes(data.items);
+                        if (offset === 0) network.fit();
+                    }} else {{
+                        edges.add(data.items);
+                    }}
+                    var loaded = offset + data.items.length;
+                    setStatus((kind === 'nodes' ? '테이블' : '관계') + ' 불러오는 중... ' + loaded + ' / ' + data.total);
+                    if (data.items.length > 0 && loaded < data.total) {{
+                        setTimeout(function() {{ loadChunks(kind, loaded, onDone); }}, 0);
+                    }} else {{
+                        onDone();
+                    }}
+                }})
+                .catch(function(error) {{
+                    setStatus('데이터 불러오기 실패: ' + error);
+                }});
+        }}
+        
+        function onLoaded() {{
+            setStatus();
+            if (nodes.length > LARGE_SCHEMA) {{
+                network.setOptions({{interaction: {{hideEdgesOnDrag: true, hideEdgesOnZoom: true}}}});
+            }}
+            network.fit({{
+                animation: {{
+                    duration: 500,
+                    easingFunction: 'easeInOutQuad'
+                }}
+            }});
+        }}
+        
+        // 옮긴 좌표를 모아 두었다가 마지막 변경 후 잠시 뒤 한 번에 서버에 저장
+        // (포커스 보기는 부분 그래프만의 로컬 좌표이므로 저장하지 않음)
+        function queuePositions(ids) {{
+            if (window.ERD_INLINE_DATA || focusTable) return;
+            ids = ids.filter(function(id) {{ return id.indexOf(CLUSTER_PREFIX) !== 0; }});
+            if (ids.length === 0) return;
+            var positions = network.getPositions(ids);
+            for (var id in positions) {{
+                pendingPositions[id] = positions[id];
+            }}
+            if (saveTimer) clearTimeout(saveTimer);
+            saveTimer = setTimeout(flushPositions, SAVE_DELAY);
+        }}
+        
+        function flushPositions(keepalive) {{
+            if (saveTimer) {{
+                clearTimeout(saveTimer);
+                saveTimer = null;
+            }}
+            var batch = pendingPositions;
+            if (Object.keys(batch).length === 0) return Promise.resolve();
+            pendingPositions = {{}};
+            return fetch(apiBase + '/positions', {{
+                method: 'PUT',
+                headers: {{'Content-Type': 'application/json'}},
+                body: JSON.stringify({{positions: batch}}),
+                keepalive: keepalive === true
+            }})
+                .then(function(response) {{
+                    if (!response.ok) throw response.status;
+                }})
+                .catch(function(error) {{
+                    // 실패한 좌표는 다음 저장에 다시 포함 (그 사이 다시 옮긴 좌표가 우선)
+                    for (var id in batch) {{
+                        if (!(id in pendingPositions)) pendingPositions[id] = batch[id];
+                    }}
+                    setStatus('좌표 저장 실패: ' + error);
+                    if (!saveTimer) saveTimer = setTimeout(flushPositions, SAVE_DELAY * 5);
+                }});
+        }}
+        
+        // 탭을 닫거나 숨길 때 남은 좌표를 바로 전송
+        document.addEventListener('visibilitychange', function() {{
+            if (document.visibilityState === 'hidden') flushPositions(true);
+        }});
+        window.addEventListener('pagehide', function() {{
+            flushPositions(true);
+        }});
+        
+        // 로컬 서버가 DB 스키마 변경을 감지하면 바뀐 노드/간선만 받아 제자리에서 반영
+        function connectEvents() {{
+            if (!window.EventSource) return;
+            var source = new EventSource(apiBase + '/events?since=' + lastEventId);
+            source.addEventListener('schema', function(e) {{
+                applySchemaDelta(JSON.parse(e.data));
+            }});
+            source.addEventListener('reload', function() {{
+                setStatus('스키마가 변경되었습니다. 새로 고침하면 반영됩니다.');
+            }});
+        }}
+        
+        function applySchemaDelta(delta) {{
+            if (clusterMode !== 'none') {{
+                setStatus('스키마가 변경되었습니다. 새로 고침하면 반영됩니다.');
+                return;
+            }}
+            edges.remove(delta.removedEdges);
+            nodes.remove(delta.removedNodes);
+            delta.removedNodes.forEach(function(id) {{
+                delete nodeLevel[id];
+                delete fullLabels[id];
+                delete initialPositions[id];
+                delete pendingPositions[id];
+            }});
+            // 기존 노드는 좌표 없이 갱신하여 현재 위치 유지, 라벨은 확대 단계에 맞춰 다시 정함
+            delta.updatedNodes.forEach(function(node) {{
+                delete nodeLevel[node.id];
+                delete fullLabels[node.id];
+                node.label = node.nameLabel;
+            }});
+            nodes.update(delta.updatedNodes);
+            delta.addedNodes.forEach(function(node) {{
+                initialPositions[node.id] = {{x: node.x, y: node.y}};
+            }});
+            nodes.update(delta.addedNodes);
+            edges.update(delta.addedEdges);
+            setStatus('스키마 변경 반영: 추가 ' + delta.addedNodes.length + ', 변경 ' + delta.updatedNodes.length + ', 삭제 ' + delta.removedNodes.length);
+            setTimeout(function() {{ setStatus(); }}, 5000);
+            scheduleLod();
+        }}
+        
+        var searchTimer = null;
+        
+        // 서버 색인으로 검색하여 일치하는 테이블을 선택(강조)하고 첫 결과로 이동
+        function runSearch() {{
+            var query = document.getElementById('searchBox').value.trim();
+            var panel = document.getElementById('searchResults');
+            if (!query) {{
+                panel.style.display = 'none';
+                return;
+            }}
+            fetch('/api/search?' + new URLSearchParams({{q: query, diagram: diagramId, limit: 50}}).toString())
+                .then(function(response) {{ return response.json(); }})
+                .then(function(data) {{
+                    if (data.error) throw data.error;
+                    showSearchResults(data);
+                }})
+                .catch(function(error) {{
+                    setStatus('검색 실패: ' + error);
+                }});
+        }}
+        
+        function showSearchResults(data) {{
+            var panel = document.getElementById('searchResults');
+            panel.innerHTML = '';
+            var header = document.createElement('div');
+            header.textContent = '검색 결과 ' + data.total + '개 (' + data.tookMs + 'ms)';
+            panel.appendChild(header);
+            data.results.forEach(function(result) {{
+                var item = document.createElement('div');
+                item.textContent = result.table;
+                if (result.columns.length > 0) {{
+                    var columns = document.createElement('span');
+                    columns.className = 'columns';
+                    columns.textContent = ' - ' + result.columns.join(', ');
+                    item.appendChild(columns);
+                }}
+                item.onclick = function() {{ focusTableNode(result.table); }};
+                panel.appendChild(item);
+            }});
+            panel.style.display = 'block';
+            
+            var visible = data.results.map(function(result) {{ return result.table; }}).filter(function(id) {{
+                return nodes.get(id) !== null;
+            }});
+            network.selectNodes(visible);
+            if (visible.length > 0) focusTableNode(visible[0]);
+            scheduleLod();
+        }}
+        
+        function focusTableNode(tableName) {{
+            if (nodes.get(tableName) === null) {{
+                // 접힌 묶음 안이나 포커스 보기 밖의 테이블은 해당 테이블의 포커스 보기로 이동
+                location.search = '?' + new URLSearchParams({{focus: tableName, hops: 1}}).toString();
+                return;
             }}
+            network.focus(tableName, {{
+                scale: Math.max(network.getScale(), LOD_KEYS_SCALE),
+                animation: {{
+                    duration: 500,
+                    easingFunction: 'easeInOutQuad'
+                }}
+            }});
+        }}
+        
+        document.getElementById('searchBox').addEventListener('input', function() {{
+            if (searchTimer) clearTimeout(searchTimer);
+            searchTimer = setTimeout(runSearch, 200);
         }});
+        document.getElementById('searchBox').addEventListener('keydown', function(e) {{
+            if (e.key === 'Enter') {{
+                if (searchTimer) clearTimeout(searchTimer);
+                runSearch();
+            }} else if (e.key === 'Escape') {{
+                document.getElementById('searchResults').style.display = 'none';
+            }}
+        }});
+        
+        function changeClusterMode(mode) {{
+            location.search = '?cluster=' + mode;
+        }}
+        
+        function clusterNodeId(clusterId) {{
+            return CLUSTER_PREFIX + clusterId;
+        }}
+        
+        // 큰 스키마는 서버에서 묶은 노드만 먼저 받고, 펼친 묶음의 테이블만 추가로 요청
+        function loadClusters() {{
+            setStatus('묶음 불러오는 중...');
+            fetch(apiBase + '/clusters?by=' + clusterMode)
+                .then(function(response) {{ return response.json(); }})
+                .then(function(data) {{
+                    if (data.error) throw data.error;
+                    data.nodes.forEach(function(node) {{ clusterNodes[node.clusterId] = node; }});
+                    clusterEdges = data.edges;
+                    addNodes(data.nodes);
+                    rebuildClusterEdges();
+                    infoText = '테이블 ' + data.tables + '개 / 묶음 ' + data.nodes.length + '개 - 묶음을 클릭하면 펼치고, 펼친 테이블을 더블클릭하면 접습니다.';
+                    onLoaded();
+                }})
+                .catch(function(error) {{
+                    setStatus('묶음 불러오기 실패: ' + error);
+                }});
+        }}
+        
+        function aggregateEdge(from, to, weight, directed) {{
+            return {{
+                id: 'agg:' + from + '|' + to,
+                from: from,
+                to: to,
+                label: String(weight),
+                width: Math.min(1 + Math.log(weight) / Math.LN2, 8),
+                arrows: {{to: {{enabled: directed}}}},
+                dashes: !directed
+            }};
+        }}
+        
+        // 펼친 묶음은 실제 테이블 간선을, 접힌 묶음 쪽은 묶음 노드로 모은 간선을 표시
+        function rebuildClusterEdges() {{
+            var items = [];
+            var aggregated = {{}};
+            clusterEdges.forEach(function(edge) {{
+                if (!expandedClusters[edge.from] && !expandedClusters[edge.to]) {{
+                    items.push(aggregateEdge(clusterNodeId(edge.from), clusterNodeId(edge.to), edge.weight, false));
+                }}
+            }});
+            var seen = {{}};
+            for (var clusterId in expandedClusters) {{
+                expandedClusters[clusterId].forEach(function(edge) {{
+                    if (seen[edge.id]) return;
+                    seen[edge.id] = true;
+                    var from = expandedClusters[edge.fromCluster] ? edge.from : clusterNodeId(edge.fromCluster);
+                    var to = expandedClusters[edge.toCluster] ? edge.to : clusterNodeId(edge.toCluster);
+                    if (from === edge.from && to === edge.to) {{
+                        items.push(edge);
+                        return;
+                    }}
+                    var key = from + '|' + to;
+                    if (!aggregated[key]) aggregated[key] = {{from: from, to: to, weight: 0}};
+                    aggregated[key].weight += 1;
+                }});
+            }}
+            for (var key in aggregated) {{
+                var entry = aggregated[key];
+                items.push(aggregateEdge(entry.from, entry.to, entry.weight, true));
+            }}
+            edges.clear();
+            edges.add(items);
+        }}
+        
+        function expandCluster(clusterId) {{
+            if (expandedClusters[clusterId] || loadingClusters[clusterId]) return;
+            loadingClusters[clusterId] = true;
+            setStatus('묶음 펼치는 중...');
+            fetch(apiBase + '/clusters/' + clusterId + '?by=' + clusterMode)
+                .then(function(response) {{ return response.json(); }})
+                .then(function(data) {{
+                    delete loadingClusters[clusterId];
+                    if (data.error) throw data.error;
+                    data.nodes.forEach(function(node) {{ memberCluster[node.id] = clusterId; }});
+                    expandedClusters[clusterId] = data.edges;
+                    nodes.remove(clusterNodeId(clusterId));
+                    addNodes(data.nodes);
+                    rebuildClusterEdges();
+                    setStatus();
+                    scheduleLod();
+                }})
+                .catch(function(error) {{
+                    delete loadingClusters[clusterId];
+                    setStatus('묶음 펼치기 실패: ' + error);
+                }});
+        }}
+        
+        function collapseCluster(clusterId) {{
+            if (!expandedClusters[clusterId]) return;
+            var memberIds = [];
+            for (var id in memberCluster) {{
+                if (memberCluster[id] === clusterId) memberIds.push(id);
+            }}
+            memberIds.forEach(function(id) {{
+                delete memberCluster[id];
+                delete nodeLevel[id];
+                delete initialPositions[id];
+            }});
+            nodes.remove(memberIds);
+            delete expandedClusters[clusterId];
+            nodes.add(clusterNodes[clusterId]);
+            rebuildClusterEdges();
+        }}
+        
+        // 선택한 테이블에서 FK로 몇 단계 이내인 테이블만 서버에서 새로 배치하여 표시
+        function loadFocus() {{
+            var query = new URLSearchParams({{
+                table: focusTable,
+                hops: pageParams.get('hops') || '2',
+                direction: pageParams.get('direction') || 'both'
+            }});
+            setStatus('포커스 보기 불러오는 중...');
+            fetch(apiBase + '/focus?' + query.toString())
+                .then(function(response) {{ return response.json(); }})
+                .then(function(data) {{
+                    if (data.error) throw data.error;
+                    addNodes(data.nodes);
+                    edges.add(data.edges);
+                    infoText = data.focus + ' 기준 ' + data.hops + '단계: 테이블 ' + data.nodes.length + '개' + (data.truncated ? ' (일부만 표시)' : '');
+                    network.selectNodes([data.focus]);
+                    onLoaded();
+                }})
+                .catch(function(error) {{
+                    setStatus('포커스 보기 불러오기 실패: ' + error);
+                }});
+        }}
+        
+        function focusSelected() {{
+            var selected = network.getSelectedNodes().filter(function(id) {{
+                return id.indexOf(CLUSTER_PREFIX) !== 0;
+            }});
+            if (selected.length === 0) {{
+                alert('포커스할 테이블을 선택하세요.');
+                return;
+            }}
+            location.search = '?' + new URLSearchParams({{
+                focus: selected[0],
+                hops: document.getElementById('focusHops').value,
+                direction: document.getElementById('focusDirection').value
+            }}).toString();
+        }}
+        
+        function showAll() {{
+            location.search = '';
+        }}
         
-        function saveImage() {{
-            var dataURL = network.getCanvas().toDataURL('image/png');
+        if (window.ERD_INLINE_DATA) {{
+            ['clusterMode', 'focusHops', 'focusDirection', 'searchBox'].forEach(function(id) {{
+                document.getElementById(id).style.display = 'none';
+            }});
+            addNodes(ERD_INLINE_DATA.nodes);
+            edges.add(ERD_INLINE_DATA.edges);
+            onLoaded();
+        }} else if (focusTable) {{
+            if (pageParams.get('hops')) document.getElementById('focusHops').value = pageParams.get('hops');
+            if (pageParams.get('direction')) document.getElementById('focusDirection').value = pageParams.get('direction');
+            document.getElementById('clusterMode').style.display = 'none';
+            loadFocus();
+        }} else {{
+            fetch(apiBase + '/meta')
+                .then(function(response) {{ return response.json(); }})
+                .then(function(meta) {{
+                    if (!clusterMode) clusterMode = meta.tables > CLUSTER_THRESHOLD ? 'component' : 'none';
+                    lastEventId = meta.eventId;
+                    connectEvents();
+                    document.getElementById('clusterMode').value = clusterMode;
+                    if (clusterMode !== 'none') {{
+                        loadClusters();
+                    }} else {{
+                        loadChunks('nodes', 0, function() {{
+                            loadChunks('edges', 0, onLoaded);
+                        }});
+                    }}
+                }})
+                .catch(function(error) {{
+                    setStatus('데이터 불러오기 실패: ' + error);
+                }});
+        }}
+        
+        // 서버가 전체 다이어그램을 그려 내려줌 (화면 캔버스 크기에 묶이지 않음)
+        // 독립 HTML 파일과 포커스 보기는 서버 좌표와 다르므로 화면 캔버스를 저장
+        function saveImage(format) {{
+            format = format || 'png';
             var link = document.createElement('a');
-            link.download = 'er_diagram.png';
-            link.href = dataURL;
-            link.click();
+            link.download = 'er_diagram.' + format;
+            if (window.ERD_INLINE_DATA || focusTable) {{
+                if (format !== 'png') {{
+                    setStatus('SVG 저장은 서버에 연결된 전체 보기에서만 지원합니다.');
+                    return;
+                }}
+                link.href = network.getCanvas().toDataURL('image/png');
+                link.click();
+                return;
+            }}
+            // 옮긴 좌표를 먼저 저장해야 내보낸 그림에 반영됨
+            setStatus('이미지 생성 중...');
+            flushPositions().then(function() {{
+                link.href = apiBase + '/export.' + format;
+                link.click();
+                setStatus('');
+            }});
+        }}
+        
+        // 큰 다이어그램을 타일로 나누어 서버에서 그린 정적 보기 (새 탭)
+        function openDeepZoom() {{
+            if (window.ERD_INLINE_DATA || focusTable) {{
+                setStatus('딥 줌 보기는 서버에 연결된 전체 보기에서만 지원합니다.');
+                return;
+            }}
+            var view = window.open('', '_blank');
+            flushPositions().then(function() {{
+                view.location = '/diagram/' + diagramId + '/deepzoom/?refresh=1';
+            }});
         }}
         
         function autoLayout() {{
@@ -693,6 +2532,7 @@ class ERDiagramWebEditor:
             var stabilizationTimeout = setTimeout(function() {{
                 network.setOptions({{physics: false}});
                 clearTimeout(stabilizationTimeout);
+                queuePositions(nodes.getIds());
             }}, 15000);
             
             network.once("stabilizationEnd", function() {{
@@ -710,12 +2550,12 @@ class ERDiagramWebEditor:
         }}
         
         function resetLayout() {{
-            var initialPositions = {initial_positions_json};
             network.setOptions({{
                 physics: false
             }});
             var updates = [];
             for (var id in initialPositions) {{
+                if (!nodes.get(id)) continue;
                 updates.push({{
                     id: id,
                     x: initialPositions[id].x,
@@ -724,6 +2564,7 @@ class ERDiagramWebEditor:
                 }});
             }}
             nodes.update(updates);
+            queuePositions(updates.map(function(update) {{ return update.id; }}));
             network.fit({{
                 animation: {{
                     duration: 500,
@@ -755,7 +2596,11 @@ class ERDiagramWebEditor:
                 var reader = new FileReader();
                 reader.onload = function(e) {{
                     var data = JSON.parse(e.target.result);
-                    if (data.nodes) nodes.update(data.nodes);
+                    if (data.nodes) {{
+                        // 라벨은 현재 확대 단계에 맞춰 다시 정함
+                        data.nodes.forEach(function(node) {{ delete node.label; }});
+                        nodes.update(data.nodes);
+                    }}
                     if (data.edges) edges.update(data.edges);
                     if (data.positions) {{
                         network.setOptions({{physics: false}});
@@ -770,17 +2615,34 @@ class ERDiagramWebEditor:
         network.on("click", function(params) {{
             if (params.nodes.length > 0) {{
                 var nodeId = params.nodes[0];
+                if (nodeId.indexOf(CLUSTER_PREFIX) === 0) {{
+                    expandCluster(nodeId.substring(CLUSTER_PREFIX.length));
+                    return;
+                }}
                 var node = nodes.get(nodeId);
                 console.log("선택된 테이블:", nodeId);
             }}
         }});
         
+        network.on("doubleClick", function(params) {{
+            if (params.nodes.length > 0 && memberCluster[params.nodes[0]] !== undefined) {{
+                collapseCluster(memberCluster[params.nodes[0]]);
+            }}
+        }});
+        
         network.on("dragEnd", function(params) {{
             if (params.nodes.length > 0) {{
                 network.setOptions({{physics: false}});
+                queuePositions(params.nodes);
             }}
+            scheduleLod();
         }});
         
+        network.on("zoom", scheduleLod);
+        network.on("animationFinished", scheduleLod);
+        network.on("selectNode", scheduleLod);
+        network.on("deselectNode", scheduleLod);
+        
         var isStabilizing = false;
         network.on("stabilizationProgress", function(params) {{
             if (!isStabilizing) {{
@@ -791,11 +2653,17 @@ class ERDiagramWebEditor:
         network.on("stabilizationEnd", function() {{
             isStabilizing = false;
             network.setOptions({{physics: false}});
+            queuePositions(nodes.getIds());
         }});
     </script>
 </body>
 </html>"""
         
+        return html_content
+    
+    def create_html_file(self, script_src=None):
+        html_content = self.build_html(script_src, inline=True)
+        
         temp_dir = tempfile.gettempdir()
         html_file = os.path.join(temp_dir, f"er_diagram_editor_{os.getpid()}.html")
         
@@ -805,41 +2673,46 @@ class ERDiagramWebEditor:
         return html_file
     
     def start_server(self):
-        class Handler(http.server.SimpleHTTPRequestHandler):
-            def __init__(self, *args, **kwargs):
-                super().__init__(*args, directory=tempfile.gettempdir(), **kwargs)
-            
-            def log_message(self, format, *args):
-                if self.server.logger:
-                    self.server.logger.debug(f"HTTP: {format % args}")
-        
-        Handler.logger = self.logger
-        
         try:
-            self.httpd = socketserver.TCPServer(("", self.port), Handler)
-            self.httpd.logger = self.logger
-            self.server_thread = threading.Thread(target=self.httpd.serve_forever)
-            self.server_thread.daemon = True
-            self.server_thread.start()
-            
-            if self.logger:
-                self.logger.info(f"웹 서버 시작: 포트 {self.port}")
-            
-            time.sleep(0.5)
+            self.httpd = get_server(self.logger, self.port)
+            self.port = self.httpd.server_port
+            self.server_thread = self.httpd.thread
+            self.httpd.publish_file(
+                VIS_NETWORK_ROUTE, get_vis_network_path(),
+                'application/javascript; charset=utf-8', CACHE_IMMUTABLE
+            )
+            register_api_routes(self.httpd, self)
             return True
         except Exception as e:
             if self.logger:
                 self.logger.error(f"웹 서버 시작 실패: {str(e)}")
             return False
     
-    def open_in_browser(self):
-        html_file = self.create_html_file()
-        
+    def get_editor_path(self):
+        return f"/diagram/{self.diagram_id}/"
+    
+    def open_in_browser(self, focus_table=None, hops=2, direction='both'):
+        """focus_table을 지정하면 해당 테이블 주변 hops 단계만 보여주는 포커스 보기로 연다"""
         if not self.start_server():
+            # 서버 없이 파일로 열 때는 번들된 라이브러리를 직접 참조
+            vis_path = get_vis_network_path()
+            script_src = Path(vis_path).as_uri() if os.path.exists(vis_path) else VIS_NETWORK_CDN_URL
+            html_file = self.create_html_file(script_src)
             webbrowser.open(f"file://{html_file}")
             return
         
-        url = f"http://localhost:{self.port}/{os.path.basename(html_file)}"
+        url = f"http://127.0.0.1:{self.port}{self.get_editor_path()}"
+        if focus_table:
+            # 포커스 보기는 전체 레이아웃 없이 부분 그래프만 계산
+            self.get_fk_graph()
+            url += '?' + urlencode({'focus': focus_table, 'hops': hops, 'direction': direction})
+        else:
+            # 레이아웃 오류가 GUI에 표시되도록 브라우저를 열기 전에 데이터를 준비
+            self.get_visjs_data()
+        register_diagram(self.httpd, self)
+        
+        # 첫 검색이 기다리지 않도록 색인을 미리 만들어 둠
+        threading.Thread(target=self.get_search_index, daemon=True).start()
         
         if self.logger:
             self.logger.info(f"브라우저에서 ER 다이어그램 편집기 열기: {url}")
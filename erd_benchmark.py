@@ -0,0 +1,462 @@
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from er_diagram import ERDiagramGenerator
+from er_diagram_matplotlib import ERDiagramMatplotlibGenerator, count_artists
+from er_diagram_web import ERDiagramWebEditor
+from graphviz_render import DEFAULT_RENDER_TIMEOUT, ENGINE_ATTRS, RenderTimeout, get_renderer, probe_graphviz, select_engine
+from spatial_index import SpatialGrid
+
+
+GRAPH_KINDS = ['star', 'chain', 'dag', 'dense', 'sparse']
+DEFAULT_SIZES = [10, 100, 1000, 5000, 20000]
+GRAPHVIZ_SIZES = [10, 50, 100, 200, 500]
+MATPLOTLIB_SIZES = [100, 500, 2000]
+MATPLOTLIB_MODES = {'legacy': False, 'batched': True}
+
+
+def _make_columns(rnd, table_name):
+    columns = [{'name': 'id', 'type': 'INTEGER', 'nullable': False}]
+    for i in range(rnd.randint(2, 14)):
+        col_type = rnd.choice(['VARCHAR(50)', 'INTEGER', 'DATETIME', 'DECIMAL(10,2)', 'TEXT'])
+        columns.append({'name': f"{table_name.lower()}_col_{i}", 'type': col_type, 'nullable': rnd.random() < 0.7})
+    return columns
+
+
+def generate_schema(kind, num_tables, seed=0):
+    """벤치마크용 가상 스키마(tables_info 형식) 생성"""
+    rnd = random.Random(f"{kind}:{num_tables}:{seed}")
+    names = [f"T{i:05d}" for i in range(num_tables)]
+    refs = {name: [] for name in names}
+    
+    if kind == 'star':
+        # 허브 몇 개에 나머지가 매달린 형태
+        hubs = names[:max(1, num_tables // 200)]
+        for i, name in enumerate(names[len(hubs):]):
+            refs[name].append(hubs[i % len(hubs)])
+    elif kind == 'chain':
+        for i in range(1, num_tables):
+            refs[names[i]].append(names[i - 1])
+    elif kind == 'dag':
+        for i in range(1, num_tables):
+            for _ in range(rnd.randint(1, 2)):
+                refs[names[i]].append(names[rnd.randrange(max(0, i - 50), i)])
+    elif kind == 'dense':
+        for i in range(1, num_tables):
+            for _ in range(min(i, rnd.randint(3, 6))):
+                refs[names[i]].append(names[rnd.randrange(i)])
+    elif kind == 'sparse':
+        # 작은 서브시스템 여러 개와 고립 테이블
+        for i in range(1, num_tables):
+            if rnd.random() < 0.5 and i % 25 != 0:
+                refs[names[i]].append(names[rnd.randrange(i - (i % 25), i)])
+    else:
+        raise ValueError(f"지원하지 않는 그래프 종류: {kind}")
+    
+    tables_info = {}
+    for name in names:
+        foreign_keys = []
+        for ref_table in dict.fromkeys(refs[name]):
+            foreign_keys.append({
+                'name': f"fk_{name}_{ref_table}",
+                'constrained_columns': [f"{ref_table.lower()}_id"],
+                'referred_table': ref_table,
+                'referred_columns': ['id']
+            })
+        columns = _make_columns(rnd, name)
+        for fk in foreign_keys:
+            columns.append({'name': fk['constrained_columns'][0], 'type': 'INTEGER', 'nullable': True})
+        tables_info[name] = {
+            'columns': columns,
+            'foreign_keys': foreign_keys,
+            'primary_keys': ['id'],
+            'indexes': []
+        }
+    return tables_info
+
+
+def _web_layout(tables_info, workers=1):
+    editor = ERDiagramWebEditor(tables_info, layout_workers=workers)
+    layout = editor.compute_layout()
+    positions = {name: (pos['x'], pos['y']) for name, pos in layout['positions'].items()}
+    return positions, layout['table_sizes']
+
+
+# 엔진 이름 -> tables_info를 받아 ({이름: (x, y)}, {이름: (너비, 높이)})를 반환하는 함수
+LAYOUT_ENGINES = {
+    'web': lambda tables_info: _web_layout(tables_info),
+    'web-parallel': lambda tables_info: _web_layout(tables_info, os.cpu_count() or 1),
+}
+
+
+def collect_edges(tables_info):
+    edges = []
+    for table_name, table_info in tables_info.items():
+        for fk in table_info['foreign_keys']:
+            ref_table = fk['referred_table']
+            if ref_table in tables_info and ref_table != table_name:
+                edges.append((table_name, ref_table))
+    return edges
+
+
+def _segments_cross(a, b, c, d):
+    def orient(p, q, r):
+        value = (q[0] - p[0]) * (r[1] - p[1]) - (q[1] - p[1]) * (r[0] - p[0])
+        return (value > 1e-9) - (value < -1e-9)
+    
+    o1 = orient(a, b, c)
+    o2 = orient(a, b, d)
+    o3 = orient(c, d, a)
+    o4 = orient(c, d, b)
+    return o1 * o2 < 0 and o3 * o4 < 0
+
+
+def count_edge_crossings(edges, positions, max_pairs=200000, seed=0):
+    """간선 교차 수. 쌍이 max_pairs보다 많으면 무작위 표본으로 추정 (반환: (교차 수, 추정 여부))"""
+    segments = [(positions[a], positions[b], a, b) for a, b in edges]
+    count = len(segments)
+    total_pairs = count * (count - 1) // 2
+    if total_pairs == 0:
+        return 0, False
+    
+    def crosses(i, j):
+        p1, p2, a1, b1 = segments[i]
+        q1, q2, a2, b2 = segments[j]
+        # 끝점을 공유하는 간선은 교차로 보지 않음
+        if a1 in (a2, b2) or b1 in (a2, b2):
+            return False
+        return _segments_cross(p1, p2, q1, q2)
+    
+    if total_pairs <= max_pairs:
+        crossings = 0
+        for i in range(count):
+            for j in range(i + 1, count):
+                if crosses(i, j):
+                    crossings += 1
+        return crossings, False
+    
+    rnd = random.Random(seed)
+    hits = 0
+    for _ in range(max_pairs):
+        i = rnd.randrange(count)
+        j = rnd.randrange(count - 1)
+        if j >= i:
+            j += 1
+        if crosses(i, j):
+            hits += 1
+    return int(round(hits / max_pairs * total_pairs)), True
+
+
+def count_node_overlaps(positions, table_sizes):
+    rects = {}
+    for name, (x, y) in positions.items():
+        width, height = table_sizes[name]
+        rects[name] = (x - width / 2, y - height / 2, x + width / 2, y + height / 2)
+    
+    if not rects:
+        return 0
+    cell_size = max(100, sum(r[2] - r[0] for r in rects.values()) / len(rects))
+    grid = SpatialGrid(cell_size=cell_size)
+    overlaps = 0
+    for name, rect in rects.items():
+        overlaps += len(grid.query(rect))
+        grid.insert(name, rect)
+    return overlaps
+
+
+def measure_quality(tables_info, positions, table_sizes):
+    edges = collect_edges(tables_info)
+    crossings, estimated = count_edge_crossings(edges, positions)
+    
+    total_length = 0.0
+    for a, b in edges:
+        (x1, y1), (x2, y2) = positions[a], positions[b]
+        total_length += math.hypot(x2 - x1, y2 - y1)
+    
+    min_x = min_y = math.inf
+    max_x = max_y = -math.inf
+    for name, (x, y) in positions.items():
+        width, height = table_sizes[name]
+        min_x = min(min_x, x - width / 2)
+        min_y = min(min_y, y - height / 2)
+        max_x = max(max_x, x + width / 2)
+        max_y = max(max_y, y + height / 2)
+    canvas_width = max(0, max_x - min_x)
+    canvas_height = max(0, max_y - min_y)
+    
+    return {
+        'edges': len(edges),
+        'edge_crossings': crossings,
+        'edge_crossings_estimated': estimated,
+        'node_overlaps': count_node_overlaps(positions, table_sizes),
+        'total_edge_length': round(total_length, 1),
+        'canvas_width': round(canvas_width, 1),
+        'canvas_height': round(canvas_height, 1),
+        'canvas_area': round(canvas_width * canvas_height, 1)
+    }
+
+
+def run_layout_case(engine_name, kind, num_tables, seed=0, repeat=1):
+    tables_info = generate_schema(kind, num_tables, seed)
+    engine = LAYOUT_ENGINES[engine_name]
+    
+    runtimes = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        positions, table_sizes = engine(tables_info)
+        runtimes.append(time.perf_counter() - start)
+    
+    # tracemalloc은 실행 시간을 늘리므로 메모리는 별도 실행으로 측정
+    tracemalloc.start()
+    engine(tables_info)
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    result = {
+        'engine': engine_name,
+        'kind': kind,
+        'tables': num_tables,
+        'runtime_sec': round(min(runtimes), 4),
+        'peak_memory_mb': round(peak_bytes / (1024 * 1024), 2)
+    }
+    result.update(measure_quality(tables_info, positions, table_sizes))
+    return result
+
+
+def run_graphviz_case(engine_name, kind, num_tables, seed=0, timeout=DEFAULT_RENDER_TIMEOUT, fmt='png'):
+    """한 엔진으로 렌더링한 시간 (캐시를 거치지 않음). 제한 시간을 넘기면 timed_out"""
+    tables_info = generate_schema(kind, num_tables, seed)
+    edges = collect_edges(tables_info)
+    source = ERDiagramGenerator().build_graph(tables_info, engine_name).source
+    
+    start = time.perf_counter()
+    try:
+        data = get_renderer().pipe(source, fmt, engine_name, timeout)
+        timed_out = False
+    except RenderTimeout:
+        data = b''
+        timed_out = True
+    
+    return {
+        'engine': engine_name,
+        'kind': kind,
+        'tables': num_tables,
+        'edges': len(edges),
+        'auto_engine': select_engine(num_tables, len(edges)),
+        'runtime_sec': round(time.perf_counter() - start, 4),
+        'timed_out': timed_out,
+        'output_kb': round(len(data) / 1024, 1)
+    }
+
+
+def run_matplotlib_case(mode, kind, num_tables, seed=0, fmt='png'):
+    """그리기 객체 수, 그림 구성 시간과 저장 시간 (파일 대신 메모리에 저장)"""
+    import io
+    import matplotlib.pyplot as plt
+    
+    tables_info = generate_schema(kind, num_tables, seed)
+    generator = ERDiagramMatplotlibGenerator(batched=MATPLOTLIB_MODES[mode])
+    
+    start = time.perf_counter()
+    fig, ax = generator.build_figure(tables_info)
+    build_sec = time.perf_counter() - start
+    artists = count_artists(ax)
+    
+    output = io.BytesIO()
+    start = time.perf_counter()
+    fig.savefig(output, **generator.save_options(fig, fmt))
+    save_sec = time.perf_counter() - start
+    plt.close(fig)
+    
+    return {
+        'mode': mode,
+        'kind': kind,
+        'tables': num_tables,
+        'artists': artists,
+        'build_sec': round(build_sec, 4),
+        'save_sec': round(save_sec, 4),
+        'runtime_sec': round(build_sec + save_sec, 4),
+        'output_kb': round(len(output.getvalue()) / 1024, 1)
+    }
+
+
+def _git_commit():
+    try:
+        result = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, timeout=5,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        )
+        return result.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def make_report(suite, results):
+    return {
+        'suite': suite,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'commit': _git_commit(),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'results': results
+    }
+
+
+def _case_key(result):
+    # 문자열 항목(엔진, 그래프 종류 등)과 테이블 수로 케이스를 식별
+    return tuple((k, v) for k, v in result.items() if isinstance(v, str) or k == 'tables')
+
+
+def compare_reports(base_report, new_report, metrics=None):
+    """두 보고서에서 같은 케이스끼리 지표 변화를 비교한 행 목록"""
+    base_cases = {_case_key(r): r for r in base_report['results']}
+    rows = []
+    for result in new_report['results']:
+        base = base_cases.get(_case_key(result))
+        if base is None:
+            continue
+        for metric, new_value in result.items():
+            if metrics and metric not in metrics:
+                continue
+            base_value = base.get(metric)
+            if isinstance(new_value, bool) or not isinstance(new_value, (int, float)):
+                continue
+            if not isinstance(base_value, (int, float)) or metric == 'tables':
+                continue
+            change = None if base_value == 0 else (new_value - base_value) / base_value * 100
+            rows.append((_case_key(result), metric, base_value, new_value, change))
+    return rows
+
+
+def _print_results(results, columns):
+    print("  ".join(f"{c:>14}" for c in columns))
+    for result in results:
+        print("  ".join(f"{str(result.get(c, '')):>14}" for c in columns))
+
+
+def _write_report(report, output):
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"보고서 저장: {output}")
+
+
+def cmd_layout(args):
+    results = []
+    for engine_name in args.engines:
+        for kind in args.kinds:
+            for num_tables in args.sizes:
+                result = run_layout_case(engine_name, kind, num_tables, args.seed, args.repeat)
+                results.append(result)
+                print(f"[{engine_name}] {kind} {num_tables}개: {result['runtime_sec']}s, "
+                      f"교차 {result['edge_crossings']}, 겹침 {result['node_overlaps']}")
+    
+    _print_results(results, ['engine', 'kind', 'tables', 'runtime_sec', 'peak_memory_mb',
+                             'edge_crossings', 'node_overlaps', 'canvas_area'])
+    _write_report(make_report('layout', results), args.output)
+
+
+def cmd_graphviz(args):
+    try:
+        info = probe_graphviz()
+    except Exception as e:
+        print(f"Graphviz를 사용할 수 없습니다: {e}")
+        sys.exit(1)
+    print(info['version'])
+    
+    results = []
+    for kind in args.kinds:
+        for num_tables in args.sizes:
+            for engine_name in args.engines:
+                result = run_graphviz_case(engine_name, kind, num_tables, args.seed, args.timeout)
+                results.append(result)
+                status = "시간 초과" if result['timed_out'] else f"{result['runtime_sec']}s"
+                print(f"[{engine_name}] {kind} {num_tables}개: {status} (자동 선택: {result['auto_engine']})")
+    
+    _print_results(results, ['engine', 'kind', 'tables', 'edges', 'auto_engine', 'runtime_sec', 'timed_out', 'output_kb'])
+    _write_report(make_report('graphviz', results), args.output)
+
+
+def cmd_matplotlib(args):
+    results = []
+    for kind in args.kinds:
+        for num_tables in args.sizes:
+            for mode in args.modes:
+                result = run_matplotlib_case(mode, kind, num_tables, args.seed, args.format)
+                results.append(result)
+                print(f"[{mode}] {kind} {num_tables}개: 객체 {result['artists']}개, {result['runtime_sec']}s")
+    
+    _print_results(results, ['mode', 'kind', 'tables', 'artists', 'build_sec', 'save_sec', 'runtime_sec', 'output_kb'])
+    _write_report(make_report('matplotlib', results), args.output)
+
+
+def cmd_compare(args):
+    with open(args.base, 'r', encoding='utf-8') as f:
+        base_report = json.load(f)
+    with open(args.new, 'r', encoding='utf-8') as f:
+        new_report = json.load(f)
+    
+    print(f"기준: {base_report.get('commit')}  비교: {new_report.get('commit')}")
+    for case, metric, base_value, new_value, change in compare_reports(base_report, new_report, args.metrics):
+        case_text = " ".join(str(value) for _, value in case)
+        change_text = "-" if change is None else f"{change:+.1f}%"
+        print(f"{case_text:40s} {metric:28s} {base_value:>14} -> {new_value:>14} ({change_text})")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="ERD 프로그램 레이아웃/렌더링 벤치마크")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    layout_parser = subparsers.add_parser('layout', help="웹 편집기 레이아웃 엔진 벤치마크")
+    layout_parser.add_argument('--engines', nargs='+', default=['web'], choices=sorted(LAYOUT_ENGINES))
+    layout_parser.add_argument('--kinds', nargs='+', default=GRAPH_KINDS, choices=GRAPH_KINDS)
+    layout_parser.add_argument('--sizes', nargs='+', type=int, default=DEFAULT_SIZES)
+    layout_parser.add_argument('--repeat', type=int, default=1)
+    layout_parser.add_argument('--seed', type=int, default=0)
+    layout_parser.add_argument('--output', default='layout_benchmark.json')
+    layout_parser.set_defaults(func=cmd_layout)
+    
+    graphviz_parser = subparsers.add_parser('graphviz', help="Graphviz 엔진별 렌더링 시간 벤치마크")
+    graphviz_parser.add_argument('--engines', nargs='+', default=sorted(ENGINE_ATTRS), choices=sorted(ENGINE_ATTRS))
+    graphviz_parser.add_argument('--kinds', nargs='+', default=['sparse', 'dag'], choices=GRAPH_KINDS)
+    graphviz_parser.add_argument('--sizes', nargs='+', type=int, default=GRAPHVIZ_SIZES)
+    graphviz_parser.add_argument('--timeout', type=float, default=DEFAULT_RENDER_TIMEOUT)
+    graphviz_parser.add_argument('--seed', type=int, default=0)
+    graphviz_parser.add_argument('--output', default='graphviz_benchmark.json')
+    graphviz_parser.set_defaults(func=cmd_graphviz)
+    
+    matplotlib_parser = subparsers.add_parser('matplotlib', help="matplotlib 개별/일괄 그리기 비교")
+    matplotlib_parser.add_argument('--modes', nargs='+', default=list(MATPLOTLIB_MODES), choices=list(MATPLOTLIB_MODES))
+    matplotlib_parser.add_argument('--kinds', nargs='+', default=['sparse'], choices=GRAPH_KINDS)
+    matplotlib_parser.add_argument('--sizes', nargs='+', type=int, default=MATPLOTLIB_SIZES)
+    matplotlib_parser.add_argument('--format', default='png', choices=['png', 'svg', 'pdf'])
+    matplotlib_parser.add_argument('--seed', type=int, default=0)
+    matplotlib_parser.add_argument('--output', default='matplotlib_benchmark.json')
+    matplotlib_parser.set_defaults(func=cmd_matplotlib)
+    
+    compare_parser = subparsers.add_parser('compare', help="두 벤치마크 보고서 비교")
+    compare_parser.add_argument('base')
+    compare_parser.add_argument('new')
+    compare_parser.add_argument('--metrics', nargs='+')
+    compare_parser.set_defaults(func=cmd_compare)
+    
+    return parser
+
+
+def main():
+    args = build_parser().parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
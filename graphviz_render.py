@@ -0,0 +1,422 @@
+import io
+import os
+import re
+import sys
+import time
+import shutil
+import hashlib
+import tempfile
+import threading
+import subprocess
+from collections import OrderedDict
+from pathlib import Path
+
+from layout_packer import SkylinePacker
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+
+# 결과 캐시 한도 (메모리는 최근 결과, 디스크는 프로그램을 다시 실행해도 유지)
+MEMORY_CACHE_BYTES = 64 * 1024 * 1024
+DISK_CACHE_BYTES = 512 * 1024 * 1024
+
+# 한 엔진의 렌더링 제한 시간(초). 넘기면 더 가벼운 엔진으로 다시 시도
+DEFAULT_RENDER_TIMEOUT = 60
+# 취소 요청을 확인하는 간격(초). 취소되면 실행 중인 dot 프로세스를 종료
+CANCEL_POLL_SECONDS = 0.2
+
+# dot(계층 배치)은 레코드 노드가 많으면 급격히 느려지므로 작은 그래프에만 사용
+DOT_MAX_NODES = 150
+DOT_MAX_EDGES = 300
+NEATO_MAX_NODES = 500
+
+# 엔진별 그래프 속성 (레코드 노드가 겹치지 않도록 prism으로 겹침 제거)
+ENGINE_ATTRS = {
+    'dot': {'rankdir': 'LR'},
+    'neato': {'overlap': 'prism', 'splines': 'true', 'sep': '+12', 'mode': 'KK'},
+    'sfdp': {'overlap': 'prism', 'splines': 'line', 'sep': '+12', 'overlap_scaling': '2'},
+}
+
+# 제한 시간을 넘겼을 때 다시 시도할 엔진 (뒤로 갈수록 가벼움)
+FALLBACK_ENGINES = {
+    'dot': ['sfdp'],
+    'neato': ['sfdp'],
+    'sfdp': [],
+}
+
+# 이어 붙일 때 조각 사이 간격 (PNG는 픽셀, SVG는 pt)
+STITCH_SPACING = 40
+
+SVG_ROOT_PATTERN = re.compile(r'<svg\b[^>]*>')
+SVG_SIZE_PATTERN = re.compile(r'\s(width|height)="([\d.]+)(?:pt|px)?"')
+
+# Windows에서 dot 실행 시 콘솔 창이 잠깐 뜨지 않도록
+_CREATION_FLAGS = getattr(subprocess, 'CREATE_NO_WINDOW', 0)
+
+
+def graphviz_search_paths():
+    """dot 실행 파일이 있을 만한 폴더 (PATH 앞에 추가할 순서)"""
+    graphviz_paths = []
+    
+    if sys.platform == 'win32':
+        common_paths = [
+            r'C:\Program Files\Graphviz\bin',
+            r'C:\Program Files (x86)\Graphviz\bin',
+            os.path.expanduser(r'~\AppData\Local\Programs\Graphviz\bin'),
+        ]
+        
+        for path in common_paths:
+            if os.path.exists(path):
+                graphviz_paths.append(path)
+        
+        path_env = os.environ.get('PATH', '')
+        for path in path_env.split(os.pathsep):
+            if 'graphviz' in path.lower() and os.path.exists(path):
+                graphviz_paths.append(path)
+    
+    dot_path = shutil.which('dot')
+    if dot_path:
+        dot_dir = os.path.dirname(dot_path)
+        if dot_dir not in graphviz_paths:
+            graphviz_paths.insert(0, dot_dir)
+    return graphviz_paths
+
+
+_probe_lock = threading.Lock()
+_probe_result = None
+
+
+def probe_graphviz(refresh=False):
+    """Graphviz 설치 확인은 프로세스당 한 번만 수행 (실패도 기억)
+    
+    반환: {'dot': 실행 파일 경로, 'version': 버전 문자열}
+    """
+    global _probe_result
+    with _probe_lock:
+        if _probe_result is None or refresh:
+            _probe_result = _run_probe()
+        if isinstance(_probe_result, Exception):
+            raise _probe_result
+        return _probe_result
+
+
+def _run_probe():
+    graphviz_paths = graphviz_search_paths()
+    if graphviz_paths:
+        current = os.environ.get('PATH', '').split(os.pathsep)
+        missing = [path for path in graphviz_paths if path not in current]
+        if missing:
+            os.environ['PATH'] = os.pathsep.join(missing) + os.pathsep + os.environ.get('PATH', '')
+    
+    dot_path = shutil.which('dot')
+    if not dot_path:
+        return Exception("Graphviz 'dot' 실행 파일을 찾을 수 없습니다.")
+    
+    try:
+        result = subprocess.run(
+            [dot_path, '-V'],
+            capture_output=True,
+            text=True,
+            timeout=2,
+            creationflags=_CREATION_FLAGS
+        )
+    except subprocess.TimeoutExpired:
+        return Exception("Graphviz 'dot' 실행이 타임아웃되었습니다. Graphviz 설치에 문제가 있을 수 있습니다.")
+    except Exception as test_error:
+        return Exception(f"Graphviz 'dot' 실행 테스트 실패: {str(test_error)}")
+    
+    if result.returncode != 0:
+        return Exception(f"Graphviz 'dot' 실행 테스트 실패: {result.stderr}")
+    
+    # dot -V는 버전을 stderr로 출력
+    return {'dot': dot_path, 'version': (result.stderr or result.stdout).strip()}
+
+
+class RenderTimeout(Exception):
+    """렌더링이 제한 시간을 넘김 (더 가벼운 엔진으로 다시 시도할 수 있음)"""
+
+
+class RenderCancelled(Exception):
+    """호출한 쪽이 렌더링을 취소함 (다른 엔진이나 대체 생성기로 넘어가지 않음)"""
+
+
+def select_engine(num_nodes, num_edges):
+    """그래프 크기에 맞는 배치 엔진 (작으면 dot, 중간은 neato, 크면 sfdp)"""
+    if num_nodes <= DOT_MAX_NODES and num_edges <= DOT_MAX_EDGES:
+        return 'dot'
+    if num_nodes <= NEATO_MAX_NODES:
+        return 'neato'
+    return 'sfdp'
+
+
+def engine_chain(engine):
+    """engine부터 시도할 엔진 순서"""
+    if engine not in ENGINE_ATTRS:
+        raise Exception(f"지원하지 않는 Graphviz 엔진입니다: {engine}")
+    return [engine] + FALLBACK_ENGINES[engine]
+
+
+class RenderCache:
+    """렌더링 결과 캐시: 메모리 LRU + 디스크 (~/.erd_program/render_cache)"""
+    
+    def __init__(self, cache_dir=None, memory_limit=MEMORY_CACHE_BYTES, disk_limit=DISK_CACHE_BYTES):
+        if cache_dir is None:
+            cache_dir = Path.home() / '.erd_program' / 'render_cache'
+        self.cache_dir = Path(cache_dir)
+        self.memory_limit = memory_limit
+        self.disk_limit = disk_limit
+        self.memory = OrderedDict()
+        self.memory_bytes = 0
+        self.lock = threading.Lock()
+        
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        except OSError:
+            # 디스크 캐시를 쓸 수 없으면 메모리 캐시만 사용
+            self.cache_dir = None
+    
+    @staticmethod
+    def make_key(source, fmt, engine, version=''):
+        digest = hashlib.sha256()
+        for part in (version, engine, fmt):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\x00')
+        digest.update(source.encode('utf-8'))
+        return digest.hexdigest()
+    
+    def _disk_path(self, key):
+        return self.cache_dir / f"{key}.bin"
+    
+    def get(self, key):
+        with self.lock:
+            data = self.memory.get(key)
+            if data is not None:
+                self.memory.move_to_end(key)
+                return data
+        
+        if self.cache_dir is None:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            # 디스크 정리 시 최근 사용한 파일이 남도록
+            os.utime(path)
+        except OSError:
+            return None
+        self._remember(key, data)
+        return data
+    
+    def put(self, key, data):
+        self._remember(key, data)
+        if self.cache_dir is None:
+            return
+        
+        temp_path = None
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, self._disk_path(key))
+        except OSError:
+            if temp_path and os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+        self._prune_disk()
+    
+    def _remember(self, key, data):
+        # 메모리 한도의 1/4보다 큰 결과는 디스크에만 둠
+        if len(data) > self.memory_limit // 4:
+            return
+        with self.lock:
+            previous = self.memory.pop(key, None)
+            if previous is not None:
+                self.memory_bytes -= len(previous)
+            self.memory[key] = data
+            self.memory_bytes += len(data)
+            while self.memory_bytes > self.memory_limit:
+                _, evicted = self.memory.popitem(last=False)
+                self.memory_bytes -= len(evicted)
+    
+    def _prune_disk(self):
+        """디스크 한도를 넘으면 오래 사용하지 않은 파일부터 삭제"""
+        try:
+            entries = [(entry.stat().st_mtime, entry.stat().st_size, entry.path) for entry in os.scandir(self.cache_dir)
+                       if entry.name.endswith('.bin')]
+        except OSError:
+            return
+        total = sum(size for _, size, _ in entries)
+        if total <= self.disk_limit:
+            return
+        for _, size, path in sorted(entries):
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            if total <= self.disk_limit:
+                break
+    
+    def clear(self):
+        with self.lock:
+            self.memory.clear()
+            self.memory_bytes = 0
+        if self.cache_dir is None:
+            return
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith('.bin'):
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+
+
+class GraphvizRenderer:
+    """DOT 소스를 임시 파일 없이 dot 표준 입출력으로 렌더링하고 결과를 캐시"""
+    
+    def __init__(self, cache=None, logger=None):
+        self.cache = cache if cache is not None else RenderCache()
+        self.logger = logger
+        # 제한 시간을 넘긴 소스 -> 그때의 제한 시간 (다시 생성할 때 같은 대기를 반복하지 않도록)
+        self.timed_out = {}
+    
+    def render(self, source, fmt='png', engine='dot', timeout=None, use_cache=True, cancel_event=None):
+        """반환: 렌더링 결과 바이트
+        
+        cancel_event: threading.Event. 설정되면 dot 프로세스를 종료하고 RenderCancelled
+        """
+        info = probe_graphviz()
+        key = RenderCache.make_key(source, fmt, engine, info['version'])
+        if use_cache:
+            data = self.cache.get(key)
+            if data is not None:
+                if self.logger:
+                    self.logger.info(f"Graphviz 캐시 사용 ({engine}, {fmt}, {len(data)} bytes)")
+                return data
+        
+        if timeout is not None and self.timed_out.get(key, 0) >= timeout:
+            raise RenderTimeout(f"Graphviz 렌더링 시간 초과 ({engine}, {timeout}초, 이전 결과)")
+        try:
+            data = self.pipe(source, fmt, engine, timeout, cancel_event)
+        except RenderTimeout:
+            self.timed_out[key] = timeout
+            raise
+        if use_cache:
+            self.cache.put(key, data)
+        return data
+    
+    def pipe(self, source, fmt='png', engine='dot', timeout=None, cancel_event=None):
+        info = probe_graphviz()
+        if cancel_event is not None and cancel_event.is_set():
+            raise RenderCancelled("Graphviz 렌더링이 취소되었습니다.")
+        
+        deadline = None if timeout is None else time.monotonic() + timeout
+        process = subprocess.Popen(
+            [info['dot'], f"-K{engine}", f"-T{fmt}"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            creationflags=_CREATION_FLAGS
+        )
+        data = source.encode('utf-8')
+        try:
+            while True:
+                # 취소를 확인할 수 있도록 짧게 나누어 기다림 (다시 호출해도 출력은 이어서 모임)
+                wait = None if cancel_event is None else CANCEL_POLL_SECONDS
+                if deadline is not None:
+                    remaining = max(0, deadline - time.monotonic())
+                    wait = remaining if wait is None else min(wait, remaining)
+                try:
+                    stdout, stderr = process.communicate(input=data, timeout=wait)
+                    break
+                except subprocess.TimeoutExpired:
+                    # 입력은 첫 호출에서 이미 넘어갔으므로 다시 보내지 않음
+                    data = None
+                    if cancel_event is not None and cancel_event.is_set():
+                        raise RenderCancelled("Graphviz 렌더링이 취소되었습니다.")
+                    if deadline is not None and time.monotonic() >= deadline:
+                        raise RenderTimeout(f"Graphviz 렌더링 시간 초과 ({engine}, {timeout}초)")
+        finally:
+            # 시간 초과/취소/예외 시 dot 프로세스가 남지 않도록 종료
+            # (남은 출력은 읽지 않음: 자식 프로세스가 파이프를 쥐고 있어도 기다리지 않도록)
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+            for stream in (process.stdin, process.stdout, process.stderr):
+                stream.close()
+        
+        if process.returncode != 0 or not stdout:
+            stderr = stderr.decode('utf-8', errors='replace').strip()
+            raise Exception(f"Graphviz 렌더링 실패 ({engine}): {stderr}")
+        return stdout
+
+
+def stitch_png(pieces, spacing=STITCH_SPACING):
+    """여러 PNG 조각을 스카이라인 패킹으로 한 이미지에 배치. 반환: PNG 바이트"""
+    if Image is None:
+        raise Exception("PNG 이어 붙이기에는 Pillow가 필요합니다. (pip install pillow)")
+    images = [Image.open(io.BytesIO(data)) for data in pieces]
+    positions, (width, height) = SkylinePacker(spacing=spacing).pack(
+        [(index, image.width, image.height) for index, image in enumerate(images)]
+    )
+    
+    canvas = Image.new('RGB', (max(1, width), max(1, height)), 'white')
+    for index, image in enumerate(images):
+        image = image.convert('RGBA')
+        canvas.paste(image, positions[index], image)
+    
+    output = io.BytesIO()
+    canvas.save(output, format='PNG')
+    return output.getvalue()
+
+
+def stitch_svg(pieces, spacing=STITCH_SPACING):
+    """여러 SVG 조각을 중첩 svg 요소로 한 문서에 배치. 반환: SVG 바이트"""
+    items = []
+    for index, data in enumerate(pieces):
+        text = data.decode('utf-8')
+        root = SVG_ROOT_PATTERN.search(text)
+        if root is None:
+            raise Exception("Graphviz SVG 결과를 해석할 수 없습니다.")
+        sizes = dict(SVG_SIZE_PATTERN.findall(root.group(0)))
+        width = float(sizes.get('width', 0))
+        height = float(sizes.get('height', 0))
+        # XML 선언/DOCTYPE을 빼고 루트부터 사용, 크기는 단위 없이 (바깥 문서 좌표 = pt)
+        body = text[root.start():]
+        items.append((index, width, height, body))
+    
+    positions, (total_width, total_height) = SkylinePacker(spacing=spacing).pack(
+        [(index, width, height) for index, width, height, _ in items]
+    )
+    
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8" standalone="no"?>\n',
+        f'<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" '
+        f'width="{total_width:.0f}pt" height="{total_height:.0f}pt" viewBox="0 0 {total_width:.2f} {total_height:.2f}">\n'
+    ]
+    for index, width, height, body in items:
+        x, y = positions[index]
+        root_tag = SVG_ROOT_PATTERN.match(body).group(0)
+        new_tag = SVG_SIZE_PATTERN.sub('', root_tag)
+        new_tag = new_tag.replace('<svg', f'<svg x="{x:.2f}" y="{y:.2f}" width="{width:.2f}" height="{height:.2f}"', 1)
+        parts.append(new_tag + body[len(root_tag):].rstrip() + '\n')
+    parts.append('</svg>\n')
+    return ''.join(parts).encode('utf-8')
+
+
+_renderer = None
+_renderer_lock = threading.Lock()
+
+
+def get_renderer(logger=None):
+    """프로세스 전체에서 공유하는 렌더러 (캐시를 함께 사용)"""
+    global _renderer
+    with _renderer_lock:
+        if _renderer is None:
+            _renderer = GraphvizRenderer(logger=logger)
+        elif logger is not None and _renderer.logger is None:
+            _renderer.logger = logger
+        return _renderer
@@ -0,0 +1,156 @@
+import math
+
+
+class SkylinePacker:
+    """연결 그룹의 바운딩 박스를 스카이라인 방식으로 배치"""
+    
+    def __init__(self, spacing=200, target_aspect=1.6, width_factors=(0.7, 0.85, 1.0, 1.2, 1.5)):
+        self.spacing = spacing
+        self.target_aspect = target_aspect
+        self.width_factors = width_factors
+    
+    def pack(self, items):
+        """items: [(key, width, height), ...] -> ({key: (x, y)}, (전체 너비, 전체 높이))
+        
+        좌표는 각 사각형의 왼쪽 위 모서리이며, 같은 입력에는 항상 같은 결과를 반환한다.
+        """
+        if not items:
+            return {}, (0, 0)
+        
+        spacing = self.spacing
+        ordered = sorted(
+            ((key, w + spacing, h + spacing) for key, w, h in items),
+            key=lambda item: (-item[2], -item[1], str(item[0]))
+        )
+        
+        total_area = sum(w * h for _, w, h in ordered)
+        max_width = max(w for _, w, _ in ordered)
+        base_width = math.sqrt(total_area * self.target_aspect)
+        
+        candidate_widths = sorted({max(max_width, int(base_width * factor)) for factor in self.width_factors})
+        
+        best = None
+        for bin_width in candidate_widths:
+            positions, used_width, used_height = self._pack_into(ordered, bin_width)
+            score = self._score(used_width, used_height)
+            if best is None or score < best[0]:
+                best = (score, positions, used_width, used_height)
+        
+        _, positions, used_width, used_height = best
+        return positions, (max(0, used_width - spacing), max(0, used_height - spacing))
+    
+    def _score(self, width, height):
+        if width <= 0 or height <= 0:
+            return 0
+        aspect = width / height
+        penalty = max(aspect / self.target_aspect, self.target_aspect / aspect)
+        return width * height * penalty
+    
+    def _pack_into(self, ordered, bin_width):
+        # 스카이라인: [x, y, width] 구간 목록 (x 오름차순, 서로 겹치지 않음)
+        skyline = [[0, 0, bin_width]]
+        positions = {}
+        used_width = 0
+        used_height = 0
+        
+        for key, w, h in ordered:
+            best_index = -1
+            best_x = 0
+            best_y = None
+            
+            for i in range(len(skyline)):
+                x = skyline[i][0]
+                if x + w > bin_width:
+                    break
+                y = self._fit_height(skyline, i, w)
+                if best_y is None or y < best_y:
+                    best_index = i
+                    best_x = x
+                    best_y = y
+            
+            if best_index < 0:
+                # 빈 너비보다 넓은 사각형: 맨 아래에 새 줄로 배치
+                best_x = 0
+                best_y = max(segment[1] for segment in skyline)
+                best_index = 0
+            
+            positions[key] = (best_x, best_y)
+            self._add_segment(skyline, best_index, best_x, best_y + h, w)
+            used_width = max(used_width, best_x + w)
+            used_height = max(used_height, best_y + h)
+        
+        return positions, used_width, used_height
+    
+    def _fit_height(self, skyline, index, width):
+        x_end = skyline[index][0] + width
+        y = 0
+        i = index
+        while i < len(skyline) and skyline[i][0] < x_end:
+            if skyline[i][1] > y:
+                y = skyline[i][1]
+            i += 1
+        return y
+    
+    def _add_segment(self, skyline, index, x, y, width):
+        x_end = x + width
+        new_segments = [[x, y, width]]
+        
+        # index 이후 가려지는 구간 제거/잘라내기
+        i = index
+        while i < len(skyline) and skyline[i][0] < x_end:
+            seg_x, seg_y, seg_w = skyline[i]
+            seg_end = seg_x + seg_w
+            if seg_x < x:
+                new_segments.insert(0, [seg_x, seg_y, x - seg_x])
+            if seg_end > x_end:
+                new_segments.append([x_end, seg_y, seg_end - x_end])
+            i += 1
+        
+        skyline[index:i] = new_segments
+        
+        # 같은 높이의 인접 구간 병합
+        merged = []
+        for segment in skyline:
+            if merged and merged[-1][1] == segment[1] and merged[-1][0] + merged[-1][2] == segment[0]:
+                merged[-1][2] += segment[2]
+            else:
+                merged.append(segment)
+        skyline[:] = merged
+
+
+class ShelfPacker:
+    """비슷한 크기의 사각형(고립 테이블 등)을 선반 방식으로 빠르게 배치"""
+    
+    def __init__(self, spacing=150, target_aspect=1.6):
+        self.spacing = spacing
+        self.target_aspect = target_aspect
+    
+    def pack(self, items):
+        """items: [(key, width, height), ...] -> ({key: (x, y)}, (전체 너비, 전체 높이))"""
+        if not items:
+            return {}, (0, 0)
+        
+        spacing = self.spacing
+        ordered = sorted(items, key=lambda item: (-item[2], -item[1], str(item[0])))
+        
+        total_area = sum((w + spacing) * (h + spacing) for _, w, h in ordered)
+        max_width = max(w for _, w, _ in ordered) + spacing
+        shelf_width = max(max_width, math.sqrt(total_area * self.target_aspect))
+        
+        positions = {}
+        x = 0
+        y = 0
+        shelf_height = 0
+        used_width = 0
+        
+        for key, w, h in ordered:
+            if x > 0 and x + w + spacing > shelf_width:
+                y += shelf_height
+                x = 0
+                shelf_height = 0
+            positions[key] = (x, y)
+            x += w + spacing
+            shelf_height = max(shelf_height, h + spacing)
+            used_width = max(used_width, x)
+        
+        return positions, (max(0, used_width - spacing), max(0, y + shelf_height - spacing))
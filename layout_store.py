@@ -0,0 +1,113 @@
+import json
+import os
+import hashlib
+import tempfile
+import threading
+from pathlib import Path
+
+
+# 편집기마다 LayoutStore를 따로 만들어도 같은 연결의 파일은 하나이므로 잠금은 연결 키별로 모듈에서 공유
+_connection_locks = {}
+_connection_locks_guard = threading.Lock()
+
+
+def _connection_lock(connection_key):
+    with _connection_locks_guard:
+        lock = _connection_locks.get(connection_key)
+        if lock is None:
+            # merge_positions 안에서 save를 다시 부르므로 재진입 가능해야 함
+            lock = threading.RLock()
+            _connection_locks[connection_key] = lock
+        return lock
+
+
+class LayoutStore:
+    """연결별 다이어그램 좌표 저장소 (~/.erd_program/layouts)"""
+    
+    def __init__(self, store_dir=None):
+        if store_dir is None:
+            store_dir = Path.home() / '.erd_program' / 'layouts'
+        self.store_dir = Path(store_dir)
+        
+        if not self.store_dir.exists():
+            self.store_dir.mkdir(parents=True, exist_ok=True)
+    
+    @staticmethod
+    def make_connection_key(db_type, host=None, port=None, database=None, username=None,
+                            service_name=None, file_path=None):
+        if db_type == 'SQLite':
+            return f"SQLite:{os.path.abspath(file_path or '')}"
+        return f"{db_type}:{username or ''}@{host or ''}:{port or ''}/{database or ''}/{service_name or ''}"
+    
+    @staticmethod
+    def schema_fingerprint(tables_info):
+        """테이블 이름과 FK 관계로 계산한 스키마 지문"""
+        digest = hashlib.sha1()
+        for table_name in sorted(tables_info.keys()):
+            digest.update(table_name.encode('utf-8'))
+            digest.update(b'\x00')
+            refs = sorted(fk['referred_table'] for fk in tables_info[table_name].get('foreign_keys', []))
+            for ref_table in refs:
+                digest.update(ref_table.encode('utf-8'))
+                digest.update(b'\x01')
+            digest.update(b'\x02')
+        return digest.hexdigest()
+    
+    def _layout_path(self, connection_key):
+        name = hashlib.sha1(connection_key.encode('utf-8')).hexdigest()[:20]
+        return self.store_dir / f"{name}.json"
+    
+    def load(self, connection_key):
+        path = self._layout_path(connection_key)
+        if not path.exists():
+            return None
+        
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"레이아웃 불러오기 오류: {e}")
+            return None
+        
+        if data.get('connection_key') != connection_key:
+            return None
+        return data
+    
+    def merge_positions(self, connection_key, fingerprint, updates):
+        """변경된 테이블 좌표만 기존 저장 파일에 병합
+        
+        편집기 서버의 여러 요청 스레드와 다른 편집기가 같은 파일을 읽고 고쳐 쓰므로 연결 키별로 직렬화
+        """
+        with _connection_lock(connection_key):
+            stored = self.load(connection_key)
+            positions = stored.get('positions', {}) if stored else {}
+            positions.update(updates)
+            return self.save(connection_key, fingerprint, positions)
+    
+    def save(self, connection_key, fingerprint, positions):
+        with _connection_lock(connection_key):
+            return self._write(connection_key, fingerprint, positions)
+    
+    def _write(self, connection_key, fingerprint, positions):
+        data = {
+            'connection_key': connection_key,
+            'fingerprint': fingerprint,
+            'positions': positions
+        }
+        path = self._layout_path(connection_key)
+        
+        try:
+            # 임시 파일에 쓴 뒤 교체하여 중간에 끊겨도 기존 파일이 깨지지 않게 함
+            fd, temp_path = tempfile.mkstemp(dir=str(self.store_dir), prefix='.layout_', suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, ensure_ascii=False)
+                os.replace(temp_path, path)
+            except Exception:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+            return True
+        except Exception as e:
+            print(f"레이아웃 저장 오류: {e}")
+            return False
@@ -2,17 +2,26 @@ import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, simpledialog
 import os
 import traceback
+import threading
+import multiprocessing
 from db_connector import DatabaseConnector
 from table_extractor import TableExtractor
-from er_diagram import ERDiagramGenerator
+from er_diagram import ERDiagramGenerator, split_output_path
+from er_diagram_matplotlib import ERDiagramMatplotlibGenerator, PAGED_PDF_MIN_TABLES
 from ddl_generator import DDLGenerator
 from excel_generator import ExcelGenerator
 from config_manager import ConfigManager
+from layout_store import LayoutStore
 from er_diagram_viewer import ERDiagramViewer
 from er_diagram_web import ERDiagramWebEditor
+from schema_watcher import SchemaWatcher
 from logger import AppLogger
 
 
+# 딥 줌 내보내기 진행 상황을 상태 표시줄에 반영하는 간격
+EXPORT_POLL_MS = 200
+
+
 class ERDApplication:
     def __init__(self, root):
         self.root = root
@@ -22,6 +31,11 @@ class ERDApplication:
         self.db_connector = DatabaseConnector()
         self.table_extractor = None
         self.tables_info = {}
+        self.connection_key = None
+        # 연결마다 감시 하나를 두고 변경분을 열린 편집기 모두에 전달
+        self.schema_watcher = None
+        self.watched_editors = []
+        self.watch_lock = threading.Lock()
         self.config_manager = ConfigManager()
         self.logger = AppLogger()
         
@@ -121,6 +135,13 @@ class ERDApplication:
                   command=self.generate_excel, state="disabled").pack(side=tk.LEFT, padx=5)
         self.excel_button = button_frame.winfo_children()[3]
         
+        export_frame = ttk.Frame(main_frame)
+        export_frame.grid(row=12, column=0, columnspan=2, pady=5)
+        
+        self.deep_zoom_button = ttk.Button(export_frame, text="딥 줌 타일 내보내기 (대형 스키마)",
+                                           command=self.export_deep_zoom, state="disabled")
+        self.deep_zoom_button.pack(side=tk.LEFT, padx=5)
+        
         self.update_db_type_fields()
         self.db_type_var.trace('w', lambda *args: self.update_db_type_fields())
     
@@ -351,7 +372,10 @@ class ERDApplication:
                 if not file_path:
                     messagebox.showerror("오류", "SQLite 파일 경로를 입력해주세요.")
                     return
+                # connect()가 엔진을 바꾸기 전에 이전 연결의 감시를 중지 (연결에 실패해도 중지됨)
+                self.stop_schema_watcher()
                 success = self.db_connector.connect(db_type, file_path=file_path)
+                connection_key = LayoutStore.make_connection_key(db_type, file_path=file_path)
             else:
                 host = self.host_var.get()
                 port = self.port_var.get()
@@ -375,15 +399,22 @@ class ERDApplication:
                         messagebox.showerror("오류", "데이터베이스를 선택해주세요.")
                         return
                 
+                self.stop_schema_watcher()
                 success = self.db_connector.connect(
                     db_type, host=host, port=port, 
                     database=database, username=username, password=password,
                     service_name=service_name if service_name else None
                 )
+                connection_key = LayoutStore.make_connection_key(
+                    db_type, host=host, port=port, database=database,
+                    username=username, service_name=service_name
+                )
             
             if success:
+                self.connection_key = connection_key
                 self.table_extractor = TableExtractor(self.db_connector)
                 self.tables_info = self.table_extractor.extract_all_tables_info()
+                self.start_schema_watcher()
                 
                 table_count = len(self.tables_info)
                 self.status_label.config(
@@ -395,6 +426,7 @@ class ERDApplication:
                 self.er_button.config(state="normal")
                 self.ddl_button.config(state="normal")
                 self.excel_button.config(state="normal")
+                self.deep_zoom_button.config(state="normal")
                 
                 messagebox.showinfo("성공", f"DB 연결 성공!\n{table_count}개의 테이블을 찾았습니다.")
             else:
@@ -425,8 +457,18 @@ class ERDApplication:
         
         try:
             self.logger.info("ER 다이어그램 웹 편집기/뷰어 열기")
-            editor = ERDiagramWebEditor(self.tables_info, self.logger)
+            # 감시 스레드가 변경분을 빠뜨리거나 두 번 적용하지 않도록 잠금 안에서 스냅샷과 등록을 함께 처리
+            with self.watch_lock:
+                editor = ERDiagramWebEditor(
+                    self.tables_info, self.logger,
+                    connection_key=self.connection_key,
+                    layout_workers=os.cpu_count() or 1
+                )
+                # 열린 편집기에 DB 스키마 변경을 실시간으로 반영
+                if self.schema_watcher is not None:
+                    self.watched_editors.append(editor)
             editor.open_in_browser()
+            
             messagebox.showinfo(
                 "알림",
                 "웹 브라우저에서 ER 다이어그램 편집기가 열렸습니다.\n\n"
@@ -441,6 +483,41 @@ class ERDApplication:
             self.logger.error(f"ER 다이어그램 웹 편집기 오류: {str(e)}", exc_info=True)
             messagebox.showerror("오류", f"ER 다이어그램 편집기 오류: {str(e)}\n\n로그 파일: {self.logger.get_log_path()}")
     
+    def start_schema_watcher(self):
+        """현재 연결의 스키마 변경 감시 시작 (감시는 GUI 연결과 별도의 엔진을 사용)"""
+        watcher = SchemaWatcher(self.db_connector, lambda delta: self.broadcast_schema_delta(watcher, delta), logger=self.logger)
+        if watcher.start():
+            with self.watch_lock:
+                self.schema_watcher = watcher
+    
+    def stop_schema_watcher(self):
+        with self.watch_lock:
+            watcher = self.schema_watcher
+            self.schema_watcher = None
+            self.watched_editors = []
+        if watcher is not None:
+            watcher.stop()
+    
+    def broadcast_schema_delta(self, watcher, delta):
+        """감시 스레드에서 호출: 열려 있는 편집기에 변경분을 전달하고 닫힌 편집기는 목록에서 제거"""
+        with self.watch_lock:
+            # 중지된 이전 연결의 감시가 늦게 보낸 변경분은 무시
+            if watcher is not self.schema_watcher:
+                return
+            # 이후에 여는 편집기도 변경이 반영된 정보로 시작하도록 원본을 새 딕셔너리로 교체
+            removed = set(delta.get('removed', []))
+            tables_info = {name: info for name, info in self.tables_info.items() if name not in removed}
+            tables_info.update(delta.get('added', {}))
+            tables_info.update(delta.get('changed', {}))
+            self.tables_info = tables_info
+            self.watched_editors = [editor for editor in self.watched_editors if not editor.closed]
+            editors = list(self.watched_editors)
+        for editor in editors:
+            try:
+                editor.apply_schema_delta(delta)
+            except Exception as e:
+                self.logger.error(f"스키마 변경 반영 오류: {str(e)}", exc_info=True)
+    
     def generate_er_diagram(self):
         if not self.tables_info:
             messagebox.showerror("오류", "먼저 DB에 연결해주세요.")
@@ -451,15 +528,27 @@ class ERDApplication:
             output_path = filedialog.asksaveasfilename(
                 title="ER 다이어그램 저장",
                 defaultextension=".png",
-                filetypes=[("PNG 파일", "*.png"), ("모든 파일", "*.*")]
+                filetypes=[("PNG 파일", "*.png"), ("SVG 파일", "*.svg"), ("PDF 파일", "*.pdf"), ("모든 파일", "*.*")]
             )
             
             if output_path:
                 self.logger.info(f"ER 다이어그램 저장 경로: {output_path}")
+                # 생성기는 확장자를 붙여 저장하므로 확장자로 형식을 정하고 떼어 전달
+                output_path, output_format = split_output_path(output_path)
+                
+                if output_format == 'pdf' and len(self.tables_info) >= PAGED_PDF_MIN_TABLES:
+                    # 큰 스키마는 한 장짜리 PDF가 읽을 수 없을 만큼 작아지므로 연결 그룹별 페이지로 나눔
+                    generator = ERDiagramMatplotlibGenerator()
+                    result_path = generator.generate_paged(
+                        self.tables_info, output_path, workers=os.cpu_count() or 1, logger=self.logger
+                    )
+                    self.logger.info(f"ER 다이어그램 생성 완료 (페이지 분할 PDF): {result_path}")
+                    messagebox.showinfo("성공", f"ER 다이어그램이 생성되었습니다.\n{result_path}")
+                    return
                 
                 try:
-                    generator = ERDiagramGenerator()
-                    result_path = generator.generate(self.tables_info, output_path)
+                    generator = ERDiagramGenerator(self.logger)
+                    result_path = generator.generate(self.tables_info, output_path, fmt=output_format)
                     self.logger.info(f"ER 다이어그램 생성 완료 (Graphviz): {result_path}")
                     messagebox.showinfo("성공", f"ER 다이어그램이 생성되었습니다.\n{result_path}")
                 except Exception as e:
@@ -467,9 +556,8 @@ class ERDApplication:
                     self.logger.warning(f"Graphviz 실패, matplotlib로 대체: {error_msg}")
                     
                     try:
-                        from er_diagram_matplotlib import ERDiagramMatplotlibGenerator
                         matplotlib_generator = ERDiagramMatplotlibGenerator()
-                        result_path = matplotlib_generator.generate(self.tables_info, output_path)
+                        result_path = matplotlib_generator.generate(self.tables_info, output_path, output_format)
                         self.logger.info(f"ER 다이어그램 생성 완료 (matplotlib): {result_path}")
                         messagebox.showinfo(
                             "성공", 
@@ -510,6 +598,66 @@ class ERDApplication:
             else:
                 messagebox.showerror("오류", f"ER 다이어그램 생성 중 오류 발생: {error_msg}\n\n로그 파일: {self.logger.get_log_path()}")
     
+    def export_deep_zoom(self):
+        """웹 편집기와 같은 좌표로 전체 다이어그램을 Deep Zoom 타일 폴더(.dzi + _files)로 저장
+        
+        타일 수가 많아 오래 걸릴 수 있으므로 작업 스레드에서 저장하고 진행 상황만 상태 표시줄에 표시
+        """
+        if not self.tables_info:
+            messagebox.showerror("오류", "먼저 DB에 연결해주세요.")
+            return
+        
+        output_dir = filedialog.askdirectory(title="딥 줌 타일을 저장할 폴더 선택")
+        if not output_dir:
+            return
+        
+        self.logger.info(f"딥 줌 내보내기 시작: {output_dir}")
+        editor = ERDiagramWebEditor(
+            self.tables_info, self.logger,
+            connection_key=self.connection_key,
+            layout_workers=os.cpu_count() or 1
+        )
+        job = {'done': 0, 'total': 0, 'result': None, 'error': None}
+        
+        def progress(done, total):
+            job['done'] = done
+            job['total'] = total
+        
+        def worker():
+            try:
+                job['result'] = editor.export_deep_zoom(output_dir, progress=progress)
+            except Exception as e:
+                self.logger.error(f"딥 줌 내보내기 오류: {str(e)}", exc_info=True)
+                job['error'] = e
+        
+        self.deep_zoom_button.config(state="disabled")
+        status = (self.status_label.cget('text'), self.status_label.cget('foreground'))
+        thread = threading.Thread(target=worker, daemon=True)
+        thread.start()
+        self.root.after(EXPORT_POLL_MS, self.poll_deep_zoom_export, thread, job, status)
+    
+    def poll_deep_zoom_export(self, thread, job, status):
+        if thread.is_alive():
+            if job['total']:
+                self.status_label.config(text=f"딥 줌 타일 저장 중... {job['done']}/{job['total']}", foreground="blue")
+            else:
+                self.status_label.config(text="딥 줌 레이아웃 계산 중...", foreground="blue")
+            self.root.after(EXPORT_POLL_MS, self.poll_deep_zoom_export, thread, job, status)
+            return
+        
+        self.status_label.config(text=status[0], foreground=status[1])
+        self.deep_zoom_button.config(state="normal")
+        if job['error'] is not None:
+            messagebox.showerror(
+                "오류", f"딥 줌 내보내기 중 오류 발생: {str(job['error'])}\n\n로그 파일: {self.logger.get_log_path()}"
+            )
+            return
+        messagebox.showinfo(
+            "성공",
+            f"딥 줌 타일이 저장되었습니다. ({job['total']}개 타일)\n{job['result']}\n\n"
+            "OpenSeadragon 등 Deep Zoom(.dzi) 뷰어로 열 수 있습니다."
+        )
+    
     def generate_ddl(self):
         if not self.tables_info:
             messagebox.showerror("오류", "먼저 DB에 연결해주세요.")
@@ -562,6 +710,8 @@ class ERDApplication:
 
 
 def main():
+    # PyInstaller 실행 파일에서 레이아웃 작업자 프로세스를 띄우기 위해 필요
+    multiprocessing.freeze_support()
     root = tk.Tk()
     app = ERDApplication(root)
     root.mainloop()
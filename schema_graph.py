@@ -0,0 +1,221 @@
+from collections import Counter, deque
+
+
+CLUSTER_METHODS = ('component', 'prefix', 'community')
+FOCUS_DIRECTIONS = ('both', 'parents', 'children')
+
+ISOLATED_CLUSTER_LABEL = '독립 테이블'
+OTHER_PREFIX_LABEL = '(기타)'
+
+
+def table_prefix(table_name, separator='_'):
+    """ORD_ITEM -> ORD, 구분자가 없으면 None"""
+    head, sep, tail = table_name.partition(separator)
+    if not sep or not head or not tail:
+        return None
+    return head.upper()
+
+
+def group_by_prefix(table_names, separator='_'):
+    """접두어별 테이블 그룹. 반환: [(라벨, [테이블...]), ...]"""
+    groups = {}
+    others = []
+    for table_name in table_names:
+        prefix = table_prefix(table_name, separator)
+        if prefix is None:
+            others.append(table_name)
+        else:
+            groups.setdefault(prefix, []).append(table_name)
+    
+    # 테이블이 하나뿐인 접두어는 묶는 의미가 없으므로 기타로 합침
+    result = []
+    for prefix in sorted(groups):
+        members = groups[prefix]
+        if len(members) > 1:
+            result.append((f"{prefix}_*", members))
+        else:
+            others.extend(members)
+    if others:
+        result.append((OTHER_PREFIX_LABEL, others))
+    return result
+
+
+def detect_communities(graph, max_iterations=20):
+    """레이블 전파 방식의 커뮤니티 탐지 (입력 순서와 무관하게 결정적)
+    
+    graph: 테이블 -> 인접 테이블 집합 (무방향)
+    반환: [[테이블...], ...] (자기 자신 외에 연결이 없는 테이블은 제외)
+    """
+    nodes = sorted(name for name, neighbors in graph.items() if neighbors - {name})
+    labels = {name: name for name in nodes}
+    
+    for _ in range(max_iterations):
+        changed = False
+        for name in nodes:
+            counts = Counter(labels[neighbor] for neighbor in graph[name])
+            best_count = max(counts.values())
+            # 동률이면 현재 레이블을 유지하고, 아니면 이름 순으로 앞선 레이블
+            if counts.get(labels[name], 0) == best_count:
+                continue
+            best = min(label for label, count in counts.items() if count == best_count)
+            labels[name] = best
+            changed = True
+        if not changed:
+            break
+    
+    communities = {}
+    for name in nodes:
+        communities.setdefault(labels[name], []).append(name)
+    return list(communities.values())
+
+
+def build_fk_graph(tables_info):
+    """방향 있는 FK 그래프
+    
+    반환: (parents, children)
+      parents: 테이블 -> 이 테이블이 참조하는 테이블 집합
+      children: 테이블 -> 이 테이블을 참조하는 테이블 집합
+    """
+    parents = {table_name: set() for table_name in tables_info}
+    children = {table_name: set() for table_name in tables_info}
+    for table_name, table_info in tables_info.items():
+        for fk in table_info['foreign_keys']:
+            ref_table = fk['referred_table']
+            if ref_table in tables_info and ref_table != table_name:
+                parents[table_name].add(ref_table)
+                children[ref_table].add(table_name)
+    return parents, children
+
+
+def connected_components(tables_info):
+    """FK로 연결된 테이블 묶음 (방향 무시). 반환: ([[테이블...], ...], [독립 테이블...])
+    
+    큰 묶음부터, 같은 크기는 이름 순으로 정렬
+    """
+    parents, children = build_fk_graph(tables_info)
+    visited = set()
+    groups = []
+    isolated = []
+    for table_name in sorted(tables_info):
+        if table_name in visited:
+            continue
+        visited.add(table_name)
+        group = []
+        stack = [table_name]
+        while stack:
+            current = stack.pop()
+            group.append(current)
+            for neighbor in parents[current] | children[current]:
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    stack.append(neighbor)
+        if len(group) > 1:
+            groups.append(sorted(group))
+        else:
+            isolated.append(table_name)
+    groups.sort(key=lambda group: (-len(group), group[0]))
+    return groups, isolated
+
+
+def k_hop_neighborhood(start, parents, children, hops, direction='both', max_nodes=None):
+    """start에서 FK 간선으로 hops 단계 이내인 테이블 (제한된 BFS)
+    
+    direction: 'parents'(참조하는 쪽), 'children'(참조받는 쪽), 'both'
+    반환: ({테이블: 거리}, 잘림 여부)
+    """
+    if direction not in FOCUS_DIRECTIONS:
+        raise Exception(f"지원하지 않는 방향입니다: {direction}")
+    
+    distances = {start: 0}
+    queue = deque([start])
+    truncated = False
+    while queue:
+        current = queue.popleft()
+        distance = distances[current]
+        if distance >= hops:
+            continue
+        
+        neighbors = []
+        if direction != 'children':
+            neighbors.extend(parents[current])
+        if direction != 'parents':
+            neighbors.extend(children[current])
+        
+        # 잘릴 때 결과가 실행마다 달라지지 않도록 이름 순으로 방문
+        for neighbor in sorted(neighbors):
+            if neighbor in distances:
+                continue
+            if max_nodes is not None and len(distances) >= max_nodes:
+                truncated = True
+                break
+            distances[neighbor] = distance + 1
+            queue.append(neighbor)
+        if truncated:
+            break
+    
+    return distances, truncated
+
+
+class ClusterSet:
+    """테이블 묶음과 묶음 사이의 FK 개수(간선 가중치)"""
+    
+    def __init__(self, method, clusters, tables_info):
+        """clusters: [(라벨, [테이블...]), ...]"""
+        self.method = method
+        
+        # 큰 묶음부터 번호 부여
+        ordered = sorted(clusters, key=lambda item: (-len(item[1]), item[0]))
+        self.clusters = []
+        self.cluster_of = {}
+        for index, (label, members) in enumerate(ordered):
+            cluster_id = str(index)
+            members = sorted(members)
+            self.clusters.append({'id': cluster_id, 'label': label, 'members': members})
+            for table_name in members:
+                self.cluster_of[table_name] = cluster_id
+        
+        self.edge_weights = {}
+        for table_name, table_info in tables_info.items():
+            source = self.cluster_of.get(table_name)
+            for fk in table_info['foreign_keys']:
+                target = self.cluster_of.get(fk['referred_table'])
+                if source is None or target is None or source == target:
+                    continue
+                key = (source, target) if int(source) < int(target) else (target, source)
+                self.edge_weights[key] = self.edge_weights.get(key, 0) + 1
+    
+    def get(self, cluster_id):
+        try:
+            return self.clusters[int(cluster_id)]
+        except (ValueError, IndexError):
+            return None
+
+
+def build_clusters(method, tables_info, graph, degrees, groups=None, isolated=None):
+    """method: 'component'(연결 그룹), 'prefix'(이름 접두어), 'community'(커뮤니티 탐지)
+    
+    groups/isolated: 연결 그룹 결과를 이미 계산했다면 전달 (component 방식)
+    """
+    if method not in CLUSTER_METHODS:
+        raise Exception(f"지원하지 않는 묶음 방식입니다: {method}")
+    
+    def hub_label(members, suffix):
+        hub = min(members, key=lambda name: (-degrees.get(name, 0), name))
+        return f"{hub} {suffix}"
+    
+    clusters = []
+    if method == 'prefix':
+        clusters = group_by_prefix(sorted(tables_info))
+    else:
+        if method == 'component':
+            groups = [sorted(group) for group in groups]
+            suffix = '그룹'
+        else:
+            groups = detect_communities(graph)
+            isolated = [name for name in tables_info if not (graph.get(name, set()) - {name})]
+            suffix = '커뮤니티'
+        clusters = [(hub_label(members, suffix), members) for members in groups]
+        if isolated:
+            clusters.append((ISOLATED_CLUSTER_LABEL, list(isolated)))
+    
+    return ClusterSet(method, clusters, tables_info)
@@ -0,0 +1,102 @@
+import threading
+
+from table_extractor import TableExtractor
+
+
+class SchemaWatcher:
+    """카탈로그 지문을 주기적으로 확인하여 스키마가 바뀌면 바뀐 테이블만 다시 추출
+    
+    GUI의 연결을 복제한 별도 엔진으로 조회하므로 GUI 스레드가 쓰는 Inspector를 바꾸지 않는다.
+    on_change(delta) 콜백은 감시 스레드에서 호출된다.
+    delta: {'added': {테이블: 정보}, 'changed': {테이블: 정보}, 'removed': [테이블...]}
+    """
+    
+    def __init__(self, db_connector, on_change, interval=10.0, logger=None):
+        self.source = db_connector
+        self.db = None
+        self.on_change = on_change
+        self.interval = interval
+        self.logger = logger
+        self.fingerprint = None
+        self.signatures = None
+        self.stop_event = threading.Event()
+        self.thread = None
+    
+    def start(self):
+        self.db = self.source.clone()
+        if self.db is not None:
+            self.fingerprint = self.db.get_catalog_fingerprint()
+            self.signatures = self.db.get_catalog_signatures()
+        if self.db is None or self.fingerprint is None or self.signatures is None:
+            if self.logger:
+                self.logger.warning("스키마 변경 감시를 지원하지 않는 DB이거나 카탈로그 조회에 실패했습니다.")
+            self.close()
+            return False
+        
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        if self.logger:
+            self.logger.info(f"스키마 변경 감시 시작 ({self.interval}초 간격)")
+        return True
+    
+    def stop(self):
+        """감시 중지 (진행 중인 조회가 끝나면 스레드가 전용 엔진을 정리)"""
+        self.stop_event.set()
+    
+    def close(self):
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+    
+    def _run(self):
+        try:
+            while not self.stop_event.wait(self.interval):
+                try:
+                    self.poll()
+                except Exception as e:
+                    if self.logger:
+                        self.logger.error(f"스키마 변경 감시 오류: {str(e)}", exc_info=True)
+        finally:
+            self.close()
+    
+    def poll(self):
+        """변경이 있으면 delta를 전달하고 반환, 없으면 None
+        
+        매번은 가벼운 지문만 조회하고, 지문이 바뀐 때만 테이블별 서명을 한 번 조회하여 비교
+        """
+        fingerprint = self.db.get_catalog_fingerprint()
+        if fingerprint is None or fingerprint == self.fingerprint:
+            return None
+        
+        signatures = self.db.get_catalog_signatures()
+        if signatures is None:
+            return None
+        
+        previous = self.signatures
+        added = sorted(name for name in signatures if name not in previous)
+        removed = sorted(name for name in previous if name not in signatures)
+        changed = sorted(name for name in signatures if name in previous and signatures[name] != previous[name])
+        if not (added or removed or changed):
+            # 지문만 바뀐 경우 (MySQL UPDATE_TIME 등): 다시 추출하지 않음
+            self.fingerprint = fingerprint
+            self.signatures = signatures
+            return None
+        
+        # 새 Inspector로 바뀐 테이블만 다시 추출 (감시 전용 연결이므로 GUI 쪽 Inspector는 그대로)
+        self.db.refresh_inspector()
+        extractor = TableExtractor(self.db)
+        delta = {
+            'added': {name: extractor.extract_table_info(name) for name in added},
+            'changed': {name: extractor.extract_table_info(name) for name in changed},
+            'removed': removed
+        }
+        
+        self.fingerprint = fingerprint
+        self.signatures = signatures
+        
+        if self.stop_event.is_set():
+            return None
+        if self.logger:
+            self.logger.info(f"스키마 변경 감지: 추가 {len(added)}, 변경 {len(changed)}, 삭제 {len(removed)}")
+        self.on_change(delta)
+        return delta
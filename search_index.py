@@ -0,0 +1,218 @@
+import re
+import heapq
+import bisect
+from functools import lru_cache
+from itertools import chain
+
+
+# 필드별 가중치 (테이블 이름 일치가 가장 중요)
+FIELD_WEIGHTS = {
+    'table': 3.0,
+    'column': 2.0,
+    'type': 0.5,
+    'comment': 0.5,
+}
+
+# 검색어와 토큰의 일치 방식별 점수
+MATCH_EXACT = 1.0
+MATCH_PREFIX = 0.7
+MATCH_SUBSTRING = 0.5
+MATCH_FUZZY = 0.3
+
+# 짧은 접두어가 너무 많은 토큰과 일치하지 않도록 제한
+MAX_PREFIX_TOKENS = 200
+MIN_SUBSTRING_LENGTH = 3
+FUZZY_THRESHOLD = 0.3
+
+# CamelCase/snake_case/숫자/한글 단위로 나눔
+TOKEN_PATTERN = re.compile(r'[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+|[가-힣]+')
+
+
+@lru_cache(maxsize=65536)
+def tokenize(text):
+    """이름 전체(소문자)와 단어 조각 토큰 (ID, 타입 등 반복되는 이름이 많아 캐시)"""
+    if not text:
+        return frozenset()
+    text = str(text)
+    tokens = {part.lower() for part in TOKEN_PATTERN.findall(text)}
+    tokens.add(text.lower())
+    return frozenset(tokens)
+
+
+def trigrams(token):
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+
+class SearchIndex:
+    """테이블 이름, 컬럼 이름/타입/주석에 대한 역색인 (접두어, 트라이그램 부분 일치)
+    
+    게시 목록은 테이블 단위로 저장하여 컬럼 수가 많아도 질의 비용이 테이블 수에 비례
+    """
+    
+    def __init__(self, tables_info):
+        # 테이블 ID는 이름 순이므로 동점일 때 ID 순서가 곧 이름 순서
+        self.table_names = sorted(tables_info)
+        self.tables_info = tables_info
+        self.exact_names = {}
+        for table_id, table_name in enumerate(self.table_names):
+            self.exact_names.setdefault(table_name.lower(), []).append(table_id)
+        
+        vocabulary = {}
+        postings = {field: {} for field in FIELD_WEIGHTS}
+        
+        def add(field, table_id, text):
+            for token in tokenize(text):
+                token_id = vocabulary.setdefault(token, len(vocabulary))
+                field_postings = postings[field]
+                tables = field_postings.get(token_id)
+                if tables is None:
+                    field_postings[token_id] = [table_id]
+                elif tables[-1] != table_id:
+                    tables.append(table_id)
+        
+        for table_id, table_name in enumerate(self.table_names):
+            add('table', table_id, table_name)
+            for col_info in tables_info[table_name]['columns']:
+                add('column', table_id, col_info['name'])
+                add('type', table_id, str(col_info['type']).split('(')[0])
+                add('comment', table_id, col_info.get('comment'))
+        
+        self.vocabulary = vocabulary
+        self.postings = postings
+        self.tokens = [None] * len(vocabulary)
+        for token, token_id in vocabulary.items():
+            self.tokens[token_id] = token
+        self.sorted_tokens = sorted(vocabulary)
+        
+        self.trigram_index = {}
+        for token, token_id in vocabulary.items():
+            for gram in trigrams(token):
+                self.trigram_index.setdefault(gram, []).append(token_id)
+    
+    def match_tokens(self, term):
+        """검색어 하나와 일치하는 토큰 -> 일치 점수"""
+        matches = {}
+        
+        token_id = self.vocabulary.get(term)
+        if token_id is not None:
+            matches[token_id] = MATCH_EXACT
+        
+        start = bisect.bisect_left(self.sorted_tokens, term)
+        for token in self.sorted_tokens[start:start + MAX_PREFIX_TOKENS]:
+            if not token.startswith(term):
+                break
+            matches.setdefault(self.vocabulary[token], MATCH_PREFIX)
+        
+        if len(term) < MIN_SUBSTRING_LENGTH:
+            return matches
+        
+        # 트라이그램 게시 목록을 작은 것부터 교집합하여 부분 문자열 후보를 찾음
+        grams = trigrams(term)
+        lists = sorted((self.trigram_index.get(gram, ()) for gram in grams), key=len)
+        if lists and lists[0]:
+            candidates = set(lists[0])
+            for other in lists[1:]:
+                candidates.intersection_update(other)
+                if not candidates:
+                    break
+            for token_id in candidates:
+                if term in self.tokens[token_id]:
+                    matches.setdefault(token_id, MATCH_SUBSTRING)
+        
+        if not matches:
+            # 오타 허용: 트라이그램이 충분히 겹치는 토큰
+            overlap = {}
+            for gram in grams:
+                for token_id in self.trigram_index.get(gram, ()):
+                    overlap[token_id] = overlap.get(token_id, 0) + 1
+            for token_id, count in overlap.items():
+                similarity = count / (len(grams) + len(trigrams(self.tokens[token_id])) - count)
+                if similarity >= FUZZY_THRESHOLD:
+                    matches[token_id] = MATCH_FUZZY * similarity
+        return matches
+    
+    def score_term(self, term):
+        """검색어 하나에 대한 테이블별 점수와 일치한 토큰"""
+        token_matches = self.match_tokens(term)
+        
+        # 점수 단계별로 게시 목록을 모음 (필드 가중치 x 일치 방식이라 단계 수가 적음)
+        levels = {}
+        for field, weight in FIELD_WEIGHTS.items():
+            field_postings = self.postings[field]
+            for token_id, match_score in token_matches.items():
+                tables = field_postings.get(token_id)
+                if tables:
+                    levels.setdefault(weight * match_score, []).append(tables)
+        
+        # 높은 점수 단계부터 낮은 단계 위에 덮어쓰면 테이블별 최고 점수만 남음
+        # (파이썬 반복 없이 dict 연산으로 처리)
+        scores = {}
+        for score in sorted(levels, reverse=True):
+            merged = dict.fromkeys(chain.from_iterable(levels[score]), score)
+            merged.update(scores)
+            scores = merged
+        return scores, token_matches
+    
+    def search(self, query, limit=20):
+        """공백으로 구분된 모든 검색어와 일치하는 테이블을 점수 순으로 반환
+        
+        반환: (전체 일치 수, [{'table', 'score', 'columns'}, ...])
+        """
+        terms = [term for term in query.lower().split() if term]
+        if not terms:
+            return 0, []
+        
+        combined = None
+        term_tokens = []
+        for term in terms:
+            scores, token_matches = self.score_term(term)
+            term_tokens.append(set(token_matches))
+            if combined is None:
+                combined = scores
+            else:
+                combined = {
+                    table_id: total + scores[table_id]
+                    for table_id, total in combined.items() if table_id in scores
+                }
+            if not combined:
+                return 0, []
+        
+        for table_id in self.exact_names.get(query.strip().lower(), ()):
+            if table_id in combined:
+                combined[table_id] += 5.0
+        
+        top = self.top_tables(combined, limit)
+        
+        results = []
+        for table_id, score in top:
+            table_name = self.table_names[table_id]
+            results.append({
+                'table': table_name,
+                'score': round(score, 3),
+                'columns': self.matching_columns(table_name, term_tokens)
+            })
+        return len(combined), results
+    
+    def top_tables(self, scores, limit):
+        """점수 내림차순, 동점이면 이름 순으로 상위 limit개 (key 함수 없이 비교하여 빠르게 처리)"""
+        if not scores or limit <= 0:
+            return []
+        threshold = heapq.nlargest(limit, scores.values())[-1]
+        above = sorted(((-score, table_id) for table_id, score in scores.items() if score > threshold))
+        ties = heapq.nsmallest(limit - len(above), (table_id for table_id, score in scores.items() if score == threshold))
+        return [(table_id, -neg_score) for neg_score, table_id in above] + [(table_id, threshold) for table_id in ties]
+    
+    def matching_columns(self, table_name, term_tokens, limit=5):
+        """결과 표시용: 검색어와 일치하는 컬럼 이름 (상위 결과에 대해서만 계산)"""
+        matched = []
+        for col_info in self.tables_info[table_name]['columns']:
+            texts = (col_info['name'], str(col_info['type']).split('(')[0], col_info.get('comment'))
+            token_ids = set()
+            for text in texts:
+                for token in tokenize(text):
+                    token_ids.add(self.vocabulary.get(token))
+            if any(token_ids & tokens for tokens in term_tokens):
+                matched.append(col_info['name'])
+                if len(matched) >= limit:
+                    break
+        return matched
@@ -0,0 +1,79 @@
+import math
+
+
+class SpatialGrid:
+    """균일 격자 기반 사각형 공간 인덱스 (겹침 검사, 영역 조회용)"""
+    
+    def __init__(self, cell_size=500):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.rects = {}
+    
+    def _cell_range(self, rect):
+        min_x, min_y, max_x, max_y = rect
+        size = self.cell_size
+        return (
+            math.floor(min_x / size), math.floor(min_y / size),
+            math.floor(max_x / size), math.floor(max_y / size)
+        )
+    
+    def insert(self, key, rect):
+        """rect: (min_x, min_y, max_x, max_y)"""
+        if key in self.rects:
+            self.remove(key)
+        self.rects[key] = rect
+        cx0, cy0, cx1, cy1 = self._cell_range(rect)
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                self.cells.setdefault((cx, cy), []).append(key)
+    
+    def remove(self, key):
+        rect = self.rects.pop(key, None)
+        if rect is None:
+            return
+        cx0, cy0, cx1, cy1 = self._cell_range(rect)
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                bucket = self.cells.get((cx, cy))
+                if bucket and key in bucket:
+                    bucket.remove(key)
+                    if not bucket:
+                        del self.cells[(cx, cy)]
+    
+    def query(self, rect):
+        """rect와 겹치는 항목 키 목록"""
+        min_x, min_y, max_x, max_y = rect
+        found = []
+        seen = set()
+        cx0, cy0, cx1, cy1 = self._cell_range(rect)
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                for key in self.cells.get((cx, cy), ()):
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                    r = self.rects[key]
+                    if r[0] < max_x and r[2] > min_x and r[1] < max_y and r[3] > min_y:
+                        found.append(key)
+        return found
+    
+    def intersects(self, rect):
+        min_x, min_y, max_x, max_y = rect
+        cx0, cy0, cx1, cy1 = self._cell_range(rect)
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                for key in self.cells.get((cx, cy), ()):
+                    r = self.rects[key]
+                    if r[0] < max_x and r[2] > min_x and r[1] < max_y and r[3] > min_y:
+                        return True
+        return False
+    
+    def bounds(self):
+        if not self.rects:
+            return None
+        return (
+            min(r[0] for r in self.rects.values()),
+            min(r[1] for r in self.rects.values()),
+            max(r[2] for r in self.rects.values()),
+            max(r[3] for r in self.rects.values())
+        )
@@ -0,0 +1,107 @@
+import threading
+import unittest
+from unittest import mock
+
+import er_diagram_web
+from er_diagram_web import ERDiagramWebEditor
+
+
+def make_table(name, refs=()):
+    columns = [{'name': 'id', 'type': 'INTEGER', 'nullable': False}]
+    foreign_keys = []
+    for ref_table in refs:
+        columns.append({'name': f"{ref_table.lower()}_id", 'type': 'INTEGER', 'nullable': True})
+        foreign_keys.append({
+            'name': f"fk_{name}_{ref_table}",
+            'constrained_columns': [f"{ref_table.lower()}_id"],
+            'referred_table': ref_table,
+            'referred_columns': ['id']
+        })
+    return {'columns': columns, 'foreign_keys': foreign_keys, 'primary_keys': ['id'], 'indexes': []}
+
+
+def make_schema():
+    # T00000 <- T00001 <- T00002 체인과 T00003 <- T00004, 고립 테이블 T00005
+    return {
+        'T00000': make_table('T00000'),
+        'T00001': make_table('T00001', ['T00000']),
+        'T00002': make_table('T00002', ['T00001']),
+        'T00003': make_table('T00003'),
+        'T00004': make_table('T00004', ['T00003']),
+        'T00005': make_table('T00005')
+    }
+
+
+class ConcurrentSchemaDeltaTest(unittest.TestCase):
+    """요청 스레드가 캐시를 만드는 도중에 스키마 변경이 들어와도 이전 스키마의 캐시가 남지 않아야 함"""
+    
+    def setUp(self):
+        self.editor = ERDiagramWebEditor(make_schema())
+        self.editor.get_visjs_data()
+    
+    def assert_cluster_view_matches_schema(self):
+        view = self.editor.build_cluster_view('component')
+        members = set()
+        for node in view['nodes']:
+            cluster = self.editor.build_cluster_members('component', node['clusterId'])
+            members.update(table['id'] for table in cluster['nodes'])
+        self.assertEqual(members, set(self.editor.tables_info))
+        self.assertEqual(view['tables'], len(self.editor.tables_info))
+    
+    def test_delta_during_cluster_build(self):
+        building = threading.Event()
+        resume = threading.Event()
+        original = er_diagram_web.build_clusters
+        
+        def slow_build_clusters(*args, **kwargs):
+            building.set()
+            resume.wait(5)
+            return original(*args, **kwargs)
+        
+        errors = []
+        
+        def request():
+            try:
+                self.editor.build_cluster_view('component')
+            except Exception as e:
+                errors.append(e)
+        
+        with mock.patch.object(er_diagram_web, 'build_clusters', slow_build_clusters):
+            thread = threading.Thread(target=request)
+            thread.start()
+            self.assertTrue(building.wait(5))
+            delta_thread = threading.Thread(
+                target=self.editor.apply_schema_delta, args=({'removed': ['T00001', 'T00002']},)
+            )
+            delta_thread.start()
+            resume.set()
+            thread.join(5)
+            delta_thread.join(5)
+        
+        self.assertEqual(errors, [])
+        self.assertNotIn('T00002', self.editor.tables_info)
+        self.assert_cluster_view_matches_schema()
+    
+    def test_request_during_delta_computation(self):
+        original = self.editor.place_new_tables
+        seen = []
+        
+        def place_with_request(*args, **kwargs):
+            # 변경분을 계산하는 중에 들어온 요청은 이전 스키마의 데이터끼리 짝지어 응답
+            seen.append(self.editor.build_cluster_view('component')['tables'])
+            seen.append(self.editor.build_focus_view('T00001') is not None)
+            return original(*args, **kwargs)
+        
+        self.editor.place_new_tables = place_with_request
+        added = {'T00006': make_table('T00006', ['T00005']), 'T00007': make_table('T00007', ['T00006'])}
+        payload = self.editor.apply_schema_delta({'added': added, 'removed': ['T00001']})
+        
+        self.assertEqual(seen, [6, True])
+        self.assertEqual(sorted(node['id'] for node in payload['addedNodes']), ['T00006', 'T00007'])
+        self.assertIn('T00007', self.editor.get_visjs_data()['node_index'])
+        self.assertIsNone(self.editor.build_focus_view('T00001'))
+        self.assert_cluster_view_matches_schema()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+import os
+import sys
+import unicodedata
+from functools import lru_cache
+
+try:
+    from PIL import ImageFont
+except ImportError:
+    ImageFont = None
+
+
+# 렌더러에서 사용하는 글꼴 이름 -> 찾아볼 글꼴 파일 (앞에 있을수록 우선)
+FONT_FILES = {
+    'Arial': ['arial.ttf', 'Arial.ttf', 'LiberationSans-Regular.ttf', 'DejaVuSans.ttf'],
+    'Arial Bold': ['arialbd.ttf', 'Arial Bold.ttf', 'LiberationSans-Bold.ttf', 'DejaVuSans-Bold.ttf'],
+    '맑은 고딕': ['malgun.ttf', 'AppleSDGothicNeo.ttc', 'NanumGothic.ttf', 'NotoSansCJK-Regular.ttc', 'NotoSansKR-Regular.otf'],
+    '맑은 고딕 Bold': ['malgunbd.ttf', 'AppleSDGothicNeo.ttc', 'NanumGothicBold.ttf', 'NotoSansCJK-Bold.ttc', 'NotoSansKR-Bold.otf'],
+    'monospace': ['consola.ttf', 'DejaVuSansMono.ttf', 'LiberationMono-Regular.ttf', 'Menlo.ttc'],
+}
+
+# 한글 등 전각 문자를 그릴 때 브라우저/OS가 대체하는 글꼴
+CJK_FALLBACK = {
+    'Arial': '맑은 고딕',
+    'Arial Bold': '맑은 고딕 Bold',
+    'monospace': '맑은 고딕',
+}
+
+
+def _font_dirs():
+    dirs = []
+    if sys.platform == 'win32':
+        windir = os.environ.get('WINDIR', r'C:\Windows')
+        dirs.append(os.path.join(windir, 'Fonts'))
+        local = os.environ.get('LOCALAPPDATA')
+        if local:
+            dirs.append(os.path.join(local, 'Microsoft', 'Windows', 'Fonts'))
+    elif sys.platform == 'darwin':
+        dirs.extend(['/System/Library/Fonts', '/Library/Fonts', os.path.expanduser('~/Library/Fonts')])
+    else:
+        dirs.extend(['/usr/share/fonts', '/usr/local/share/fonts', os.path.expanduser('~/.fonts')])
+    
+    try:
+        import matplotlib
+        dirs.append(os.path.join(os.path.dirname(matplotlib.__file__), 'mpl-data', 'fonts', 'ttf'))
+    except ImportError:
+        pass
+    return [d for d in dirs if os.path.isdir(d)]
+
+
+@lru_cache(maxsize=None)
+def _font_file_index():
+    """글꼴 디렉터리의 파일 이름(소문자) -> 전체 경로"""
+    index = {}
+    for font_dir in _font_dirs():
+        for root, _, files in os.walk(font_dir):
+            for file_name in files:
+                index.setdefault(file_name.lower(), os.path.join(root, file_name))
+    return index
+
+
+@lru_cache(maxsize=None)
+def find_font_file(font_name):
+    index = _font_file_index()
+    for file_name in FONT_FILES.get(font_name, []):
+        path = index.get(file_name.lower())
+        if path:
+            return path
+    return None
+
+
+@lru_cache(maxsize=128)
+def load_font(font_name, size):
+    if ImageFont is None:
+        return None
+    path = find_font_file(font_name)
+    if not path:
+        return None
+    try:
+        return ImageFont.truetype(path, size)
+    except Exception:
+        return None
+
+
+def is_wide_char(ch):
+    return unicodedata.east_asian_width(ch) in ('W', 'F')
+
+
+def _estimate_width(text, size):
+    # 글꼴을 쓸 수 없을 때의 근사치: 전각 문자는 글자 크기, 그 외는 약 0.55배
+    return sum(size if is_wide_char(ch) else size * 0.55 for ch in text)
+
+
+@lru_cache(maxsize=65536)
+def _measure_run(text, font_name, size):
+    font = load_font(font_name, size)
+    if font is None:
+        return _estimate_width(text, size)
+    return font.getlength(text)
+
+
+@lru_cache(maxsize=262144)
+def measure_text(text, font_name='Arial', size=9):
+    """글꼴 메트릭으로 측정한 텍스트 너비(px). (text, font, size) 단위로 캐시"""
+    if not text:
+        return 0.0
+    
+    fallback = CJK_FALLBACK.get(font_name)
+    if fallback is None or not any(is_wide_char(ch) for ch in text):
+        return _measure_run(text, font_name, size)
+    
+    # 전각 문자 구간과 나머지 구간을 각각 해당 글꼴로 측정
+    width = 0.0
+    run = []
+    run_wide = None
+    for ch in text:
+        wide = is_wide_char(ch)
+        if run and wide != run_wide:
+            width += _measure_run(''.join(run), fallback if run_wide else font_name, size)
+            run = []
+        run.append(ch)
+        run_wide = wide
+    if run:
+        width += _measure_run(''.join(run), fallback if run_wide else font_name, size)
+    return width
+
+
+def clear_cache():
+    measure_text.cache_clear()
+    _measure_run.cache_clear()
+    load_font.cache_clear()
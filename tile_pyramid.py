@@ -0,0 +1,103 @@
+import math
+from collections import OrderedDict
+from PIL import Image
+
+
+TILE_SIZE = 256
+# 화면 배율별 타일 캐시 (256x256 RGB 타일 하나가 약 200KB)
+MAX_CACHED_TILES = 512
+
+
+class TilePyramid:
+    """원본 이미지를 1/2씩 줄인 단계(레벨)를 미리 만들어 두고, 화면 배율에 맞는 레벨에서 타일 단위로 잘라 제공
+    
+    레벨 0은 원본, 레벨 k는 원본의 1/2^k 크기. 가장 작은 레벨은 타일 하나에 들어가는 크기
+    """
+    
+    def __init__(self, image, tile_size=TILE_SIZE, max_tiles=MAX_CACHED_TILES):
+        # 팔레트(P) 이미지는 축소 시 색이 섞이지 않으므로 먼저 변환
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA')
+        self.tile_size = tile_size
+        self.max_tiles = max_tiles
+        self.width = image.width
+        self.height = image.height
+        self.levels = [image]
+        # reduce()는 정수 배 상자 평균이라 LANCZOS 전체 변환보다 훨씬 빠름
+        while max(self.levels[-1].size) > tile_size:
+            level = self.levels[-1]
+            if level.width < 2 or level.height < 2:
+                break
+            self.levels.append(level.reduce(2))
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def level_for_scale(self, scale):
+        """화면 배율보다 해상도가 낮지 않은 가장 작은 레벨 (축소 변환 비율이 1/2 이하로 떨어지지 않음)"""
+        if scale >= 1.0:
+            return 0
+        return min(len(self.levels) - 1, int(math.floor(math.log2(1.0 / scale))))
+    
+    def display_size(self, scale):
+        return int(self.width * scale), int(self.height * scale)
+    
+    def visible_tiles(self, scale, left, top, width, height):
+        """화면 영역(배율 적용 좌표)과 겹치는 타일 [(level, col, row, (x0, y0, x1, y1))]
+        
+        x0..y1은 타일이 화면에 놓일 정수 좌표로, 이웃 타일과 틈 없이 맞닿음
+        """
+        level = self.level_for_scale(scale)
+        level_image = self.levels[level]
+        # 레벨 이미지 픽셀 -> 화면 픽셀 비율
+        ratio = scale * (self.width / level_image.width)
+        span = self.tile_size * ratio
+        cols = math.ceil(level_image.width / self.tile_size)
+        rows = math.ceil(level_image.height / self.tile_size)
+        full_width, full_height = self.display_size(scale)
+        
+        col0 = max(0, int(left // span))
+        row0 = max(0, int(top // span))
+        col1 = min(cols - 1, int((left + width) // span))
+        row1 = min(rows - 1, int((top + height) // span))
+        
+        tiles = []
+        for row in range(row0, row1 + 1):
+            y0 = round(row * span)
+            y1 = min(full_height, round((row + 1) * span))
+            for col in range(col0, col1 + 1):
+                x0 = round(col * span)
+                x1 = min(full_width, round((col + 1) * span))
+                if x1 > x0 and y1 > y0:
+                    tiles.append((level, col, row, (x0, y0, x1, y1)))
+        return tiles
+    
+    def tile(self, level, col, row, size):
+        """레벨의 (col, row) 타일을 화면 크기 size로 변환한 이미지 (최근 사용 순 캐시)"""
+        key = (level, col, row, size)
+        image = self.cache.get(key)
+        if image is not None:
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return image
+        
+        self.misses += 1
+        level_image = self.levels[level]
+        tile_size = self.tile_size
+        box = (
+            col * tile_size, row * tile_size,
+            min(level_image.width, (col + 1) * tile_size), min(level_image.height, (row + 1) * tile_size)
+        )
+        if (box[2] - box[0], box[3] - box[1]) == size:
+            image = level_image.crop(box)
+        else:
+            # box를 지정하면 경계 바깥 픽셀도 필터에 쓰여 타일 이음매가 보이지 않음
+            image = level_image.resize(size, Image.Resampling.LANCZOS, box=box)
+        
+        self.cache[key] = image
+        while len(self.cache) > self.max_tiles:
+            self.cache.popitem(last=False)
+        return image
+    
+    def clear_cache(self):
+        self.cache.clear()
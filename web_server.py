@@ -0,0 +1,330 @@
+import gzip
+import hashlib
+import json
+import os
+import re
+import sys
+import select
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs, quote, unquote
+
+
+COMPRESSIBLE_TYPES = ('text/html', 'text/css', 'text/plain', 'application/json', 'application/javascript', 'image/svg+xml')
+CACHE_IMMUTABLE = 'public, max-age=31536000, immutable'
+CACHE_REVALIDATE = 'no-cache'
+
+# 이보다 작은 응답은 압축 이득보다 비용이 큼
+MIN_COMPRESS_SIZE = 1024
+
+
+def make_etag(content):
+    return '"' + hashlib.sha1(content).hexdigest()[:16] + '"'
+
+
+def is_compressible(content_type):
+    return content_type.split(';')[0].strip() in COMPRESSIBLE_TYPES
+
+
+class StaticDocument:
+    """메모리에 올려 둔 고정 응답 (ETag와 gzip 결과를 한 번만 계산)"""
+    
+    def __init__(self, content, content_type, cache_control=CACHE_REVALIDATE):
+        self.content = content
+        self.content_type = content_type
+        self.cache_control = cache_control
+        self.etag = make_etag(content)
+        self._gzipped = None
+    
+    @property
+    def gzipped(self):
+        if self._gzipped is None:
+            self._gzipped = gzip.compress(self.content, compresslevel=9)
+        return self._gzipped
+
+
+class DiagramRequestHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 + Content-Length로 keep-alive 연결 유지
+    protocol_version = 'HTTP/1.1'
+    server_version = 'ERDProgram/1.0'
+    # 헤더와 본문을 따로 쓰므로 Nagle 알고리즘이 켜져 있으면 keep-alive 응답마다 지연 ACK(~40ms)만큼 늦어짐
+    disable_nagle_algorithm = True
+    
+    def do_GET(self):
+        self.dispatch('GET')
+    
+    def do_HEAD(self):
+        self.dispatch('HEAD')
+    
+    def do_POST(self):
+        self.dispatch('POST')
+    
+    def do_PUT(self):
+        self.dispatch('PUT')
+    
+    def dispatch(self, method):
+        parts = urlsplit(self.path)
+        self.route_path = unquote(parts.path)
+        self.query = parse_qs(parts.query)
+        self.head_only = method == 'HEAD'
+        self.body_read = False
+        
+        try:
+            route_method = 'GET' if method == 'HEAD' else method
+            handler, match = self.server.resolve(route_method, self.route_path)
+            if handler is None:
+                self.send_json({'error': 'not found'}, status=404)
+                return
+            
+            try:
+                handler(self, match)
+            except (BrokenPipeError, ConnectionResetError, ConnectionAbortedError):
+                self.close_connection = True
+            except Exception as e:
+                if self.server.logger:
+                    self.server.logger.error(f"HTTP 처리 오류 ({method} {self.path}): {str(e)}", exc_info=True)
+                try:
+                    self.send_json({'error': str(e)}, status=500)
+                except Exception:
+                    self.close_connection = True
+        finally:
+            # 경로가 없거나 처리기가 본문을 읽기 전에 응답한 경우, 남은 본문이 keep-alive 연결에서
+            # 다음 요청의 시작으로 해석되지 않도록 버림
+            if not self.body_read and not self.close_connection:
+                self.discard_body()
+    
+    def query_param(self, name, default=None):
+        values = self.query.get(name)
+        return values[0] if values else default
+    
+    def query_int(self, name, default):
+        try:
+            return int(self.query_param(name, default))
+        except (TypeError, ValueError):
+            return default
+    
+    def read_body(self):
+        self.body_read = True
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length > 0 else b''
+    
+    def discard_body(self, limit=1024 * 1024):
+        """처리하지 않을 요청 본문을 버림. 길이를 알 수 없거나 너무 크면 읽지 않고 연결을 닫는다"""
+        self.body_read = True
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            length = -1
+        if self.headers.get('Transfer-Encoding') or length < 0 or length > limit:
+            self.close_connection = True
+            return
+        while length > 0:
+            chunk = self.rfile.read(min(length, 64 * 1024))
+            if not chunk:
+                self.close_connection = True
+                return
+            length -= len(chunk)
+    
+    def read_json(self):
+        body = self.read_body()
+        return json.loads(body.decode('utf-8')) if body else None
+    
+    def etag_matches(self, etag):
+        header = self.headers.get('If-None-Match')
+        if not header:
+            return False
+        return header.strip() == '*' or etag in [tag.strip() for tag in header.split(',')]
+    
+    def accepts_gzip(self):
+        return 'gzip' in (self.headers.get('Accept-Encoding') or '')
+    
+    def send_document(self, document):
+        gzipped = None
+        if is_compressible(document.content_type) and len(document.content) >= MIN_COMPRESS_SIZE and self.accepts_gzip():
+            gzipped = document.gzipped
+        self.send_content(document.content, document.content_type, document.etag, document.cache_control, gzipped)
+    
+    def send_content(self, content, content_type, etag=None, cache_control=CACHE_REVALIDATE, gzipped=None, status=200):
+        if etag is not None and status == 200 and self.etag_matches(etag):
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', cache_control)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        
+        compressible = is_compressible(content_type)
+        if gzipped is None and compressible and len(content) >= MIN_COMPRESS_SIZE and self.accepts_gzip():
+            gzipped = gzip.compress(content, compresslevel=5)
+        
+        body = gzipped if gzipped is not None else content
+        
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', cache_control)
+        if etag is not None:
+            self.send_header('ETag', etag)
+        if compressible:
+            self.send_header('Vary', 'Accept-Encoding')
+        if gzipped is not None:
+            self.send_header('Content-Encoding', 'gzip')
+        self.end_headers()
+        
+        if not self.head_only:
+            self.wfile.write(body)
+    
+    def send_json(self, data, status=200, etag=False, cache_control=CACHE_REVALIDATE):
+        content = json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        self.send_content(
+            content, 'application/json; charset=utf-8',
+            etag=make_etag(content) if etag else None,
+            cache_control=cache_control, status=status
+        )
+    
+    def send_file(self, file_path, content_type, download_name=None, chunk_size=64 * 1024, cache_control='no-store'):
+        """파일을 나누어 읽으며 전송 (큰 내보내기 결과를 메모리에 올리지 않음)
+        
+        머리글을 보내기 전에 파일을 열어 두므로, 없는 파일은 응답을 시작하기 전에 FileNotFoundError가 나고
+        연 뒤에 지워져도 끝까지 보낼 수 있음
+        """
+        with open(file_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(size))
+            self.send_header('Cache-Control', cache_control)
+            if download_name:
+                self.send_header('Content-Disposition', f"attachment; filename*=UTF-8''{quote(download_name)}")
+            self.end_headers()
+            
+            if self.head_only:
+                return
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                self.wfile.write(chunk)
+    
+    def start_event_stream(self):
+        """Server-Sent Events 응답 시작. 길이를 알 수 없으므로 스트림이 끝나면 연결을 닫는다"""
+        self.close_connection = True
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.flush()
+    
+    def send_event(self, data=None, event=None, event_id=None, comment=None):
+        lines = []
+        if comment is not None:
+            lines.append(f": {comment}")
+        if event_id is not None:
+            lines.append(f"id: {event_id}")
+        if event:
+            lines.append(f"event: {event}")
+        if data is not None:
+            lines.append("data: " + json.dumps(data, ensure_ascii=False, separators=(',', ':')))
+        self.wfile.write(('\n'.join(lines) + '\n\n').encode('utf-8'))
+        self.wfile.flush()
+    
+    def client_closed(self):
+        """이벤트 스트림 상대가 연결을 닫았는지 (닫힌 소켓에 쓰면 두 번째 쓰기에서야 오류가 나므로 미리 확인)"""
+        try:
+            readable, _, _ = select.select([self.connection], [], [], 0)
+            if not readable:
+                return False
+            # 스트림 중에는 클라이언트가 보낼 데이터가 없으므로 읽을 수 있으면 종료(빈 데이터) 또는 오류
+            return not self.connection.recv(1, socket.MSG_PEEK)
+        except OSError:
+            return True
+    
+    def log_message(self, format, *args):
+        if self.server.logger:
+            self.server.logger.debug(f"HTTP: {format % args}")
+
+
+class DiagramServer(ThreadingHTTPServer):
+    """다이어그램 편집기 전용 로컬 서버. 등록된 경로만 응답"""
+    
+    daemon_threads = True
+    # Windows에서는 SO_REUSEADDR이 사용 중인 포트에도 바인딩을 허용하므로 끈다
+    allow_reuse_address = sys.platform != 'win32'
+    
+    def __init__(self, address, logger=None):
+        super().__init__(address, DiagramRequestHandler)
+        self.logger = logger
+        self.documents = {}
+        self.routes = []
+        self.lock = threading.RLock()
+        self.thread = None
+    
+    def publish(self, path, content, content_type, cache_control=CACHE_REVALIDATE):
+        document = StaticDocument(content, content_type, cache_control)
+        with self.lock:
+            self.documents[path] = document
+        return document
+    
+    def publish_file(self, path, file_path, content_type, cache_control=CACHE_IMMUTABLE):
+        with self.lock:
+            if path in self.documents:
+                return self.documents[path]
+        with open(file_path, 'rb') as f:
+            content = f.read()
+        return self.publish(path, content, content_type, cache_control)
+    
+    def unpublish(self, path):
+        with self.lock:
+            self.documents.pop(path, None)
+    
+    def add_route(self, method, pattern, handler):
+        """pattern: 경로 전체와 일치하는 정규식, handler(request, match)"""
+        with self.lock:
+            self.routes.append((method, re.compile(pattern), handler))
+    
+    def resolve(self, method, path):
+        with self.lock:
+            if method == 'GET':
+                document = self.documents.get(path)
+                if document is not None:
+                    return (lambda request, match: request.send_document(document)), None
+            for route_method, pattern, handler in self.routes:
+                if route_method != method:
+                    continue
+                match = pattern.fullmatch(path)
+                if match:
+                    return handler, match
+        return None, None
+    
+    def start(self):
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def get_server(logger=None, port=8765, port_attempts=10):
+    """프로세스 전체에서 공유하는 서버를 반환 (처음 호출 시 시작)"""
+    global _server
+    with _server_lock:
+        if _server is not None:
+            return _server
+        
+        last_error = None
+        for candidate in range(port, port + port_attempts):
+            try:
+                server = DiagramServer(('127.0.0.1', candidate), logger)
+            except OSError as e:
+                last_error = e
+                continue
+            server.start()
+            _server = server
+            if logger:
+                logger.info(f"웹 서버 시작: 포트 {candidate}")
+            return _server
+        
+        raise OSError(f"사용 가능한 포트가 없습니다 ({port}~{port + port_attempts - 1}): {last_error}")